@@ -0,0 +1,70 @@
+"""
+Step Memory Benchmark
+Compares the resident size of one parsed .NEU step across data models
+
+Usage: python benchmarks/step_memory.py path/to/FEM1.NEU
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import ParserNeutralFile
+from parser import parser_neutral_file
+from parser.models import Node, Element, Die
+
+
+def without_slots(cls):
+    """Copy of a slotted model class storing its attributes in __dict__"""
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in cls.__slots__ and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(cls.__name__, (), namespace)
+
+
+def measure(label, parse, filename):
+    """Parse one step and report the memory it keeps alive"""
+    # Timed without tracing, which slows allocation-heavy parsing a lot
+    start = time.perf_counter()
+    parse(filename)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    neu = parse(filename)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nb_elements = max(neu.get_nb_elements(), 1)
+    print(f"{label:<12} resident {current / 1024 ** 2:8.1f} MB  "
+          f"peak {peak / 1024 ** 2:8.1f} MB  "
+          f"{current / nb_elements:7.0f} B/element  {elapsed:6.2f} s")
+    return current
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__.strip())
+        sys.exit(1)
+    filename = sys.argv[1]
+
+    # Legacy models: the same classes with per-instance dicts
+    slotted = (parser_neutral_file.Node, parser_neutral_file.Element,
+               parser_neutral_file.Die)
+    parser_neutral_file.Node = without_slots(Node)
+    parser_neutral_file.Element = without_slots(Element)
+    parser_neutral_file.Die = without_slots(Die)
+    legacy = measure("dict", ParserNeutralFile.parser_file, filename)
+    (parser_neutral_file.Node, parser_neutral_file.Element,
+     parser_neutral_file.Die) = slotted
+
+    compact = measure("slots", ParserNeutralFile.parser_file, filename)
+    columnar = measure("columnar", ParserNeutralFile.parser_file_columnar, filename)
+
+    print(f"slots use {compact / legacy:.0%} and columnar "
+          f"{columnar / legacy:.0%} of the dict-based step")
+
+
+if __name__ == "__main__":
+    main()
@@ -247,6 +247,7 @@ class AnimationHandler:
             self.animation_direction = -1
         else:
             self.animation_direction = 1
+        self.main_window.visualization_manager.playback_direction = self.animation_direction
 
     def _update_frame_display(self):
         """Update frame display"""
@@ -268,6 +269,7 @@ class AnimationHandler:
     def _start_animation(self):
         """Start animation"""
         self.is_animating = True
+        self.main_window.visualization_manager.playback_direction = self.animation_direction
         if hasattr(self, 'play_button'):
             self.play_button.setText("Pause")
         self.animation_timer.setInterval(self.frame_delay)
@@ -324,6 +326,7 @@ class AnimationHandler:
 
         if self.current_frame < self.end_frame:
             self.current_frame += 1
+            self.main_window.visualization_manager.playback_direction = 1
             self._load_frame(self.current_frame - 1)
             self._update_frame_display()
 
@@ -334,6 +337,7 @@ class AnimationHandler:
 
         if self.current_frame > self.start_frame:
             self.current_frame -= 1
+            self.main_window.visualization_manager.playback_direction = -1
             self._load_frame(self.current_frame - 1)
             self._update_frame_display()
 
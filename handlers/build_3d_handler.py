@@ -3,12 +3,8 @@ Build 3D Menu Handler
 Handles 3D model generation from 2D models
 """
 
-from parser.models.node import Node3D
-from parser.models.element import Element3D
-from parser.models.neutral_file import NeutralFile3D
-from parser.models.die import Die3D
+from preloader import Model3DBatch, Model3DWorker, StepCache
 import os
-import math
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QSpinBox, QDoubleSpinBox, QPushButton,
                              QGroupBox, QMessageBox, QProgressDialog)
@@ -21,6 +17,8 @@ class Build3DHandler:
     def __init__(self, main_window):
         self.main_window = main_window
         self.working_directory = None
+        self.build_worker = None
+        self.progress_dialog = None
 
     def plane_strain_model(self):
         """Create 3D plane strain model"""
@@ -43,6 +41,10 @@ class Build3DHandler:
         if not self._check_prerequisites():
             return
 
+        if self.is_building():
+            logger.info("A 3D model is already being built")
+            return
+
         dialog = Build3DDialog(self.main_window, model_type)
 
         # Try to get thickness from fem.dat
@@ -52,7 +54,10 @@ class Build3DHandler:
 
         if dialog.exec_() == QDialog.Accepted:
             params = dialog.get_parameters()
-            self._build_3d_model(model_type, params)
+            if params['last_step'] > params['step']:
+                self._build_3d_sequence(model_type, params)
+            else:
+                self._build_3d_model(model_type, params)
 
     def _check_prerequisites(self):
         """Verify required data is available"""
@@ -116,54 +121,130 @@ class Build3DHandler:
         return None
 
     def _build_3d_model(self, model_type, params):
-        """Create 3D model from current 2D data"""
-        try:
-            step = params['step']
-            visualization_manager = self.main_window.visualization_manager
-            visualization_manager._on_mesh_spinbox_changed(step)
-            current_data = visualization_manager.current_data
-
-            if not current_data:
-                return
-
-            progress_dialog = self._create_progress_dialog()
-            progress_dialog.show()
-
-            try:
-                data_3d = self._create_3d_neutral_file(
-                    current_data, model_type, params, progress_dialog
-                )
-
-                progress_dialog.close()
-
-                if data_3d:
-                    # Load 3D model in visualization
-                    visualization_manager.load_neutral_file(data_3d, True)
-
-                    QMessageBox.information(
-                        self.main_window,
-                        "3D Model Created",
-                        f"3D {model_type.replace('_', ' ').title()} model created successfully!"
-                    )
-                else:
-                    QMessageBox.warning(
-                        self.main_window,
-                        "Error",
-                        "Failed to create 3D model."
-                    )
-
-            except Exception as e:
-                progress_dialog.close()
-                raise e
+        """Create 3D model from current 2D data in a background thread"""
+        step = params['step']
+        visualization_manager = self.main_window.visualization_manager
 
-        except Exception as e:
-            logger.exception(f"Error building 3D model: {e}")
-            QMessageBox.critical(
+        # Single model: navigation shows 2D steps again
+        visualization_manager.set_model_3d_steps(None)
+        visualization_manager._on_mesh_spinbox_changed(step)
+        current_data = visualization_manager.current_data
+
+        if not current_data:
+            return
+
+        batch = Model3DBatch(visualization_manager.neu_files,
+                             visualization_manager.working_directory, model_type, params)
+        worker = Model3DWorker(batch, [step - 1], data_2d=current_data)
+        built_models = []
+
+        def on_finished():
+            # Load 3D model in visualization
+            visualization_manager.load_neutral_file(built_models[0], True)
+
+            QMessageBox.information(
                 self.main_window,
-                "Error",
-                f"Error building 3D model: {str(e)}"
+                "3D Model Created",
+                f"3D {model_type.replace('_', ' ').title()} model created successfully!"
             )
 
+        self._start_build(worker, lambda index, neutral_3d: built_models.append(neutral_3d),
+                          on_finished)
+
+    def _build_3d_sequence(self, model_type, params):
+        """Create 3D models of a range of steps for navigation and animation"""
+        visualization_manager = self.main_window.visualization_manager
+        indexes = [index for index in range(params['step'] - 1, params['last_step'])
+                   if index < len(visualization_manager.neu_files)]
+        if not indexes:
+            return
+
+        batch = Model3DBatch(visualization_manager.neu_files,
+                             visualization_manager.working_directory, model_type, params)
+        # Built steps are summarized by the worker thread for auto-scale
+        worker = Model3DWorker(batch, indexes,
+                               step_statistics=visualization_manager.step_statistics)
+        model_3d_statistics = {}
+        worker.statistics_computed.connect(model_3d_statistics.__setitem__)
+        # Evicted models are reloaded from the binary step cache
+        model_3d_steps = StepCache(loader=batch.load_step)
+
+        def on_finished():
+            # Navigation and animation now load the 3D models
+            visualization_manager.set_model_3d_steps(model_3d_steps, model_3d_statistics)
+            visualization_manager._on_mesh_spinbox_changed(indexes[0] + 1)
+
+            QMessageBox.information(
+                self.main_window,
+                "3D Models Created",
+                f"3D {model_type.replace('_', ' ').title()} models created for "
+                f"steps {indexes[0] + 1} to {indexes[-1] + 1}!"
+            )
+
+        self._start_build(worker, model_3d_steps.put, on_finished)
+
+    def is_building(self):
+        """Check if a 3D build is running"""
+        return self.build_worker is not None and self.build_worker.isRunning()
+
+    def stop_build(self):
+        """Cancel the running 3D build, its results are dropped"""
+        if self.is_building():
+            self.build_worker.stop()
+            if self.progress_dialog:
+                self.progress_dialog.setLabelText("Cancelling...")
+
+    def _start_build(self, worker, on_step_built, on_finished):
+        """Run a 3D build worker behind a cancellable progress dialog"""
+        self.progress_dialog = self._create_progress_dialog()
+        self.progress_dialog.canceled.connect(self.stop_build)
+
+        worker.step_built.connect(on_step_built)
+        worker.progress_updated.connect(self._on_build_progress)
+        worker.build_finished.connect(lambda: self._on_build_finished(worker, on_finished))
+        worker.build_cancelled.connect(self._close_progress_dialog)
+        worker.error_occurred.connect(self._on_build_error)
+
+        # Kept until the next build so the thread outlives its signals
+        self.build_worker = worker
+        self.progress_dialog.show()
+        worker.start()
+
+    def _on_build_progress(self, percentage, message):
+        """Show build progress"""
+        if self.progress_dialog and not self.build_worker.should_stop:
+            self.progress_dialog.setValue(percentage)
+            self.progress_dialog.setLabelText(message)
+
+    def _on_build_finished(self, worker, on_finished):
+        """Show the built models unless the build was cancelled meanwhile"""
+        self._close_progress_dialog()
+        if worker.should_stop:
+            return
+
+        try:
+            on_finished()
+        except Exception as e:
+            self._on_build_error(str(e))
+
+    def _on_build_error(self, message):
+        """Report a failed build"""
+        self._close_progress_dialog()
+        logger.error(f"Error building 3D model: {message}")
+        QMessageBox.critical(
+            self.main_window,
+            "Error",
+            f"Error building 3D model: {message}"
+        )
+
+    def _close_progress_dialog(self):
+        """Close the build progress dialog"""
+        if self.progress_dialog:
+            # Closing emits canceled, which must not stop a finished build
+            self.progress_dialog.canceled.disconnect(self.stop_build)
+            self.progress_dialog.close()
+            self.progress_dialog = None
+
     def _create_progress_dialog(self):
         """Create progress dialog for model creation"""
         progress_dialog = QProgressDialog(
@@ -178,344 +259,9 @@ class Build3DHandler:
         progress_dialog.setMinimumDuration(0)
         progress_dialog.setAutoClose(False)
         progress_dialog.setAutoReset(False)
-        progress_dialog.setCancelButton(None)
 
         return progress_dialog
 
-    def _create_3d_neutral_file(self, data_2d, model_type, params, progress_dialog):
-        """Create 3D neutral file from 2D data"""
-
-        # Create new 3D neutral file
-        title_3d = f"3D_{model_type}_{data_2d.get_title()}"
-        neutral_3d = NeutralFile3D(title_3d)
-        neutral_3d.set_t_time(data_2d.get_t_time())
-
-        # Create 3D nodes
-        self._create_3d_nodes(data_2d, neutral_3d, model_type, params)
-
-        # Create 3D elements
-        self._create_3d_elements(
-            data_2d, neutral_3d, model_type, params, progress_dialog)
-
-        # Create 3D dies if any
-        self._create_3d_dies(data_2d, neutral_3d, model_type, params)
-
-        return neutral_3d
-
-    def _create_3d_nodes(self, data_2d, neutral_3d, model_type, params):
-        """Create 3D nodes from 2D nodes"""
-
-        divisions = params['divisions']
-        nodes_2d = list(data_2d.get_nodes())
-
-        if model_type in ["axisymmetric", "axisymmetric_cheese"]:
-            # Axisymmetric: rotate around Z axis
-            angle_total = 2 * math.pi
-            if model_type == "axisymmetric_cheese":
-                angle_total = math.radians(params['angle'])
-
-            for i_div in range(divisions + 1):
-                alpha = (angle_total * i_div) / divisions
-
-                for node_2d in nodes_2d:
-                    node_id_3d = node_2d.get_id() + i_div * len(nodes_2d)
-
-                    # Convert r,z to x,y,z
-                    r = node_2d.get_coordX()
-                    z = node_2d.get_coordY()
-
-                    x = r * math.cos(alpha)
-                    y = r * math.sin(alpha)
-
-                    node_3d = Node3D(node_id_3d)
-                    node_3d.set_coordX(x)
-                    node_3d.set_coordY(y)
-                    node_3d.set_coordZ(z)
-
-                    # Transform velocities to cartesian
-                    if node_2d.get_Vx() is not None:
-                        vx = node_2d.get_Vx() * math.cos(alpha)
-                        vy = node_2d.get_Vx() * math.sin(alpha)
-                        node_3d.set_Vx(vx)
-                        node_3d.set_Vy(vy)
-
-                    # Transform forces to cartesian
-                    if node_2d.get_Fx() is not None:
-                        fx = node_2d.get_Fx() * math.cos(alpha)
-                        fy = node_2d.get_Fx() * math.sin(alpha)
-                        node_3d.set_Fx(fx)
-                        node_3d.set_Fy(fy)
-
-                    # Copy scalar properties
-                    node_3d.set_Temp(node_2d.get_Temp())
-                    node_3d.set_DTemp(node_2d.get_DTemp())
-                    node_3d.set_code(node_2d.get_code())
-                    node_3d.set_is_contact(node_2d.is_contact_node())
-
-                    neutral_3d.add_node(node_3d)
-
-        else:  # plane_strain or plane_stress
-            thickness = params['thickness']
-
-            for i_div in range(divisions + 1):
-                if model_type == "plane_stress":
-                    # Plane stress: adjust Z based on strain
-                    z = self._calculate_plane_stress_z_coordinate(
-                        data_2d, thickness, i_div, divisions)
-                else:  # plane_strain
-                    # Plane strain: linear distribution
-                    z = (thickness * i_div) / divisions
-
-                for node_2d in nodes_2d:
-                    node_id_3d = node_2d.get_id() + i_div * len(nodes_2d)
-
-                    node_3d = Node3D(node_id_3d)
-                    node_3d.set_coordX(node_2d.get_coordX())
-                    node_3d.set_coordY(node_2d.get_coordY())
-                    node_3d.set_coordZ(z)
-
-                    # Copy velocities and forces
-                    node_3d.set_Vx(node_2d.get_Vx())
-                    node_3d.set_Vy(node_2d.get_Vy())
-
-                    node_3d.set_Fx(node_2d.get_Fx())
-                    node_3d.set_Fy(node_2d.get_Fy())
-
-                    node_3d.set_Temp(node_2d.get_Temp())
-                    node_3d.set_DTemp(node_2d.get_DTemp())
-                    node_3d.set_code(node_2d.get_code())
-                    node_3d.set_is_contact(node_2d.is_contact_node())
-
-                    neutral_3d.add_node(node_3d)
-
-    def _create_3d_elements(self, data_2d, neutral_3d, model_type, params, progress_dialog=None):
-        """Convert 2D elements (quads) to 3D elements (hexahedra)"""
-        divisions = params['divisions']
-        elements_2d = list(data_2d.get_elements())
-        nodes_2d_count = len(list(data_2d.get_nodes()))
-
-        total_elements = len(elements_2d) * divisions
-        elements_created = 0
-
-        for i_div in range(divisions):
-            for elem_2d in elements_2d:
-                elem_id_3d = elem_2d.get_id() + i_div * len(elements_2d)
-
-                elem_3d = Element3D(elem_id_3d)
-                elem_3d.set_matno(elem_2d.get_matno())
-
-                # Get 2D nodes
-                nodes_2d = elem_2d.get_lnods()
-
-                # Create hexahedron from quad
-                # Bottom face (current level)
-                node1_3d_id = nodes_2d[0].get_id() + i_div * nodes_2d_count
-                node2_3d_id = nodes_2d[1].get_id() + i_div * nodes_2d_count
-                node3_3d_id = nodes_2d[2].get_id() + i_div * nodes_2d_count
-                node4_3d_id = nodes_2d[3].get_id() + i_div * nodes_2d_count
-
-                # Top face (next level)
-                if i_div == divisions - 1 and model_type in ["axisymmetric"]:
-                    # Full axisymmetric: connect to first layer
-                    node5_3d_id = nodes_2d[0].get_id()
-                    node6_3d_id = nodes_2d[1].get_id()
-                    node7_3d_id = nodes_2d[2].get_id()
-                    node8_3d_id = nodes_2d[3].get_id()
-                else:
-                    node5_3d_id = nodes_2d[0].get_id(
-                    ) + (i_div + 1) * nodes_2d_count
-                    node6_3d_id = nodes_2d[1].get_id(
-                    ) + (i_div + 1) * nodes_2d_count
-                    node7_3d_id = nodes_2d[2].get_id(
-                    ) + (i_div + 1) * nodes_2d_count
-                    node8_3d_id = nodes_2d[3].get_id(
-                    ) + (i_div + 1) * nodes_2d_count
-
-                # Get actual node objects
-                node1_3d = neutral_3d.get_node_by_id(node1_3d_id)
-                node2_3d = neutral_3d.get_node_by_id(node2_3d_id)
-                node3_3d = neutral_3d.get_node_by_id(node3_3d_id)
-                node4_3d = neutral_3d.get_node_by_id(node4_3d_id)
-                node5_3d = neutral_3d.get_node_by_id(node5_3d_id)
-                node6_3d = neutral_3d.get_node_by_id(node6_3d_id)
-                node7_3d = neutral_3d.get_node_by_id(node7_3d_id)
-                node8_3d = neutral_3d.get_node_by_id(node8_3d_id)
-
-                # Set hexahedron nodes
-                elem_3d.set_lnods([node1_3d, node2_3d, node3_3d, node4_3d,
-                                   node5_3d, node6_3d, node7_3d, node8_3d])
-
-                # Copy element properties and transform for 3D
-                self._copy_element_properties_3d(
-                    elem_2d, elem_3d, model_type, i_div, divisions, params)
-
-                neutral_3d.add_element(elem_3d)
-
-                elements_created += 1
-
-                # Update progress every 300 elements to avoid slowing down
-                if elements_created % 300 == 0:
-                    progress_percent = int(elements_created / total_elements)
-                    progress_dialog.setValue(progress_percent)
-                    self.main_window.repaint()
-
-        progress_dialog.setValue(80)
-
-    def _copy_element_properties_3d(self, elem_2d, elem_3d, model_type, i_div, divisions, params):
-        """Copy and transform element properties for 3D"""
-        # Copy basic properties
-        elem_3d.set_rindx(elem_2d.get_rindx())
-        elem_3d.set_densy(elem_2d.get_densy())
-        elem_3d.set_fract(elem_2d.get_fract())
-
-        # Transform strain and stress based on model type
-        if model_type in ["axisymmetric", "axisymmetric_cheese"]:
-            # Axisymmetric transformation
-            angle_total = 2 * math.pi
-            if model_type == "axisymmetric_cheese":
-                angle_total = math.radians(params['angle'])
-
-            alpha = (angle_total * (i_div + 0.5)) / \
-                divisions  # Mid-element angle
-
-            # Transform strains (r,z,theta,rz) -> (x,y,z,xy,yz,zx)
-            strain_r = elem_2d.get_strain_Exx() or 0.0
-            strain_z = elem_2d.get_strain_Eyy() or 0.0
-            strain_t = elem_2d.get_strain_Ezz() or 0.0
-
-            strain_x = strain_r * \
-                math.cos(alpha)**2 + strain_t * math.sin(alpha)**2
-            strain_y = strain_r * \
-                math.sin(alpha)**2 + strain_t * math.cos(alpha)**2
-            strain_xy = (strain_r - strain_t) * \
-                math.cos(alpha) * math.sin(alpha)
-
-            elem_3d.set_strain_Exx(strain_x)
-            elem_3d.set_strain_Eyy(strain_y)
-            elem_3d.set_strain_Ezz(strain_z)
-            elem_3d.set_strain_Exy(strain_xy)
-
-            # Transform stresses similarly
-            stress_r = elem_2d.get_stress_Oxx() or 0.0
-            stress_z = elem_2d.get_stress_Oyy() or 0.0
-            stress_t = elem_2d.get_stress_Ozz() or 0.0
-
-            stress_x = stress_r * \
-                math.cos(alpha)**2 + stress_t * math.sin(alpha)**2
-            stress_y = stress_r * \
-                math.sin(alpha)**2 + stress_t * math.cos(alpha)**2
-            stress_xy = (stress_r - stress_t) * \
-                math.cos(alpha) * math.sin(alpha)
-
-            elem_3d.set_stress_Oxx(stress_x)
-            elem_3d.set_stress_Oyy(stress_y)
-            elem_3d.set_stress_Ozz(stress_z)
-            elem_3d.set_stress_Oxy(stress_xy)
-
-        else:  # plane_strain or plane_stress
-            # Direct copy with zero Z components
-            elem_3d.set_strain_Exx(elem_2d.get_strain_Exx())
-            elem_3d.set_strain_Eyy(elem_2d.get_strain_Eyy())
-            elem_3d.set_strain_Ezz(elem_2d.get_strain_Ezz())
-            elem_3d.set_strain_Exy(elem_2d.get_strain_Exy())
-
-            elem_3d.set_stress_Oxx(elem_2d.get_stress_Oxx())
-            elem_3d.set_stress_Oyy(elem_2d.get_stress_Oyy())
-            elem_3d.set_stress_Ozz(elem_2d.get_stress_Ozz())
-            elem_3d.set_stress_Oxy(elem_2d.get_stress_Oxy())
-
-        # Copy other properties
-        elem_3d.set_strain_E(elem_2d.get_strain_E())
-        elem_3d.set_stress_O(elem_2d.get_stress_O())
-        elem_3d.set_stress_Orr(elem_2d.get_stress_Orr())
-
-        # Copy strain rates
-        elem_3d.set_strain_rate_E(elem_2d.get_strain_rate_E())
-        elem_3d.set_strain_rate_Ev(elem_2d.get_strain_rate_Ev())
-
-    def _create_3d_dies(self, data_2d, neutral_3d, model_type, params):
-        """Generate 3D die geometry from 2D dies"""
-        dies_2d = data_2d.get_dies()
-
-        if not dies_2d:
-            return
-
-        divisions = params['divisions']
-        thickness = params.get('thickness', 1.0)
-
-        if model_type == "plane_stress":
-            thickness /= 2.0
-
-        for die_2d in dies_2d:
-            die_3d = Die3D(die_2d.get_id())
-            die_3d.set_temp(die_2d.get_temp())
-            die_3d.set_m(die_2d.get_m())
-
-            die_nodes_2d = die_2d.nodes
-
-            if model_type in ["axisymmetric", "axisymmetric_cheese"]:
-                angle_total = 2 * math.pi
-                if model_type == "axisymmetric_cheese":
-                    angle_total = math.radians(params['angle'])
-
-                for i_div in range(divisions + 1):
-                    alpha = (angle_total * i_div) / divisions
-
-                    for node_2d in die_nodes_2d:
-                        # Convert r,z to x,y,z for axisymmetric
-                        r = node_2d.get_coordX()
-                        z = node_2d.get_coordY()
-
-                        x = r * math.cos(alpha)
-                        y = r * math.sin(alpha)
-
-                        # Create 3D node with unique ID
-                        node_3d_id = -(1000 + die_2d.get_id() * 1000 +
-                                       i_div * 100 + len(die_3d.get_nodes()))
-                        node_3d = Node3D(node_3d_id)
-                        node_3d.set_coordX(x)
-                        node_3d.set_coordY(y)
-                        node_3d.set_coordZ(z)
-
-                        die_3d.add_node(node_3d)
-
-            else:  # plane_strain or plane_stress
-                for i_div in range(divisions + 1):
-                    z = (thickness * i_div) / divisions
-
-                    for node_2d in die_nodes_2d:
-                        # Create 3D die node with unique ID
-                        node_3d_id = -(1000 + die_2d.get_id() * 1000 +
-                                       i_div * 100 + len(die_3d.get_nodes()))
-                        node_3d = Node3D(node_3d_id)
-                        node_3d.set_coordX(node_2d.get_coordX())
-                        node_3d.set_coordY(node_2d.get_coordY())
-                        node_3d.set_coordZ(z)
-
-                        die_3d.add_node(node_3d)
-
-            neutral_3d.add_die(die_3d)
-
-    def _calculate_plane_stress_z_coordinate(self, data_2d, thickness, i_div, divisions):
-        """Calculate Z coordinate for plane stress with strain correction"""
-        if i_div == 0:
-            return 0.0
-
-        strain_z_min = 1.0e+10
-
-        elements = list(data_2d.get_elements())
-        for element in elements:
-            strain_z = element.get_strain_Ezz() or 0.0
-            if strain_z < strain_z_min:
-                strain_z_min = strain_z
-
-        correction = math.exp(strain_z_min)
-
-        thickz = (0.5 * thickness * correction *
-                  float(i_div)) / float(divisions)
-
-        return thickz
-
 
 class Build3DDialog(QDialog):
     """Configuration dialog for 3D model creation"""
@@ -542,8 +288,17 @@ class Build3DDialog(QDialog):
         self.step_spinbox.setMaximum(9999)
         self.step_spinbox.setValue(1)
 
+        # Later last step builds a 3D model of every step in the range
+        self.last_step_spinbox = QSpinBox()
+        self.last_step_spinbox.setMinimum(1)
+        self.last_step_spinbox.setMaximum(9999)
+        self.last_step_spinbox.setValue(1)
+        self.step_spinbox.valueChanged.connect(self._on_step_changed)
+
         step_layout.addWidget(QLabel("Step Number:"))
         step_layout.addWidget(self.step_spinbox)
+        step_layout.addWidget(QLabel("To:"))
+        step_layout.addWidget(self.last_step_spinbox)
         step_layout.addStretch()
 
         step_group.setLayout(step_layout)
@@ -622,6 +377,11 @@ class Build3DDialog(QDialog):
 
         self.setLayout(layout)
 
+    def _on_step_changed(self, value):
+        """Keep the last step after the first one"""
+        if self.last_step_spinbox.value() < value:
+            self.last_step_spinbox.setValue(value)
+
     def set_thickness(self, thickness):
         """Update thickness value from fem.dat"""
         self.thick = thickness
@@ -632,6 +392,7 @@ class Build3DDialog(QDialog):
         """Get dialog parameters"""
         params = {
             'step': self.step_spinbox.value(),
+            'last_step': max(self.last_step_spinbox.value(), self.step_spinbox.value()),
             'divisions': self.divisions_spinbox.value(),
             'thickness': self.thick
         }
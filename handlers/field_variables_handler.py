@@ -10,6 +10,12 @@ logger = logging.getLogger(__name__)
 
 
 class FieldVariablesHandler:
+    # Arrays the vector display of a total reads its components from
+    VECTOR_COMPONENTS = {
+        "Total Velocity": ("Velocity X(r)", "Velocity Y(z)"),
+        "Total Force": ("Force X(r)", "Force Y(z)"),
+    }
+
     def __init__(self, main_window):
         self.main_window = main_window
         self.current_variable = None
@@ -105,15 +111,17 @@ class FieldVariablesHandler:
 
     def _resolve_variable_key(self, variable_key):
         """Convert variable key to actual mesh data name"""
-        mesh = self.get_visualization_manager().current_mesh
+        visualization_manager = self.get_visualization_manager()
+        mesh = visualization_manager.current_mesh
+        mesh_builder = visualization_manager.mesh_builder
 
         if variable_key in self.variable_mapping:
             mapped_name = self.variable_mapping[variable_key]
-            if mapped_name in mesh.cell_data:
+            if mesh_builder.has_cell_data(mesh, mapped_name):
                 return mapped_name
             else:
                 # Variable not available in mesh
-                available_list = list(mesh.cell_data.keys())
+                available_list = mesh_builder.get_cell_data_names(mesh)
                 QMessageBox.information(
                     self.main_window,
                     "Variable Not Available",
@@ -123,11 +131,11 @@ class FieldVariablesHandler:
                 return None
 
         # Check if key exists directly in mesh data
-        if variable_key in mesh.cell_data:
+        if mesh_builder.has_cell_data(mesh, variable_key):
             return variable_key
 
         # Variable not found
-        available_list = list(mesh.cell_data.keys())
+        available_list = mesh_builder.get_cell_data_names(mesh)
         QMessageBox.information(
             self.main_window,
             "Variable Not Available",
@@ -150,19 +158,42 @@ class FieldVariablesHandler:
             visualization_manager.default_edge_color, options
         )
 
+        # 3D models draw their outer surface, built models coarser while moving
+        prepared_meshes, coarse_meshes = self._prepare_surface_lod(
+            mesh, prepared_meshes, options)
+
         # Prepare dies
         prepared_dies = self._prepare_dies_for_display(visualization_manager)
 
+        # Same scene layout as the last frame: only update the live actors
+        render_key = self._get_render_key(
+            mesh, resolved_variable_name, original_key, options, prepared_dies)
+        if self._update_persistent_actors(visualization_manager, render_key,
+                                          prepared_meshes, prepared_dies, coarse_meshes):
+            visualization_manager.plotter.render()
+            self.current_variable = resolved_variable_name
+            return
+
         # Clear and redraw atomically
         visualization_manager.clear()
 
         # Add all prepared meshes
-        for mesh_data in prepared_meshes:
-            visualization_manager.plotter.add_mesh(**mesh_data)
+        mesh_actors, coarse_actors = self._add_mesh_actors(
+            visualization_manager, prepared_meshes, coarse_meshes)
 
         # Add all prepared dies
-        for die_data in prepared_dies:
-            visualization_manager.plotter.add_mesh(**die_data)
+        die_actors = [visualization_manager.plotter.add_mesh(**die_data)
+                      for die_data in prepared_dies]
+
+        # Keep the actors of single contour meshes for the next frames
+        if render_key is not None and len(mesh_actors) == 1:
+            visualization_manager.persistent_actors = {
+                'key': render_key,
+                'mesh': mesh,
+                'mesh_actor': mesh_actors[0],
+                'coarse_actor': coarse_actors[0],
+                'die_actors': die_actors,
+            }
 
         # Single render
         visualization_manager.plotter.render()
@@ -172,6 +203,131 @@ class FieldVariablesHandler:
         # Reapply picking if needed
         visualization_manager.reapply_mesh_picking_if_needed()
 
+    def _get_render_key(self, mesh, scalar_name, variable_display_name, options, prepared_dies):
+        """Get the scene layout key of a contour display, None if it can't be kept"""
+        # Vector and line contour geometry is regenerated for every frame
+        if options.get('vector_mode', False) or options.get('line_contour_mode', False):
+            return None
+
+        return (
+            getattr(mesh, '_topology_key', None),
+            scalar_name,
+            variable_display_name,
+            options.get('wireframe_mode', False),
+            options.get('show_mesh_edges', True),
+            options.get('monochromatic_mode', False),
+            options.get('high_definition_contour', False),
+            options.get('auto_scale_mode', False),
+            options.get('lod_mode', True),
+            tuple(die_data['mesh'].n_points for die_data in prepared_dies),
+        )
+
+    def _update_persistent_actors(self, visualization_manager, render_key,
+                                  prepared_meshes, prepared_dies, coarse_meshes):
+        """Move points and swap scalars of the live actors, returns success"""
+        state = visualization_manager.persistent_actors
+        if (render_key is None or state is None or state['key'] != render_key or
+                state['mesh'] is not visualization_manager.current_mesh or
+                len(prepared_meshes) != 1):
+            return False
+
+        mesh_data = prepared_meshes[0]
+        scalars = self._get_scalars(mesh_data)
+
+        # Scalar bar follows the lookup table range of the mapper
+        clim = mesh_data.get('clim')
+        if clim is None:
+            clim = [float(np.min(scalars)), float(np.max(scalars))]
+
+        self._update_actor_scalars(state['mesh_actor'], mesh_data, clim)
+        if state['coarse_actor'] is not None:
+            self._update_actor_scalars(state['coarse_actor'], coarse_meshes[0], clim)
+
+        # Die geometry keeps its cells, only the nodes move
+        for die_actor, die_data in zip(state['die_actors'], prepared_dies):
+            die_actor.mapper.dataset.points = die_data['mesh'].points
+
+        # Highlights of the previous frame no longer match the geometry
+        visualization_manager.interaction_handler.clear_highlight()
+        return True
+
+    @staticmethod
+    def _get_scalars(mesh_data):
+        """Get the scalar values of prepared mesh data, given by name or array"""
+        scalars = mesh_data['scalars']
+        if not isinstance(scalars, str):
+            return np.asarray(scalars)
+        if mesh_data.get('preference', 'cell') == 'point':
+            return np.asarray(mesh_data['mesh'].point_data[scalars])
+        return np.asarray(mesh_data['mesh'].cell_data[scalars])
+
+    @staticmethod
+    def _update_actor_scalars(actor, mesh_data, clim):
+        """Move the points and swap the scalars of a live actor"""
+        source = mesh_data['mesh']
+        scalars = FieldVariablesHandler._get_scalars(mesh_data)
+
+        # Rendered dataset is the mesh or its surface, colored by point data in HD
+        mapper = actor.mapper
+        dataset = mapper.dataset
+        if dataset is not source:
+            dataset.points = source.points
+        preference = mesh_data.get('preference', 'cell')
+        array_name = mapper.array_name or dataset.active_scalars_name
+        if preference == 'cell':
+            dataset.cell_data[array_name] = scalars
+        else:
+            dataset.point_data[array_name] = scalars
+        dataset.set_active_scalars(array_name, preference=preference)
+        mapper.scalar_range = clim
+
+    def _prepare_surface_lod(self, mesh, prepared_meshes, options):
+        """Draw 3D meshes by their outer surface, returns (meshes, coarse meshes)"""
+        mesh_builder = self.get_visualization_manager().mesh_builder
+        surface_lod = mesh_builder.get_surface_lod(mesh) if options.get('lod_mode', True) else None
+        if surface_lod is None:
+            return prepared_meshes, [None] * len(prepared_meshes)
+
+        surface_meshes = []
+        coarse_meshes = []
+        for mesh_data in prepared_meshes:
+            # Vectors and contour lines keep their own geometry
+            if mesh_data['mesh'] is not mesh:
+                surface_meshes.append(mesh_data)
+                coarse_meshes.append(None)
+                continue
+
+            surface_meshes.append(surface_lod.full.prepare(mesh, mesh_data))
+            if surface_lod.coarse is not None:
+                coarse_meshes.append(surface_lod.coarse.prepare(
+                    mesh, dict(mesh_data, show_scalar_bar=False)))
+            else:
+                coarse_meshes.append(None)
+
+        return surface_meshes, coarse_meshes
+
+    def _add_mesh_actors(self, visualization_manager, prepared_meshes, coarse_meshes):
+        """Add prepared meshes and their hidden coarse versions, returns both actor lists"""
+        plotter = visualization_manager.plotter
+        mesh_actors = []
+        coarse_actors = []
+
+        for mesh_data, coarse_data in zip(prepared_meshes, coarse_meshes):
+            mesh_actor = plotter.add_mesh(**mesh_data)
+            coarse_actor = None
+
+            if coarse_data is not None:
+                coarse_actor = plotter.add_mesh(**coarse_data)
+                # Same colors as the full surface when the range was not given
+                if coarse_data.get('scalars') is not None:
+                    coarse_actor.mapper.scalar_range = mesh_actor.mapper.scalar_range
+                visualization_manager.lod_switch.add(mesh_actor, coarse_actor)
+
+            mesh_actors.append(mesh_actor)
+            coarse_actors.append(coarse_actor)
+
+        return mesh_actors, coarse_actors
+
     def _prepare_all_meshes_for_display(self, mesh, scalar_name, variable_display_name, edge_color, options):
         """Prepare all mesh data for atomic rendering"""
         prepared_meshes = []
@@ -191,18 +347,26 @@ class FieldVariablesHandler:
         vector_mode = options.get('vector_mode', False)
         auto_scale_mode = options.get('auto_scale_mode', False)
 
-        # Apply HD contour if needed
-        if high_definition_contour:
-            mesh = mesh.cell_data_to_point_data()
+        # Field arrays are computed on first display of each variable
+        mesh_builder = self.get_visualization_manager().mesh_builder
+        mesh_builder.ensure_cell_data(mesh, scalar_name)
+        if vector_mode:
+            for component_name in self.VECTOR_COMPONENTS.get(scalar_name, ()):
+                mesh_builder.ensure_cell_data(mesh, component_name)
 
         # Choose colormap
         cmap = 'Blues' if monochromatic_mode else 'turbo'
 
-        # Get scalar data
-        if high_definition_contour and scalar_name in mesh.point_data:
-            scalars_array = mesh.point_data[scalar_name]
+        # Get scalar data, HD contour averages only this variable onto the nodes
+        # Vectors stay at the cell centers
+        # Arrays are passed by name, add_mesh keeps a copy of unnamed arrays on the mesh
+        if high_definition_contour and not vector_mode:
+            scalars_array = mesh_builder.get_point_data(mesh, scalar_name)
+            mesh.point_data[scalar_name] = scalars_array
+            preference = 'point'
         else:
             scalars_array = mesh.cell_data[scalar_name]
+            preference = 'cell'
 
         clim = None
         if auto_scale_mode:
@@ -220,7 +384,8 @@ class FieldVariablesHandler:
         elif wireframe_mode:
             mesh_data = {
                 'mesh': mesh,
-                'scalars': scalars_array,
+                'scalars': scalar_name,
+                'preference': preference,
                 'show_edges': False,
                 'opacity': 0.5,
                 'cmap': cmap,
@@ -232,7 +397,8 @@ class FieldVariablesHandler:
         else:
             mesh_data = {
                 'mesh': mesh,
-                'scalars': scalars_array,
+                'scalars': scalar_name,
+                'preference': preference,
                 'show_edges': show_mesh_edges,
                 'edge_color': edge_color if show_mesh_edges else None,
                 'line_width': 1,
@@ -486,6 +652,8 @@ class FieldVariablesHandler:
             }
 
         prepared_meshes.append(mesh_data)
+        prepared_meshes, coarse_meshes = self._prepare_surface_lod(
+            mesh, prepared_meshes, options)
 
         # Prepare dies
         prepared_dies = self._prepare_dies_for_display(visualization_manager)
@@ -494,8 +662,7 @@ class FieldVariablesHandler:
         visualization_manager.clear()
 
         # Add all prepared meshes
-        for mesh_data in prepared_meshes:
-            visualization_manager.plotter.add_mesh(**mesh_data)
+        self._add_mesh_actors(visualization_manager, prepared_meshes, coarse_meshes)
 
         # Add all prepared dies
         for die_data in prepared_dies:
@@ -544,7 +711,8 @@ class FieldVariablesHandler:
         available_vars = {}
 
         for key, mapped_name in self.variable_mapping.items():
-            is_available = mapped_name in mesh.cell_data
+            is_available = visualization_manager.mesh_builder.has_cell_data(
+                mesh, mapped_name)
             available_vars[key] = (mapped_name, is_available)
 
         return available_vars
@@ -48,22 +48,26 @@ class FileHandler:
         # Hide deformed mesh controls
         visualization_manager.hide_deformed_mesh_controls()
 
-        # Clear preloaded data
-        visualization_manager.preloaded_data = {}
+        # Clear preloaded data and built 3D models
+        visualization_manager.preloaded_data.clear()
+        visualization_manager.set_model_3d_steps(None)
 
         # Stop any preloading in progress
         self.main_window.mesh_handler.preloader_manager.stop_preloading()
+        self.main_window.build_3d_handler.stop_build()
 
         # Reset mesh handler data
         self.main_window.mesh_handler.neu_files = []
         self.main_window.mesh_handler.working_directory = None
 
-        self.main_window.mesh_handler.preloader_manager.preloaded_files = {}
+        self.main_window.mesh_handler.preloader_manager.clear_preloaded_data()
         # Reset field variables handler current variable
         self.main_window.field_variables_handler.current_variable = None
 
         if hasattr(visualization_manager, 'scales_cache'):
             visualization_manager.scales_cache = {}
+        if hasattr(visualization_manager, 'step_statistics'):
+            visualization_manager.step_statistics.clear()
 
     def print_document(self):
         """Print current document"""
@@ -41,7 +41,7 @@ class MeshHandler:
     def _load_and_display_mesh(self, file_path):
         """Load mesh file and display in visualization"""
         try:
-            neutral_file = ParserNeutralFile.parser_file(file_path)
+            neutral_file = ParserNeutralFile.parser_file_cached(file_path)
 
             if not neutral_file:
                 QMessageBox.warning(
@@ -3,6 +3,7 @@ Main Application - Entry Point
 """
 
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication, QMainWindow
 import logging
 
@@ -222,6 +223,8 @@ class MainWindow(QMainWindow):
 
 
 if __name__ == "__main__":
+    # Required by the preloading worker processes in frozen builds
+    multiprocessing.freeze_support()
     logging.basicConfig(
         level=logging.INFO, format='%(levelname)s - %(name)s - %(lineno)d - %(message)s')
     app = QApplication(sys.argv)
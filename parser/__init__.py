@@ -3,10 +3,18 @@ Système de parsing des fichiers .NEU
 """
 
 from .parser_neutral_file import ParserNeutralFile
-from .models import Die, Element, NeutralFile, Node
+from .neutral_file_index import NeutralFileIndex
+from .binary_step_cache import BinaryStepCache
+from .field_statistics import FieldStatisticsIndex, FieldStatisticsStore
+from .models import ColumnarNeutralFile, Die, Element, NeutralFile, Node
 
 __all__ = [
     "ParserNeutralFile",
+    "NeutralFileIndex",
+    "BinaryStepCache",
+    "FieldStatisticsIndex",
+    "FieldStatisticsStore",
+    "ColumnarNeutralFile",
     "Die",
     "Element",
     "NeutralFile",
@@ -0,0 +1,236 @@
+""" Persistent binary cache of parsed .NEU steps """
+
+import json
+import os
+import threading
+import numpy as np
+
+from .models.columnar_neutral_file import ColumnarNeutralFile
+from .models.die import Die, Die3D
+from .models.node import Node, Node3D
+import logging
+logger = logging.getLogger(__name__)
+
+
+class BinaryStepCache:
+    """
+    Stores each parsed step as contiguous .npy arrays that can be
+    memory-mapped back, invalidated when the source size or mtime changes.
+    Arrays are mapped copy-on-write, so loaded steps are writable like
+    parsed ones and writes never reach the cache files. Steps derived from
+    a source, like its 3D models, are stored under their own entry_name.
+    """
+
+    CACHE_DIRNAME = '.neu_cache'
+    FORMAT_VERSION = 1
+
+    # Arrays written per step (file name -> ColumnarNeutralFile attribute)
+    ARRAY_FILES = ('node_ids', 'is_contact', 'element_ids', 'matno', 'lnods')
+
+    def __init__(self, cache_directory=None, mmap_mode='c', entry_name=None):
+        # None stores the cache next to each source file
+        self.cache_directory = cache_directory
+        self.mmap_mode = mmap_mode
+        # None stores the parsed step, else a step derived from it
+        self.entry_name = entry_name
+
+    def get_cache_path(self, source_path):
+        """Get the cache directory of one source file"""
+        source_path = os.path.abspath(source_path)
+        cache_root = self.cache_directory or os.path.join(
+            os.path.dirname(source_path), self.CACHE_DIRNAME)
+        cache_path = os.path.join(cache_root, os.path.basename(source_path))
+        if self.entry_name is not None:
+            cache_path = os.path.join(cache_path, self.entry_name)
+        return cache_path
+
+    @staticmethod
+    def get_source_key(source_path):
+        """Get (size, mtime) used to validate a cache entry"""
+        stat = os.stat(source_path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def get_temporary_path(path):
+        """Get a temporary path next to path, unique per process and thread"""
+        return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def load(self, source_path):
+        """Load a cached step, returns None if missing or stale"""
+        cache_path = self.get_cache_path(source_path)
+        meta_path = os.path.join(cache_path, 'meta.json')
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            if (meta.get('version') != self.FORMAT_VERSION or
+                    meta.get('source') != self.get_source_key(source_path)):
+                return None
+
+            neu = ColumnarNeutralFile(meta['title'])
+            neu.set_t_time(meta['t_time'])
+            if meta.get('layer_layout') is not None:
+                neu.layer_layout = tuple(meta['layer_layout'])
+
+            for name in self.ARRAY_FILES:
+                setattr(neu, name, self._load_array(cache_path, name))
+
+            # Field columns are rows of one contiguous 2D array
+            node_fields = self._load_array(cache_path, 'node_fields')
+            neu.node_fields = {name: node_fields[i]
+                               for i, name in enumerate(meta['node_fields'])}
+            element_fields = self._load_array(cache_path, 'element_fields')
+            neu.element_fields = {name: element_fields[i]
+                                  for i, name in enumerate(meta['element_fields'])}
+
+            for die_data in meta['dies']:
+                neu.add_die(self._die_from_dict(die_data))
+
+            return neu
+
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache '{cache_path}': {e}")
+            return None
+
+    def store(self, source_path, neu, source_key=None):
+        """
+        Write a parsed step to the cache, returns True on success
+
+        source_key is the key of the source taken before it was parsed, the
+        entry is not written when the source changed since.
+        """
+        cache_path = self.get_cache_path(source_path)
+        if source_key is None:
+            source_key = self.get_source_key(source_path)
+
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+
+            for name in self.ARRAY_FILES:
+                self._save_array(cache_path, name, getattr(neu, name))
+
+            node_names = list(neu.node_fields)
+            self._save_array(cache_path, 'node_fields', np.array(
+                [neu.node_fields[name] for name in node_names], dtype=np.float64))
+            element_names = list(neu.element_fields)
+            self._save_array(cache_path, 'element_fields', np.array(
+                [neu.element_fields[name] for name in element_names], dtype=np.float64))
+
+            # A source rewritten during the parse must not be cached as valid
+            if self.get_source_key(source_path) != source_key:
+                logger.info(f"Not caching '{source_path}', it changed while parsed")
+                return False
+
+            meta = {
+                'version': self.FORMAT_VERSION,
+                'source': source_key,
+                'title': neu.get_title(),
+                't_time': neu.get_t_time(),
+                'layer_layout': neu.layer_layout,
+                'node_fields': node_names,
+                'element_fields': element_names,
+                'dies': [self._die_to_dict(die) for die in neu.get_dies()],
+            }
+
+            # Metadata is written last so a partial entry is never valid
+            meta_path = os.path.join(cache_path, 'meta.json')
+            temporary_path = self.get_temporary_path(meta_path)
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                json.dump(meta, file)
+            os.replace(temporary_path, meta_path)
+            return True
+
+        except Exception as e:
+            logger.warning(f"Could not write cache '{cache_path}': {e}")
+            return False
+
+    def load_or_parse(self, source_path):
+        """Load step from cache, parsing and caching it on a miss"""
+        neu = self.load(source_path)
+        if neu is not None:
+            return neu
+
+        # Imported here to avoid a circular import with the parser
+        from .parser_neutral_file import ParserNeutralFile
+
+        try:
+            source_key = self.get_source_key(source_path)
+        except OSError:
+            source_key = None
+
+        neu = ParserNeutralFile.parser_file_columnar(source_path)
+        if neu is not None and source_key is not None:
+            self.store(source_path, neu, source_key)
+        return neu
+
+    def invalidate(self, source_path):
+        """Remove the cache entry of one source file"""
+        meta_path = os.path.join(self.get_cache_path(source_path), 'meta.json')
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+
+    def _load_array(self, cache_path, name):
+        """Load one array, memory-mapped when enabled"""
+        return np.load(os.path.join(cache_path, f"{name}.npy"),
+                       mmap_mode=self.mmap_mode)
+
+    @classmethod
+    def _save_array(cls, cache_path, name, array):
+        """Save one array as a contiguous .npy file"""
+        # Replaced rather than rewritten, steps may still map the old file.
+        # Workers and the GUI thread may write the same step at once.
+        array_path = os.path.join(cache_path, f"{name}.npy")
+        temporary_path = cls.get_temporary_path(array_path)
+        with open(temporary_path, 'wb') as file:
+            np.save(file, np.ascontiguousarray(array))
+        os.replace(temporary_path, array_path)
+
+    @staticmethod
+    def _die_to_dict(die):
+        """Serialize a die to plain values"""
+        main_node = die.get_main_node()
+        die_data = {
+            'id': die.get_id(),
+            'temp': die.get_temp(),
+            'm': die.get_m(),
+            'main_node': None if main_node is None else [
+                main_node.x, main_node.y, main_node.vx,
+                main_node.vy, main_node.fx, main_node.fy],
+            'nodes': [[node.x, node.y] for node in die.get_nodes()],
+        }
+
+        # Nodes of 3D dies keep their ids and Z coordinate
+        if isinstance(die, Die3D):
+            die_data['nodes'] = [[node.id, node.x, node.y, node.z]
+                                 for node in die.get_nodes()]
+            die_data['is_3d'] = True
+        return die_data
+
+    @staticmethod
+    def _die_from_dict(die_data):
+        """Rebuild a die from plain values"""
+        is_3d = die_data.get('is_3d', False)
+        die = (Die3D if is_3d else Die)(die_data['id'])
+        die.temp = die_data['temp']
+        die.m = die_data['m']
+
+        if die_data['main_node'] is not None:
+            main_node = Node(-1)  # Temporary ID
+            (main_node.x, main_node.y, main_node.vx,
+             main_node.vy, main_node.fx, main_node.fy) = die_data['main_node']
+            die.main_node = main_node
+
+        for node_data in die_data['nodes']:
+            if is_3d:
+                node = Node3D(node_data[0])
+                node.x, node.y, node.z = node_data[1:]
+            else:
+                node = Node(-1)  # Temporary ID
+                node.x, node.y = node_data
+            die.nodes.append(node)
+
+        return die
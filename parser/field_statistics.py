@@ -0,0 +1,203 @@
+"""
+Field Statistics Module
+Per-step summary statistics of field variables for auto-scaling
+"""
+
+import json
+import os
+import numpy as np
+
+from .binary_step_cache import BinaryStepCache
+from .models.columnar_neutral_file import ColumnarNeutralFile
+from .models.element_fields import (ElementFieldArrays, FIELD_VARIABLES,
+                                    gather_element_columns)
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class FieldStatisticsIndex:
+    """
+    Summary statistics of every field variable, per step index
+
+    A step is summarized once when it is added, so the range of a variable
+    over a run is a reduction of per-step records instead of a pass over
+    every element of every step. With a store attached, records are read
+    from and written to disk by step file name. Statistics only depend on
+    the parser, so preload worker processes compute them too.
+    """
+
+    PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+    HISTOGRAM_BINS = 32  # Equal-width bins between min and max
+
+    def __init__(self):
+        self._steps = {}  # index -> {variable: statistics record}
+        self.store = None
+        self.file_names = []
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __contains__(self, index):
+        return index in self._steps
+
+    def indexes(self):
+        """Get all indexed step indexes"""
+        return sorted(self._steps)
+
+    def attach_store(self, store, file_names):
+        """Use an on-disk store for the given step files, loading its records"""
+        self.store = store
+        self.file_names = list(file_names)
+
+        for index, file_name in enumerate(self.file_names):
+            if index not in self._steps:
+                statistics = store.load(file_name)
+                if statistics is not None:
+                    self._steps[index] = statistics
+
+        logger.info(
+            f"Loaded field statistics of {len(self._steps)}/{len(self.file_names)} steps")
+
+    def add_step(self, index, neutral_data):
+        """Compute and store the statistics of one step"""
+        return self.set_step(index, self.compute_step_statistics(neutral_data))
+
+    def set_step(self, index, statistics):
+        """Store statistics of one step computed elsewhere"""
+        self._steps[index] = statistics
+
+        if self.store is not None and index < len(self.file_names):
+            self.store.save(self.file_names[index], statistics)
+        return statistics
+
+    def get_step(self, index):
+        """Get statistics of one step, None if not indexed"""
+        return self._steps.get(index)
+
+    def discard(self, index):
+        """Forget statistics of one step"""
+        self._steps.pop(index, None)
+
+    def clear(self):
+        """Forget all steps and detach the store"""
+        self._steps.clear()
+        self.store = None
+        self.file_names = []
+
+    def get_range(self, variable_name, indexes=None):
+        """Get (min, max) of a variable over the given or all indexed steps"""
+        if indexes is None:
+            indexes = self._steps.keys()
+
+        records = [self._steps[index].get(variable_name)
+                   for index in indexes if index in self._steps]
+        records = [record for record in records if record is not None]
+        if not records:
+            return None, None
+
+        return (min(record['min'] for record in records),
+                max(record['max'] for record in records))
+
+    @classmethod
+    def compute_step_statistics(cls, neutral_data):
+        """Compute statistics of every field variable of one step"""
+        return {name: cls.summarize(values)
+                for name, values in cls.compute_field_variables(neutral_data).items()}
+
+    @staticmethod
+    def compute_field_variables(neutral_data):
+        """Compute all field variable arrays of the drawable elements of a step"""
+        if not neutral_data or not neutral_data.is_complete():
+            return {}
+
+        if isinstance(neutral_data, ColumnarNeutralFile):
+            connectivity = neutral_data.get_connectivity()
+            element_rows = np.flatnonzero((connectivity >= 0).all(axis=1))
+            field_arrays = neutral_data.get_field_arrays(element_rows)
+        else:
+            field_arrays = ElementFieldArrays(
+                *gather_element_columns(list(neutral_data.get_elements())))
+
+        return {name: field_arrays.field_variable(name) for name in FIELD_VARIABLES}
+
+    @classmethod
+    def summarize(cls, values):
+        """Get min, max, mean, percentiles and histogram of the finite values"""
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return None
+
+        value_min = float(values.min())
+        value_max = float(values.max())
+        histogram, _ = np.histogram(values, bins=cls.HISTOGRAM_BINS,
+                                    range=(value_min, value_max))
+
+        return {
+            'count': len(values),
+            'min': value_min,
+            'max': value_max,
+            'mean': float(values.mean()),
+            'percentiles': np.percentile(values, cls.PERCENTILES).tolist(),
+            'histogram': histogram.tolist(),
+        }
+
+
+class FieldStatisticsStore:
+    """
+    On-disk field statistics of the steps of one working directory
+
+    Each step gets a small JSON record in its binary step cache entry,
+    invalidated when the source size or mtime changes. Reopening a run
+    that is still being written only computes records for new steps.
+    """
+
+    FILENAME = 'field_statistics.json'
+    FORMAT_VERSION = 1
+
+    def __init__(self, working_directory, step_cache=None):
+        self.working_directory = working_directory
+        self.step_cache = step_cache or BinaryStepCache()
+
+    def _get_paths(self, file_name):
+        """Get (source path, record path) of one step file"""
+        source_path = os.path.join(self.working_directory, file_name)
+        record_path = os.path.join(
+            self.step_cache.get_cache_path(source_path), self.FILENAME)
+        return source_path, record_path
+
+    def load(self, file_name):
+        """Load statistics of one step, returns None if missing or stale"""
+        source_path, record_path = self._get_paths(file_name)
+
+        try:
+            with open(record_path, 'r', encoding='utf-8') as file:
+                record = json.load(file)
+            if (record.get('version') != self.FORMAT_VERSION or
+                    record.get('source') != self.step_cache.get_source_key(source_path)):
+                return None
+            return record['variables']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, file_name, statistics):
+        """Write statistics of one step, returns True on success"""
+        source_path, record_path = self._get_paths(file_name)
+
+        try:
+            os.makedirs(os.path.dirname(record_path), exist_ok=True)
+            record = {
+                'version': self.FORMAT_VERSION,
+                'source': self.step_cache.get_source_key(source_path),
+                'variables': statistics,
+            }
+            temporary_path = self.step_cache.get_temporary_path(record_path)
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                json.dump(record, file)
+            os.replace(temporary_path, record_path)
+            return True
+
+        except OSError as e:
+            logger.warning(f"Could not write field statistics '{record_path}': {e}")
+            return False
@@ -2,6 +2,7 @@
 
 
 class Die:
+    __slots__ = ('id', 'nb_nodes', 'nodes', 'main_node', 'm', 'temp')
 
     def __init__(self, id):
         self.id = id
@@ -66,5 +67,7 @@ class Die:
 class Die3D(Die):
     """3D die representation for 3D forming simulations"""
 
+    __slots__ = ()
+
     def __init__(self, id):
         super().__init__(id)
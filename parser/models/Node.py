@@ -2,6 +2,9 @@
 
 
 class Node:
+    __slots__ = ('id', 'x', 'y', 'vx', 'vy', 'fx', 'fy',
+                 'dtemp', 'temp', 'code', 'is_contact')
+
     def __init__(self, id):
         self.id = id
         # Initialize other attributes to 0
@@ -133,6 +136,8 @@ class Node:
 class Node3D(Node):
     """3D node with additional Z coordinate and Z-direction properties"""
 
+    __slots__ = ('z',)
+
     def __init__(self, id):
         super().__init__(id)
         self.z = 0
@@ -6,6 +6,9 @@ from .node import Node, Node3D
 from .die import Die, Die3D
 from .element import Element, Element3D
 from .neutral_file import NeutralFile, NeutralFile3D
+from .columnar_neutral_file import (ColumnarNeutralFile, NodeView, NodeView3D,
+                                    ElementView, ElementView3D)
+from .model_3d import Model3DBuilder, BuildCancelled
 
 __all__ = [
     "Node",
@@ -15,5 +18,12 @@ __all__ = [
     "Element",
     "Element3D",
     "NeutralFile",
-    "NeutralFile3D"
+    "NeutralFile3D",
+    "ColumnarNeutralFile",
+    "NodeView",
+    "NodeView3D",
+    "ElementView",
+    "ElementView3D",
+    "Model3DBuilder",
+    "BuildCancelled",
 ]
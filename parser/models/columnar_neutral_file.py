@@ -0,0 +1,457 @@
+""" Columnar neutral file model storing a mesh step as NumPy arrays. """
+
+import numpy as np
+
+from .node import Node, Node3D
+from .element import Element, Element3D
+from .neutral_file import NeutralFile
+from . import element_fields
+
+
+class ColumnarNeutralFile:
+    """
+    Container for one .NEU step stored as typed NumPy arrays
+
+    Nodes and elements are rows of per-field arrays. Code that needs
+    per-entity access gets NodeView/ElementView objects reading those rows
+    through the same API as Node/Element.
+    """
+
+    # Per-node columns, named after the Node attributes
+    NODE_FIELDS = ('x', 'y', 'vx', 'vy', 'fx', 'fy', 'dtemp', 'temp', 'code')
+
+    # Per-element columns, named after the Element attributes
+    ELEMENT_FIELDS = element_fields.ELEMENT_FIELDS
+
+    # Dense id -> row tables are used unless ids are this sparse
+    MAX_INDEX_SPARSITY = 4
+
+    def __init__(self, title):
+        self.title = title
+        self.t_time = None
+        self.dies = []
+
+        # Node columns
+        self.node_ids = np.empty(0, dtype=np.int64)
+        self.node_fields = {}
+        self.is_contact = np.empty(0, dtype=bool)
+
+        # Element columns
+        self.element_ids = np.empty(0, dtype=np.int64)
+        self.matno = np.empty(0, dtype=np.int32)
+        self.lnods = np.empty((0, 4), dtype=np.int64)  # Connected node ids
+        self.element_fields = {}
+
+        # (divisions, closed) of 3D models built by repeating a 2D step
+        self.layer_layout = None
+
+        # Key of id and connectivity arrays shared with other steps, see Model3DBuilder
+        self.topology_key = None
+
+        # Derived lookups, built on first use
+        self._reset_lookups()
+
+    def set_nodes(self, node_ids, is_3d=False):
+        """Allocate node columns for the given node identifiers"""
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        nb_nodes = len(self.node_ids)
+        names = self.NODE_FIELDS + (('z',) if is_3d else ())
+        self.node_fields = {name: np.zeros(nb_nodes) for name in names}
+        self.is_contact = np.zeros(nb_nodes, dtype=bool)
+        self._reset_lookups()
+
+    def set_elements(self, element_ids, matno, lnods, connectivity=None):
+        """
+        Allocate element columns, lnods is (nel, 4) or (nel, 8) node ids
+
+        connectivity optionally gives the matching node rows (-1 for unknown
+        nodes) when the caller already knows them, skipping the id lookup.
+        """
+        self.element_ids = np.asarray(element_ids, dtype=np.int64)
+        self.matno = np.asarray(matno, dtype=np.int32)
+        self.lnods = np.asarray(lnods, dtype=np.int64)
+        nb_elements = len(self.element_ids)
+        self.element_fields = {name: np.zeros(nb_elements)
+                               for name in self.ELEMENT_FIELDS}
+        self._reset_lookups()
+        if connectivity is not None:
+            self._connectivity = np.asarray(connectivity, dtype=np.int64)
+
+    def _reset_lookups(self):
+        """Drop lookups derived from the id columns"""
+        self._node_index = None
+        self._element_index = None
+        self._connectivity = None
+        self._node_views = None
+        self._element_views = None
+
+    def add_die(self, die):
+        """Add die to mesh data"""
+        self.dies.append(die)
+
+    def set_t_time(self, t_time):
+        """Set simulation time"""
+        self.t_time = t_time
+
+    def get_title(self):
+        """Get mesh title"""
+        return self.title
+
+    def get_t_time(self):
+        """Get simulation time"""
+        return self.t_time
+
+    def get_dies(self):
+        """Get all dies in mesh"""
+        return self.dies
+
+    def get_nb_nodes(self):
+        """Get total number of nodes"""
+        return len(self.node_ids)
+
+    def get_nb_elements(self):
+        """Get total number of elements"""
+        return len(self.element_ids)
+
+    def get_nb_dies(self):
+        """Get total number of dies"""
+        return len(self.dies)
+
+    def is_complete(self):
+        """Check if mesh has minimum required data"""
+        return len(self.node_ids) > 0 and len(self.element_ids) > 0
+
+    def is_3d(self):
+        """Check if nodes carry a Z coordinate"""
+        return 'z' in self.node_fields
+
+    def get_nbytes(self):
+        """Get memory held by the step arrays, shared topology excluded"""
+        arrays = [self.is_contact, self.matno]
+        arrays += list(self.node_fields.values())
+        arrays += list(self.element_fields.values())
+        if self.topology_key is None:
+            arrays += self._get_topology_arrays()
+        return sum(self.get_resident_nbytes(array) for array in arrays)
+
+    def get_topology_nbytes(self):
+        """Get memory held by the topology arrays shared with other steps"""
+        if self.topology_key is None:
+            return 0
+        return sum(self.get_resident_nbytes(array)
+                   for array in self._get_topology_arrays())
+
+    def _get_topology_arrays(self):
+        """Get the id and connectivity arrays of the step"""
+        arrays = [self.node_ids, self.element_ids, self.lnods]
+        if self._connectivity is not None:
+            arrays.append(self._connectivity)
+        return arrays
+
+    @staticmethod
+    def get_resident_nbytes(array):
+        """Get memory of an array, 0 when it is mapped from a file"""
+        if isinstance(array, np.memmap) or isinstance(array.base, np.memmap):
+            return 0
+        return array.nbytes
+
+    # Array access
+
+    def get_points(self):
+        """Get (nb_nodes, 3) node coordinates"""
+        points = np.zeros((len(self.node_ids), 3))
+        points[:, 0] = self.node_fields['x']
+        points[:, 1] = self.node_fields['y']
+        if self.is_3d():
+            points[:, 2] = self.node_fields['z']
+        return points
+
+    def get_connectivity(self):
+        """Get element connectivity as node rows, -1 for unknown nodes"""
+        if self._connectivity is None:
+            rows, valid = self.get_node_rows(self.lnods.ravel())
+            rows = np.where(valid, rows, -1)
+            self._connectivity = rows.reshape(self.lnods.shape)
+        return self._connectivity
+
+    def get_field_arrays(self, element_rows=None):
+        """Get lazily computed element columns and derived quantities"""
+        connectivity = self.get_connectivity()
+        if element_rows is not None:
+            connectivity = connectivity[element_rows]
+        return element_fields.ElementFieldArrays(
+            self.element_fields, self.node_fields, connectivity, element_rows)
+
+    # Id to row lookups
+
+    def get_node_row(self, node_id):
+        """Get array row of a node id, None if unknown"""
+        rows, valid = self.get_node_rows([node_id])
+        return int(rows[0]) if valid[0] else None
+
+    def get_element_row(self, element_id):
+        """Get array row of an element id, None if unknown"""
+        rows, valid = self.get_element_rows([element_id])
+        return int(rows[0]) if valid[0] else None
+
+    def get_node_rows(self, node_ids):
+        """Map node ids to array rows, returns (rows, valid mask)"""
+        if self._node_index is None:
+            self._node_index = self._build_index(self.node_ids)
+        return self._lookup_rows(self._node_index, self.node_ids, node_ids)
+
+    def get_element_rows(self, element_ids):
+        """Map element ids to array rows, returns (rows, valid mask)"""
+        if self._element_index is None:
+            self._element_index = self._build_index(self.element_ids)
+        return self._lookup_rows(self._element_index, self.element_ids, element_ids)
+
+    @classmethod
+    def _build_index(cls, reference_ids):
+        """Build a dense id -> row table, or a sort order for sparse ids"""
+        if len(reference_ids) == 0:
+            return None
+
+        max_id = int(reference_ids.max())
+        if (reference_ids.min() >= 0 and
+                max_id < cls.MAX_INDEX_SPARSITY * len(reference_ids) + 1024):
+            table = np.full(max_id + 1, -1, dtype=np.int64)
+            table[reference_ids] = np.arange(len(reference_ids))
+            return table
+
+        return ('sorted', np.argsort(reference_ids, kind='stable'))
+
+    @staticmethod
+    def _lookup_rows(index, reference_ids, ids):
+        """Vectorized id lookup through a table built by _build_index"""
+        ids = np.asarray(ids, dtype=np.int64)
+        if index is None:
+            return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+
+        if isinstance(index, tuple):
+            order = index[1]
+            positions = np.searchsorted(reference_ids, ids, sorter=order)
+            rows = order[np.clip(positions, 0, len(reference_ids) - 1)]
+            return rows, reference_ids[rows] == ids
+
+        in_range = (ids >= 0) & (ids < len(index))
+        rows = index[np.where(in_range, ids, 0)]
+        valid = in_range & (rows >= 0)
+        return np.where(valid, rows, 0), valid
+
+    # NeutralFile compatible entity access
+
+    def get_nodes(self):
+        """Get all nodes in mesh as views"""
+        if self._node_views is None:
+            view_class = NodeView3D if self.is_3d() else NodeView
+            self._node_views = [view_class(self, row)
+                                for row in range(len(self.node_ids))]
+        return self._node_views
+
+    def get_elements(self):
+        """Get all elements in mesh as views"""
+        if self._element_views is None:
+            view_class = ElementView3D if self.lnods.shape[1] == 8 else ElementView
+            self._element_views = [view_class(self, row)
+                                   for row in range(len(self.element_ids))]
+        return self._element_views
+
+    def get_node_by_id(self, node_id):
+        """Find node by identifier"""
+        row = self.get_node_row(node_id)
+        return None if row is None else self.get_node_view(row)
+
+    def get_element_by_id(self, element_id):
+        """Find element by identifier"""
+        row = self.get_element_row(element_id)
+        return None if row is None else self.get_element_view(row)
+
+    def get_node_view(self, row):
+        """Get the view of one node row, without building every view"""
+        if self._node_views is not None:
+            return self._node_views[row]
+        return (NodeView3D if self.is_3d() else NodeView)(self, row)
+
+    def get_element_view(self, row):
+        """Get the view of one element row, without building every view"""
+        if self._element_views is not None:
+            return self._element_views[row]
+        return (ElementView3D if self.lnods.shape[1] == 8 else ElementView)(self, row)
+
+    def to_neutral_file(self):
+        """Build the object-based NeutralFile equivalent of this step"""
+        neu = NeutralFile(self.title)
+        neu.set_t_time(self.t_time)
+
+        # Nodes
+        node_columns = [self.node_fields[name].tolist()
+                        for name in self.NODE_FIELDS]
+        is_contact = self.is_contact.tolist()
+        for row, node_id in enumerate(self.node_ids.tolist()):
+            node = Node(node_id)
+            for name, column in zip(self.NODE_FIELDS, node_columns):
+                setattr(node, name, column[row])
+            node.is_contact = is_contact[row]
+            neu.add_node(node)
+
+        # Elements
+        element_columns = [self.element_fields[name].tolist()
+                           for name in self.ELEMENT_FIELDS]
+        matno = self.matno.tolist()
+        lnods = self.lnods.tolist()
+        for row, element_id in enumerate(self.element_ids.tolist()):
+            element = Element(element_id)
+            element.matno = matno[row]
+            element.lnods = [neu.get_node_by_id(node_id)
+                             for node_id in lnods[row]]
+            for name, column in zip(self.ELEMENT_FIELDS, element_columns):
+                setattr(element, name, column[row])
+            neu.add_element(element)
+
+        for die in self.dies:
+            neu.add_die(die)
+
+        return neu
+
+    @classmethod
+    def from_neutral_file(cls, neu):
+        """Build the columnar equivalent of an object-based NeutralFile"""
+        columnar = cls(neu.get_title())
+        columnar.set_t_time(neu.get_t_time())
+
+        # Nodes, missing values count as 0
+        nodes = list(neu.get_nodes())
+        is_3d = any(isinstance(node, Node3D) for node in nodes)
+        columnar.set_nodes([node.id for node in nodes], is_3d)
+        for name, column in columnar.node_fields.items():
+            column[:] = [getattr(node, name) or 0.0 for node in nodes]
+        columnar.is_contact[:] = [bool(node.is_contact) for node in nodes]
+
+        # Elements, missing nodes are -1 ids
+        elements = list(neu.get_elements())
+        width = 8 if is_3d else 4
+        lnods = np.full((len(elements), width), -1, dtype=np.int64)
+        for row, element in enumerate(elements):
+            node_ids = [-1 if node is None else node.id
+                        for node in element.get_lnods()[:width]]
+            lnods[row, :len(node_ids)] = node_ids
+        columnar.set_elements([element.id for element in elements],
+                              [element.matno or 0 for element in elements], lnods)
+        for name, column in columnar.element_fields.items():
+            column[:] = [getattr(element, name) or 0.0 for element in elements]
+
+        for die in neu.get_dies():
+            columnar.add_die(die)
+
+        return columnar
+
+
+def _column_property(table, name):
+    """Property reading and writing one column of the owning step"""
+
+    def getter(self):
+        return float(getattr(self._neu, table)[name][self._row])
+
+    def setter(self, value):
+        getattr(self._neu, table)[name][self._row] = value
+
+    return property(getter, setter)
+
+
+class _NodeColumns:
+    """Node attributes mapped onto a ColumnarNeutralFile row"""
+
+    __slots__ = ()
+
+    def __init__(self, neu, row):
+        self._neu = neu
+        self._row = row
+
+    @property
+    def id(self):
+        return int(self._neu.node_ids[self._row])
+
+    @property
+    def is_contact(self):
+        return bool(self._neu.is_contact[self._row])
+
+    @is_contact.setter
+    def is_contact(self, value):
+        self._neu.is_contact[self._row] = value
+
+    @property
+    def z(self):
+        column = self._neu.node_fields.get('z')
+        return 0.0 if column is None else float(column[self._row])
+
+    @z.setter
+    def z(self, value):
+        self._neu.node_fields['z'][self._row] = value
+
+    def get_row(self):
+        """Get array row of this node"""
+        return self._row
+
+
+for _name in ColumnarNeutralFile.NODE_FIELDS:
+    setattr(_NodeColumns, _name, _column_property('node_fields', _name))
+
+
+class _ElementColumns:
+    """Element attributes mapped onto a ColumnarNeutralFile row"""
+
+    __slots__ = ()
+
+    def __init__(self, neu, row):
+        self._neu = neu
+        self._row = row
+
+    @property
+    def id(self):
+        return int(self._neu.element_ids[self._row])
+
+    @property
+    def matno(self):
+        return int(self._neu.matno[self._row])
+
+    @matno.setter
+    def matno(self, value):
+        self._neu.matno[self._row] = value
+
+    @property
+    def lnods(self):
+        return [self._neu.get_node_view(row)
+                for row in self._neu.get_connectivity()[self._row].tolist() if row >= 0]
+
+    def get_row(self):
+        """Get array row of this element"""
+        return self._row
+
+
+for _name in ColumnarNeutralFile.ELEMENT_FIELDS:
+    setattr(_ElementColumns, _name, _column_property('element_fields', _name))
+
+
+class NodeView(_NodeColumns, Node):
+    """Lightweight Node reading one row of a ColumnarNeutralFile"""
+
+    __slots__ = ('_neu', '_row')
+
+
+class NodeView3D(_NodeColumns, Node3D):
+    """Lightweight Node3D reading one row of a ColumnarNeutralFile"""
+
+    __slots__ = ('_neu', '_row')
+
+
+class ElementView(_ElementColumns, Element):
+    """Lightweight Element reading one row of a ColumnarNeutralFile"""
+
+    __slots__ = ('_neu', '_row')
+
+
+class ElementView3D(_ElementColumns, Element3D):
+    """Lightweight Element3D reading one row of a ColumnarNeutralFile"""
+
+    __slots__ = ('_neu', '_row')
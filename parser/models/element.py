@@ -4,6 +4,15 @@ import math
 
 
 class Element:
+    __slots__ = (
+        'id', 'matno', 'lnods', 'rindx', 'densy', 'fract',
+        'srnrt_exx', 'srnrt_eyy', 'srnrt_ezz', 'srnrt_exy', 'srnrt_e', 'srnrt_ev',
+        'strain_exx', 'strain_eyy', 'strain_ezz', 'strain_exy', 'strain_e',
+        'strain_e1', 'strain_e3', 'angle13',
+        'stress_oxx', 'stress_oyy', 'stress_ozz', 'stress_oxy', 'stress_o',
+        'stress_orr',
+    )
+
     def __init__(self, id):
         self.id = id
         # Initialize other attributes to 0
@@ -439,6 +448,8 @@ class Element:
 class Element3D(Element):
     """3D hexahedral element for 3D forming simulations"""
 
+    __slots__ = ()
+
     def __init__(self, id):
         super().__init__(id)
 
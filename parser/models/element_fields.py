@@ -0,0 +1,232 @@
+""" Vectorized derived quantities over whole arrays of elements. """
+
+import numpy as np
+
+
+# Per-element columns, named after the Element attributes
+ELEMENT_FIELDS = (
+    'rindx', 'densy', 'fract',
+    'srnrt_exx', 'srnrt_eyy', 'srnrt_ezz', 'srnrt_exy', 'srnrt_e', 'srnrt_ev',
+    'strain_exx', 'strain_eyy', 'strain_ezz', 'strain_exy', 'strain_e',
+    'strain_e1', 'strain_e3', 'angle13',
+    'stress_oxx', 'stress_oyy', 'stress_ozz', 'stress_oxy', 'stress_o',
+    'stress_orr',
+)
+
+# Per-node columns averaged over the element nodes, named after the Node attributes
+AVERAGED_NODE_FIELDS = ('vx', 'vy', 'fx', 'fy', 'temp', 'dtemp')
+
+# Field variables of the viewer: Element column or derived quantity behind each name
+FIELD_VARIABLES = {
+    'Velocity X(r)': ('derived', 'velocity_x'),
+    'Velocity Y(z)': ('derived', 'velocity_y'),
+    'Total Velocity': ('derived', 'total_velocity'),
+
+    'Force X(r)': ('derived', 'force_x'),
+    'Force Y(z)': ('derived', 'force_y'),
+    'Total Force': ('derived', 'total_force'),
+
+    'Temperature': ('derived', 'temperature'),
+    'Temperature Rate': ('derived', 'temperature_rate'),
+
+    'Strain rate x(r)': ('column', 'srnrt_exx'),
+    'Strain rate y(z)': ('column', 'srnrt_eyy'),
+    'Strain rate z(theta)': ('column', 'srnrt_ezz'),
+    'Strain rate xy(rz)': ('column', 'srnrt_exy'),
+    'Effective strain rate': ('column', 'srnrt_e'),
+    'Volumetric strain rate': ('column', 'srnrt_ev'),
+
+    'Strain x(r)': ('column', 'strain_exx'),
+    'Strain y(z)': ('column', 'strain_eyy'),
+    'Strain z(theta)': ('column', 'strain_ezz'),
+    'Strain xy(rz)': ('column', 'strain_exy'),
+    'Effective strain': ('column', 'strain_e'),
+    'Volumetric Strain': ('derived', 'strain_volumetric'),
+    'Strain 1': ('column', 'strain_e1'),
+    'Strain 2': ('derived', 'strain_E2'),
+    'Strain 3': ('column', 'strain_e3'),
+
+    'Stress x(r)': ('column', 'stress_oxx'),
+    'Stress y(z)': ('column', 'stress_oyy'),
+    'Stress z(theta)': ('column', 'stress_ozz'),
+    'Stress xy(rz)': ('column', 'stress_oxy'),
+    'Effective stress': ('column', 'stress_o'),
+    'Average stress': ('column', 'stress_orr'),
+    'Stress 1': ('derived', 'stress_1'),
+    'Stress 2': ('derived', 'stress_2'),
+    'Stress 3': ('derived', 'stress_3'),
+
+    'Thickness (Plane Stress)': ('derived', 'thickness_plane_stress'),
+    'Relative Density': ('column', 'densy'),
+    'Ductile Damage': ('column', 'fract'),
+
+    'Stress y(z)/Ef.Stress': ('derived', 'stress_yy_on_effective_stress'),
+    'Stress xy(rz)/Ef.Stress': ('derived', 'stress_xy_on_effective_stress'),
+    'Average Stress/Ef.Stress': ('derived', 'average_stress_on_effective_stress'),
+    'Pressure': ('derived', 'pressure'),
+    'Pressure/Ef.Stress': ('derived', 'pressure_on_effective_stress'),
+    'Surface Enlargement Ratio': ('derived', 'surface_enlargement_ratio'),
+
+    'Element Quality': ('column', 'rindx'),
+}
+
+
+def principal_stresses(stress_oxx, stress_oyy, stress_ozz, stress_oxy):
+    """Get (nel, 3) principal stresses sorted from maximum to minimum"""
+    center = (stress_oxx + stress_oyy) * 0.5
+    half_difference = (stress_oxx - stress_oyy) * 0.5
+    radius = np.sqrt(half_difference * half_difference + stress_oxy * stress_oxy)
+    stresses = np.column_stack((center + radius, stress_ozz, center - radius))
+    return np.sort(stresses, axis=1)[:, ::-1]
+
+
+def on_effective_stress(values, stress_o):
+    """Get values / effective stress, 0 where the effective stress is 0"""
+    return np.divide(values, stress_o, out=np.zeros_like(values),
+                     where=stress_o != 0)
+
+
+def node_average(node_values, connectivity):
+    """Average a per-node column over element nodes, -1 rows are skipped"""
+    if len(node_values) == 0:
+        return np.zeros(len(connectivity))
+
+    valid = connectivity >= 0
+    values = np.where(valid, node_values[np.where(valid, connectivity, 0)], 0.0)
+
+    # Summed column by column to match the per-element average
+    total = values[:, 0].copy()
+    for column in range(1, values.shape[1]):
+        total += values[:, column]
+    counts = valid.sum(axis=1)
+    return np.divide(total, counts, out=np.zeros_like(total), where=counts != 0)
+
+
+class ElementFieldArrays:
+    """
+    Element columns and derived quantities of one step, computed on first use
+
+    element_fields and node_fields map Element and Node attribute names to
+    columns. element_rows optionally selects elements, connectivity is the
+    (nel, nodes) node rows of the selected elements. Derived quantities are
+    keyed by the name of the matching Element getter without its 'get_'
+    prefix. Every column and quantity is computed once and memoized.
+    """
+
+    DERIVED = {
+        'stress_1': lambda arrays: arrays._get_principal_stresses()[:, 0].copy(),
+        'stress_2': lambda arrays: arrays._get_principal_stresses()[:, 1].copy(),
+        'stress_3': lambda arrays: arrays._get_principal_stresses()[:, 2].copy(),
+
+        'strain_E2': lambda arrays: 0 - arrays.column('strain_e1') - arrays.column('strain_e3'),
+        'strain_volumetric': lambda arrays: (arrays.column('strain_exx') + arrays.column('strain_eyy') +
+                                             arrays.column('strain_ezz')),
+
+        'stress_yy_on_effective_stress': lambda arrays: arrays._on_effective_stress('stress_oyy'),
+        'stress_xy_on_effective_stress': lambda arrays: arrays._on_effective_stress('stress_oxy'),
+        'average_stress_on_effective_stress': lambda arrays: arrays._on_effective_stress('stress_orr'),
+        'pressure': lambda arrays: arrays._zeros(),
+        'pressure_on_effective_stress': lambda arrays: arrays._zeros(),
+        'thickness_plane_stress': lambda arrays: arrays._zeros(),
+        'surface_enlargement_ratio': lambda arrays: arrays._zeros(),
+
+        'velocity_x': lambda arrays: arrays._node_average('vx'),
+        'velocity_y': lambda arrays: arrays._node_average('vy'),
+        'total_velocity': lambda arrays: arrays['velocity_x'] ** 2 + arrays['velocity_y'] ** 2,
+        'force_x': lambda arrays: arrays._node_average('fx'),
+        'force_y': lambda arrays: arrays._node_average('fy'),
+        'total_force': lambda arrays: arrays['force_x'] ** 2 + arrays['force_y'] ** 2,
+        'temperature': lambda arrays: arrays._node_average('temp'),
+        'temperature_rate': lambda arrays: arrays._node_average('dtemp'),
+    }
+
+    def __init__(self, element_fields, node_fields, connectivity, element_rows=None):
+        self.element_fields = element_fields
+        self.node_fields = node_fields
+        self.connectivity = connectivity
+        self.element_rows = element_rows
+        self._columns = {}
+        self._derived = {}
+        self._principal_stresses = None
+
+    def __len__(self):
+        return len(self.connectivity)
+
+    def __getitem__(self, name):
+        """Get one derived quantity"""
+        values = self._derived.get(name)
+        if values is None:
+            values = self._derived[name] = self.DERIVED[name](self)
+        return values
+
+    def column(self, name):
+        """Get one element column of the selected elements"""
+        values = self._columns.get(name)
+        if values is None:
+            values = np.asarray(self.element_fields[name])
+            if self.element_rows is not None:
+                values = values[self.element_rows]
+            self._columns[name] = values
+        return values
+
+    def field_variable(self, name):
+        """Get one field variable of FIELD_VARIABLES"""
+        source, key = FIELD_VARIABLES[name]
+        if source == 'column':
+            return self.column(key)
+        return self[key]
+
+    def _get_principal_stresses(self):
+        """Principal stresses shared by the three stress quantities"""
+        if self._principal_stresses is None:
+            self._principal_stresses = principal_stresses(
+                self.column('stress_oxx'), self.column('stress_oyy'),
+                self.column('stress_ozz'), self.column('stress_oxy'))
+        return self._principal_stresses
+
+    def _on_effective_stress(self, name):
+        return on_effective_stress(self.column(name), self.column('stress_o'))
+
+    def _node_average(self, name):
+        return node_average(np.asarray(self.node_fields[name]), self.connectivity)
+
+    def _zeros(self):
+        return np.zeros(len(self.connectivity))
+
+
+def gather_element_columns(elements):
+    """
+    Collect (element_fields, node_fields, connectivity) from Element objects
+
+    Missing values count as 0 like in the mesh builder, elements with fewer
+    nodes than the widest one are padded with -1 node rows.
+    """
+    element_fields = {
+        name: np.array([getattr(element, name) or 0.0 for element in elements], dtype=float)
+        for name in ELEMENT_FIELDS}
+
+    node_rows = {}
+    nodes = []
+    connectivity_lists = []
+    for element in elements:
+        rows = []
+        for node in element.get_lnods():
+            if node is None:
+                continue
+            row = node_rows.get(node.id)
+            if row is None:
+                row = node_rows[node.id] = len(nodes)
+                nodes.append(node)
+            rows.append(row)
+        connectivity_lists.append(rows)
+
+    width = max((len(rows) for rows in connectivity_lists), default=0)
+    connectivity = np.full((len(elements), max(width, 1)), -1, dtype=np.int64)
+    for index, rows in enumerate(connectivity_lists):
+        connectivity[index, :len(rows)] = rows
+
+    node_fields = {
+        name: np.array([getattr(node, name) or 0.0 for node in nodes], dtype=float)
+        for name in AVERAGED_NODE_FIELDS}
+
+    return element_fields, node_fields, connectivity
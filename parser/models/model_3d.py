@@ -0,0 +1,335 @@
+""" Array-based generation of 3D models by extrusion or revolution of 2D steps. """
+
+import hashlib
+import math
+import numpy as np
+
+from .columnar_neutral_file import ColumnarNeutralFile
+from .die import Die3D
+from .node import Node3D
+
+
+# Element columns copied unchanged to every layer
+COPIED_ELEMENT_FIELDS = ('rindx', 'densy', 'fract', 'strain_e', 'stress_o',
+                         'stress_orr', 'srnrt_e', 'srnrt_ev')
+
+# In-plane tensor components, (r, z, theta, rz) in axisymmetric models
+STRAIN_COMPONENTS = ('strain_exx', 'strain_eyy', 'strain_ezz', 'strain_exy')
+STRESS_COMPONENTS = ('stress_oxx', 'stress_oyy', 'stress_ozz', 'stress_oxy')
+
+
+class BuildCancelled(Exception):
+    """Raised when a 3D build is stopped before completion"""
+
+
+class Model3DBuilder:
+    """
+    Build a 3D ColumnarNeutralFile from a 2D step with array operations
+
+    The 2D nodes are repeated on divisions + 1 layers, rotated about the
+    axis for axisymmetric models or shifted through the thickness for plane
+    models, and every quad becomes one hexahedron per division. Node and
+    element ids of layer i are the 2D ids offset by i times the largest
+    2D id. Coordinates, connectivity and tensor components of all divisions
+    are computed at once.
+
+    The 3D ids and connectivity only depend on the 2D ids and connectivity,
+    so they are kept and shared by every step built with the same 2D mesh.
+
+    Columns are filled in blocks of layers of about CHUNK_SIZE values, so
+    a build reports progress and honours stop() between blocks.
+    """
+
+    AXISYMMETRIC_TYPES = ("axisymmetric", "axisymmetric_cheese")
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, model_type, params):
+        self.model_type = model_type
+        self.divisions = params['divisions']
+        self.thickness = params.get('thickness', 1.0)
+        self.angle = params.get('angle')
+
+        # (key, node ids, element ids, lnods, connectivity) of the last 2D mesh
+        self._topology = None
+
+        self.should_stop = False
+        self._progress = None
+        self._done = 0
+        self._total = 0
+
+    def get_settings(self):
+        """Get the parameters the built models depend on"""
+        return (self.model_type, self.divisions, self.thickness, self.angle)
+
+    def get_cache_name(self):
+        """Get the BinaryStepCache entry name of models built with these settings"""
+        digest = hashlib.blake2b(repr(self.get_settings()).encode(), digest_size=8)
+        return f"3d_{self.model_type}_{digest.hexdigest()}"
+
+    def get_topology(self):
+        """Get (key, node ids, element ids, lnods, connectivity) of the last build"""
+        return self._topology
+
+    def prepare_topology(self, data_2d):
+        """Compute the topology of a 2D step ahead of its build, see get_topology"""
+        if not isinstance(data_2d, ColumnarNeutralFile):
+            data_2d = ColumnarNeutralFile.from_neutral_file(data_2d)
+        return self._get_topology(data_2d)
+
+    def is_axisymmetric(self):
+        """Check if the model is a revolution about the axis"""
+        return self.model_type in self.AXISYMMETRIC_TYPES
+
+    def get_total_angle(self):
+        """Get the revolution angle in radians"""
+        if self.model_type == "axisymmetric_cheese":
+            return math.radians(self.angle)
+        return 2 * math.pi
+
+    def stop(self):
+        """Request the running build to stop, it raises BuildCancelled"""
+        self.should_stop = True
+
+    def build(self, data_2d, progress=None):
+        """
+        Build the 3D step of a 2D step, columnar or object-based
+
+        progress(fraction) is called after each block of layers.
+        """
+        if not isinstance(data_2d, ColumnarNeutralFile):
+            data_2d = ColumnarNeutralFile.from_neutral_file(data_2d)
+
+        neu = ColumnarNeutralFile(f"3D_{self.model_type}_{data_2d.get_title()}")
+        neu.set_t_time(data_2d.get_t_time())
+        neu.layer_layout = (self.divisions, self.model_type == "axisymmetric")
+
+        self._progress = progress
+        self._done = 0
+        self._total = ((self.divisions + 1) * data_2d.get_nb_nodes() +
+                       self.divisions * data_2d.get_nb_elements()) or 1
+        try:
+            self._build_nodes(data_2d, neu)
+            self._build_elements(data_2d, neu)
+        finally:
+            self._progress = None
+        neu.topology_key = self._topology[0]
+
+        for die_2d in data_2d.get_dies():
+            neu.add_die(self.build_die(die_2d))
+
+        return neu
+
+    def _iter_chunks(self, count, row_size):
+        """Yield (start, stop) blocks of layers, checking stop and reporting progress"""
+        block = max(1, self.CHUNK_SIZE // max(row_size, 1))
+        for start in range(0, count, block):
+            if self.should_stop:
+                raise BuildCancelled()
+            stop = min(start + block, count)
+            yield start, stop
+
+            self._done += (stop - start) * row_size
+            if self._progress is not None:
+                self._progress(self._done / self._total)
+
+    def _build_nodes(self, data_2d, neu):
+        """Fill the node columns of all layers"""
+        nb_nodes = data_2d.get_nb_nodes()
+        fields = data_2d.node_fields
+
+        neu.set_nodes(self._get_topology(data_2d)[1], is_3d=True)
+        columns = neu.node_fields
+        node_angles = self._get_node_angles()
+        node_z = None if self.is_axisymmetric() else self._get_node_z(data_2d)
+
+        for start, stop in self._iter_chunks(self.divisions + 1, nb_nodes):
+            rows = slice(start * nb_nodes, stop * nb_nodes)
+            layers = stop - start
+
+            if node_z is None:
+                # Convert r, z to x, y, z and radial vectors to cartesian
+                alpha = node_angles[start:stop, np.newaxis]
+                cos_alpha, sin_alpha = np.cos(alpha), np.sin(alpha)
+
+                columns['x'][rows] = (fields['x'] * cos_alpha).ravel()
+                columns['y'][rows] = (fields['x'] * sin_alpha).ravel()
+                columns['z'][rows] = np.tile(fields['y'], layers)
+                columns['vx'][rows] = (fields['vx'] * cos_alpha).ravel()
+                columns['vy'][rows] = (fields['vx'] * sin_alpha).ravel()
+                columns['fx'][rows] = (fields['fx'] * cos_alpha).ravel()
+                columns['fy'][rows] = (fields['fx'] * sin_alpha).ravel()
+            else:
+                columns['z'][rows] = node_z[start:stop].ravel()
+                for name in ('x', 'y', 'vx', 'vy', 'fx', 'fy'):
+                    columns[name][rows] = np.tile(fields[name], layers)
+
+            for name in ('temp', 'dtemp', 'code'):
+                columns[name][rows] = np.tile(fields[name], layers)
+            neu.is_contact[rows] = np.tile(data_2d.is_contact, layers)
+
+    def _build_elements(self, data_2d, neu):
+        """Fill the hexahedra and element columns of all divisions"""
+        divisions = self.divisions
+        nb_elements = data_2d.get_nb_elements()
+        _, _, element_ids, lnods, connectivity = self._get_topology(data_2d)
+        neu.set_elements(element_ids, np.tile(data_2d.matno, divisions), lnods,
+                         connectivity=connectivity)
+
+        fields = data_2d.element_fields
+        columns = neu.element_fields
+        element_angles = self._get_element_angles()
+
+        for start, stop in self._iter_chunks(divisions, nb_elements):
+            rows = slice(start * nb_elements, stop * nb_elements)
+            layers = stop - start
+
+            for name in COPIED_ELEMENT_FIELDS:
+                columns[name][rows] = np.tile(fields[name], layers)
+
+            if self.is_axisymmetric():
+                # Rotate (r, z, theta, rz) tensors to (x, y, z, xy) at mid-element angle
+                alpha = element_angles[start:stop, np.newaxis]
+                for names in (STRAIN_COMPONENTS, STRESS_COMPONENTS):
+                    for name, values in zip(names, rotate_tensor(
+                            *(fields[name] for name in names[:3]), alpha)):
+                        columns[name][rows] = values.ravel()
+            else:
+                for name in STRAIN_COMPONENTS + STRESS_COMPONENTS:
+                    columns[name][rows] = np.tile(fields[name], layers)
+
+    def _get_topology(self, data_2d):
+        """Get (key, node ids, element ids, lnods, connectivity) of the 3D mesh"""
+        connectivity_2d = data_2d.get_connectivity()[:, :4]
+
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (data_2d.node_ids, data_2d.element_ids, connectivity_2d):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        key = self.get_settings() + (connectivity_2d.shape, digest.hexdigest())
+
+        if self._topology is not None and self._topology[0] == key:
+            return self._topology
+
+        divisions = self.divisions
+        nb_nodes = data_2d.get_nb_nodes()
+        node_ids = self._get_layer_ids(data_2d.node_ids, divisions + 1)
+
+        # Bottom face on layer i, top face on layer i + 1
+        layer = np.arange(divisions)[:, np.newaxis, np.newaxis]
+        top_layer = layer + 1
+        if self.model_type == "axisymmetric":
+            # Full revolution: the last division closes on the first layer
+            top_layer[-1] = 0
+
+        valid = (connectivity_2d >= 0)[np.newaxis]
+        connectivity = np.concatenate((
+            np.where(valid, connectivity_2d + layer * nb_nodes, -1),
+            np.where(valid, connectivity_2d + top_layer * nb_nodes, -1)), axis=2)
+        connectivity = connectivity.reshape(-1, 8)
+        lnods = np.where(connectivity >= 0, node_ids[np.maximum(connectivity, 0)], -1)
+
+        self._topology = (key, node_ids,
+                          self._get_layer_ids(data_2d.element_ids, divisions),
+                          lnods, connectivity)
+        return self._topology
+
+    @staticmethod
+    def detach_topology(neu):
+        """Drop the shared id and connectivity arrays of a built step"""
+        neu.node_ids = neu.element_ids = neu.lnods = None
+        neu.topology_key = None
+        neu._reset_lookups()
+
+    @staticmethod
+    def attach_topology(neu, topology):
+        """Give a detached step the id and connectivity arrays of a topology"""
+        neu.topology_key, neu.node_ids, neu.element_ids, neu.lnods, connectivity = topology
+        neu._reset_lookups()
+        neu._connectivity = connectivity
+
+    def build_die(self, die_2d):
+        """Build the 3D die of a 2D die"""
+        die_3d = Die3D(die_2d.get_id())
+        die_3d.set_temp(die_2d.get_temp())
+        die_3d.set_m(die_2d.get_m())
+
+        coordinates = np.array([[node.get_coordX(), node.get_coordY()]
+                                for node in die_2d.nodes], dtype=float).reshape(-1, 2)
+
+        if self.is_axisymmetric():
+            # Convert r, z to x, y, z for axisymmetric
+            alpha = self._get_node_angles()[:, np.newaxis]
+            x = coordinates[:, 0] * np.cos(alpha)
+            y = coordinates[:, 0] * np.sin(alpha)
+            z = np.broadcast_to(coordinates[:, 1], x.shape)
+        else:
+            thickness = self.thickness
+            if self.model_type == "plane_stress":
+                thickness /= 2.0
+            layer_z = thickness * np.arange(self.divisions + 1) / self.divisions
+            x = np.broadcast_to(coordinates[:, 0], (len(layer_z), len(coordinates)))
+            y = np.broadcast_to(coordinates[:, 1], x.shape)
+            z = np.broadcast_to(layer_z[:, np.newaxis], x.shape)
+
+        # Unique negative ids per die and layer
+        for i_div in range(x.shape[0]):
+            for x_node, y_node, z_node in zip(x[i_div].tolist(), y[i_div].tolist(),
+                                              z[i_div].tolist()):
+                node_3d = Node3D(-(1000 + die_2d.get_id() * 1000 +
+                                   i_div * 100 + len(die_3d.get_nodes())))
+                node_3d.set_coordX(x_node)
+                node_3d.set_coordY(y_node)
+                node_3d.set_coordZ(z_node)
+                die_3d.add_node(node_3d)
+
+        return die_3d
+
+    def _get_node_angles(self):
+        """Get the angle of each node layer"""
+        return self.get_total_angle() * np.arange(self.divisions + 1) / self.divisions
+
+    def _get_element_angles(self):
+        """Get the mid-element angle of each division"""
+        return self.get_total_angle() * (np.arange(self.divisions) + 0.5) / self.divisions
+
+    def _get_node_z(self, data_2d):
+        """Get (layers, nodes) z coordinates of a plane model"""
+        fractions = np.arange(self.divisions + 1)[:, np.newaxis] / self.divisions
+        thickness = self.thickness
+        if self.model_type == "plane_stress":
+            thickness = plane_stress_thickness(data_2d, self.thickness)
+        return np.broadcast_to(fractions * thickness,
+                               (len(fractions), data_2d.get_nb_nodes()))
+
+    @staticmethod
+    def _get_layer_ids(ids_2d, layers):
+        """Get ids of all layers, layer i offset by i times the largest id"""
+        if len(ids_2d) == 0:
+            return np.empty(0, dtype=np.int64)
+        offset = max(int(ids_2d.max()), len(ids_2d))
+        return (ids_2d[np.newaxis, :] +
+                offset * np.arange(layers)[:, np.newaxis]).ravel()
+
+
+def rotate_tensor(component_r, component_z, component_theta, alpha):
+    """Get (xx, yy, zz, xy) of axisymmetric (r, z, theta) components at angles alpha"""
+    cos_alpha, sin_alpha = np.cos(alpha), np.sin(alpha)
+    cos_2, sin_2 = cos_alpha ** 2, sin_alpha ** 2
+    return (component_r * cos_2 + component_theta * sin_2,
+            component_r * sin_2 + component_theta * cos_2,
+            np.broadcast_to(component_z, np.broadcast(component_r, alpha).shape),
+            (component_r - component_theta) * cos_alpha * sin_alpha)
+
+
+def plane_stress_thickness(data_2d, thickness):
+    """
+    Get the strain-corrected half thickness of a plane stress step
+
+    The nominal half thickness is scaled by exp of the smallest thickness
+    strain of the step. It is the same at every node, so a scalar is
+    returned and broadcast over the layers. It is not cached, one pass over
+    the strain column costs nothing next to filling the layers.
+    """
+    strain_z = data_2d.element_fields['strain_ezz']
+    correction = math.exp(float(strain_z.min())) if len(strain_z) else 1.0
+    return 0.5 * thickness * correction
+
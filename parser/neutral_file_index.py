@@ -0,0 +1,192 @@
+""" Memory-mapped section index for random access to .NEU blocks """
+
+import json
+import mmap
+import os
+import threading
+import numpy as np
+
+from .binary_step_cache import BinaryStepCache
+import logging
+logger = logging.getLogger(__name__)
+
+
+class NeutralFileIndex:
+    """
+    Byte offsets of the blocks of a .NEU file
+
+    Each section maps to (start, end, count): the byte range of its lines
+    and the number of records it holds. The 'dies' section starts at its
+    count line because die records span a variable number of lines.
+    Indexes are also stored in the binary step cache entry of their file,
+    so cold opens and worker processes seek directly.
+    """
+
+    SECTIONS = ('nodes', 'elements', 'strain_rate', 'strain', 'stress',
+                'temperature', 'dies', 'contact', 'code', 'time')
+
+    # Indexes cached per absolute path, validated by (size, mtime)
+    FILENAME = 'section_index.json'
+    FORMAT_VERSION = 1
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, filename, file_key, title, sections):
+        self.filename = filename
+        self.file_key = file_key
+        self.title = title
+        self.sections = sections
+
+    @classmethod
+    def for_file(cls, filename):
+        """Get the section index of a file, building it if stale"""
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        file_key = (stat.st_size, stat.st_mtime_ns)
+
+        with cls._cache_lock:
+            index = cls._cache.get(path)
+        if index and index.file_key == file_key:
+            return index
+
+        index = cls._load(path, file_key)
+        if index is None:
+            index = cls._build(path, file_key)
+            index._save()
+        with cls._cache_lock:
+            cls._cache[path] = index
+        return index
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget all cached indexes"""
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    @classmethod
+    def _get_store_path(cls, path):
+        """Get the path of the stored index of a file"""
+        return os.path.join(BinaryStepCache().get_cache_path(path), cls.FILENAME)
+
+    @classmethod
+    def _load(cls, path, file_key):
+        """Load the stored index of a file, returns None if missing or stale"""
+        try:
+            with open(cls._get_store_path(path), 'r', encoding='utf-8') as file:
+                record = json.load(file)
+            if (record.get('version') != cls.FORMAT_VERSION or
+                    record.get('source') != list(file_key)):
+                return None
+            sections = {name: tuple(section)
+                        for name, section in record['sections'].items()}
+            return cls(path, file_key, record['title'], sections)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self):
+        """Store the index next to the binary cache of its file"""
+        store_path = self._get_store_path(self.filename)
+
+        try:
+            os.makedirs(os.path.dirname(store_path), exist_ok=True)
+            record = {
+                'version': self.FORMAT_VERSION,
+                'source': list(self.file_key),
+                'title': self.title,
+                'sections': self.sections,
+            }
+            # Unique temporary name, workers may index the same file at once
+            temporary_path = BinaryStepCache.get_temporary_path(store_path)
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                json.dump(record, file)
+            os.replace(temporary_path, store_path)
+
+        except OSError as e:
+            logger.warning(f"Could not write section index '{store_path}': {e}")
+
+    @classmethod
+    def _build(cls, path, file_key):
+        """Scan line offsets once and record the block boundaries"""
+        if file_key[0] == 0:
+            raise ValueError("The file is empty.")
+
+        with open(path, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                buffer = np.frombuffer(mm, dtype=np.uint8)
+                line_ends = np.flatnonzero(buffer == ord('\n'))
+                del buffer  # Release the export before closing the map
+
+                # A last line without trailing newline still counts
+                if len(line_ends) == 0 or line_ends[-1] != file_key[0] - 1:
+                    line_ends = np.append(line_ends, file_key[0])
+
+                def line_start(line):
+                    return 0 if line == 0 else int(line_ends[line - 1]) + 1
+
+                def read_line(line):
+                    return mm[line_start(line):int(line_ends[line])].decode('utf-8')
+
+                def read_count(line):
+                    return int(read_line(line).strip())
+
+                sections = {}
+
+                def add_section(name, first_line, nb_lines, count):
+                    end = (line_start(first_line + nb_lines) if nb_lines
+                           else line_start(first_line))
+                    sections[name] = (line_start(first_line), end, count)
+
+                title = read_line(0).strip()
+
+                nb_nodes = read_count(1)
+                add_section('nodes', 2, nb_nodes, nb_nodes)
+                current_line = 2 + nb_nodes
+
+                nb_elements = read_count(current_line)
+                current_line += 1
+                for name in ('elements', 'strain_rate', 'strain', 'stress'):
+                    add_section(name, current_line, nb_elements, nb_elements)
+                    current_line += nb_elements
+
+                add_section('temperature', current_line, nb_nodes, nb_nodes)
+                current_line += nb_nodes
+
+                # Walk die headers to find the end of the die block
+                die_line = current_line
+                nb_dies = read_count(die_line)
+                current_line += 2
+                for die_index in range(nb_dies):
+                    parts = read_line(current_line).split()
+                    current_line += 2 + int(parts[1])
+                add_section('dies', die_line, current_line - die_line, nb_dies)
+
+                for name in ('contact', 'code'):
+                    count = read_count(current_line)
+                    add_section(name, current_line + 1, count, count)
+                    current_line += 1 + count
+
+                add_section('time', current_line, 1, 1)
+
+        return cls(path, file_key, title, sections)
+
+    def get_section(self, name):
+        """Get (start, end, count) of a section"""
+        return self.sections[name]
+
+    def get_count(self, name):
+        """Get number of records in a section"""
+        return self.sections[name][2]
+
+    def read_bytes(self, name):
+        """Read the raw bytes of a section without loading the whole file"""
+        start, end, _ = self.sections[name]
+        if end <= start:
+            return b''
+
+        with open(self.filename, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[start:end]
+
+    def read_lines(self, name):
+        """Read the decoded lines of a section"""
+        return self.read_bytes(name).decode('utf-8').splitlines()
@@ -4,6 +4,10 @@ from .models.element import Element
 from .models.node import Node
 from .models.neutral_file import NeutralFile
 from .models.die import Die
+from .models.columnar_neutral_file import ColumnarNeutralFile
+from .neutral_file_index import NeutralFileIndex
+from .binary_step_cache import BinaryStepCache
+import numpy as np
 import time
 import logging
 logger = logging.getLogger(__name__)
@@ -295,105 +299,128 @@ class ParserNeutralFile:
         """Parse neutral file for graphics only (dies and time data)"""
         t1 = time.time()
         try:
-            with open(filename, 'r', encoding='utf-8') as file:
+            # Only the die and time blocks are read through the section index
+            index = NeutralFileIndex.for_file(filename)
 
-                lines = file.readlines()
-                if not lines:
-                    logger.error("The file is empty.")
-                    return
+            neu = NeutralFile(index.title)
 
-                neu = NeutralFile(lines[0].strip())
+            # Die elements
+            ParserNeutralFile._parse_dies(index.read_lines('dies'), 0, neu)
 
-                nb_nodes = int(lines[1].strip())
+            # Parse time data
+            time_lines = index.read_lines('time')
+            time_line = time_lines[0].strip() if time_lines else ''
+            if time_line:
+                try:
+                    neu.t_time = float(time_line.replace('D', 'E'))
+                except ValueError:
+                    logger.error(
+                        f"Format error for time data in '{filename}'.")
+            else:
+                logger.error(f"No time data found in '{filename}'.")
 
-                current_line = 2 + nb_nodes
+            t2 = time.time()
+            logger.info(
+                f"GRAPHICS: File processing time: {t2 - t1:.2f} seconds")
+            return neu
 
-                nb_elements = int(lines[current_line].strip())
+        except FileNotFoundError:
+            logger.error(f"Error: File '{filename}' not found.")
+        except Exception as e:
+            logger.error(f"An error occurred: {e}")
 
-                # Skip element and node data blocks
-                current_line += 1 + 4 * nb_elements + nb_nodes
+    @staticmethod
+    def parser_file_columnar(filename):
+        """Parse complete neutral file into NumPy arrays (columnar mode)"""
+        t1 = time.time()
+        try:
+            with open(filename, 'r', encoding='utf-8') as file:
 
-                # Die elements
-                nb_dies = int(lines[current_line].strip())
-                current_line += 2
-                # logger.info(f"Number of dies: {nb_dies}")
+                title = file.readline()
+                if not title:
+                    logger.error("The file is empty.")
+                    return
 
-                for die_index in range(current_line, current_line + nb_dies):
+                # Fix Fortran 'D' exponents on the whole buffer at once
+                lines = file.read().replace('D', 'E').splitlines()
+                lines.insert(0, title)
 
-                    line = lines[current_line].strip()
-                    if line:
-                        parts = line.split()
-                        if len(parts) < 3:
-                            logger.error(
-                                f"Format error for die at line {current_line + 1}.")
-                        else:
-                            die = Die(int(parts[0]))
-                            neu.add_die(die)
+                neu = ColumnarNeutralFile(title.strip())
 
-                            current_line += 1
+                # Parse nodes
+                nb_nodes = int(lines[1].strip())
+                block = ParserNeutralFile._read_block(
+                    lines, 2, nb_nodes, 7, "node")
+                neu.set_nodes(block[:, 0])
+                for column, name in enumerate(('x', 'y', 'vx', 'vy', 'fx', 'fy'), 1):
+                    neu.node_fields[name][:] = block[:, column]
 
-                            # Parse die main node
-                            die_line = lines[current_line].strip()
-                            if die_line:
-                                parts_die = die_line.split()
-                                if len(parts_die) < 7:
-                                    logger.error(
-                                        f"Format error for die at line {current_line + 1}.")
+                current_line = 2 + nb_nodes
 
-                                main_node = Node(-1)  # Temporary ID
-                                main_node.x = float(
-                                    parts_die[0].replace('D', 'E'))
-                                main_node.y = float(
-                                    parts_die[1].replace('D', 'E'))
-                                main_node.vx = float(
-                                    parts_die[2].replace('D', 'E'))
-                                main_node.vy = float(
-                                    parts_die[3].replace('D', 'E'))
-                                main_node.fx = float(
-                                    parts_die[5].replace('D', 'E'))
-                                main_node.fy = float(
-                                    parts_die[6].replace('D', 'E'))
-                                die.main_node = main_node
-                                die.m = float(parts_die[4].replace('D', 'E'))
-                                die.temp = float(parts[2].replace('D', 'E'))
+                # Parse elements
+                nb_elements = int(lines[current_line].strip())
+                current_line += 1
 
-                                current_line += 1
+                block = ParserNeutralFile._read_block(
+                    lines, current_line, nb_elements, 9, "element")
+                neu.set_elements(block[:, 0], block[:, 1], block[:, 2:6])
+                for column, name in enumerate(('rindx', 'densy', 'fract'), 6):
+                    neu.element_fields[name][:] = block[:, column]
+
+                # Parse strain rate, strain and stress blocks
+                result_blocks = (
+                    ("strain rate", ('srnrt_exx', 'srnrt_eyy', 'srnrt_ezz',
+                                     'srnrt_exy', 'srnrt_e', 'srnrt_ev')),
+                    ("strain", ('strain_exx', 'strain_eyy', 'strain_ezz', 'strain_exy',
+                                'strain_e', 'strain_e1', 'strain_e3', 'angle13')),
+                    ("stress", ('stress_oxx', 'stress_oyy', 'stress_ozz',
+                                'stress_oxy', 'stress_o', 'stress_orr')),
+                )
+                for block_index, (label, names) in enumerate(result_blocks, 1):
+                    block = ParserNeutralFile._read_block(
+                        lines, current_line + block_index * nb_elements,
+                        nb_elements, len(names) + 1, label)
+                    rows, valid = neu.get_element_rows(block[:, 0])
+                    for column, name in enumerate(names, 1):
+                        neu.element_fields[name][rows[valid]] = block[valid, column]
 
-                            # Parse die geometry nodes
-                            for j in range(current_line, current_line + int(parts[1])):
-                                node_line = lines[j].strip()
-                                if node_line:
-                                    node_parts = node_line.split()
-                                    if len(node_parts) < 2:
-                                        logger.error(
-                                            f"Format error for die node at line {j + 1}.")
-                                        continue
+                current_line += 4 * nb_elements
 
-                                    node = Node(-1)  # Temporary ID
-                                    node.x = float(
-                                        node_parts[0].replace('D', 'E'))
-                                    node.y = float(
-                                        node_parts[1].replace('D', 'E'))
-                                    die.nodes.append(node)
+                # Temperature nodes
+                block = ParserNeutralFile._read_block(
+                    lines, current_line, nb_nodes, 3, "temperature node")
+                rows, valid = neu.get_node_rows(block[:, 0])
+                neu.node_fields['dtemp'][rows[valid]] = block[valid, 1]
+                neu.node_fields['temp'][rows[valid]] = block[valid, 2]
+                current_line += nb_nodes
 
-                            current_line += int(parts[1])
+                # Parse die data
+                current_line = ParserNeutralFile._parse_dies(
+                    lines, current_line, neu)
 
-                # Skip contact and code elements
+                # Mark contact nodes
                 nb_contact_elements = int(lines[current_line].strip())
                 current_line += 1
-
+                block = ParserNeutralFile._read_block(
+                    lines, current_line, nb_contact_elements, 1, "contact element")
+                rows, valid = neu.get_node_rows(block[:, 0])
+                neu.is_contact[rows[valid]] = True
                 current_line += nb_contact_elements
 
+                # Node constraint codes
                 nb_code_elements = int(lines[current_line].strip())
                 current_line += 1
-
+                block = ParserNeutralFile._read_block(
+                    lines, current_line, nb_code_elements, 2, "code node")
+                rows, valid = neu.get_node_rows(block[:, 0])
+                neu.node_fields['code'][rows[valid]] = block[valid, 1]
                 current_line += nb_code_elements
 
                 # Parse time data
                 time_line = lines[current_line].strip()
                 if time_line:
                     try:
-                        neu.t_time = float(time_line.replace('D', 'E'))
+                        neu.t_time = float(time_line)
                     except ValueError:
                         logger.error(
                             f"Format error for time at line {current_line + 1}.")
@@ -403,10 +430,109 @@ class ParserNeutralFile:
 
                 t2 = time.time()
                 logger.info(
-                    f"GRAPHICS: File processing time: {t2 - t1:.2f} seconds")
+                    f"COLUMNAR: File processing time: {t2 - t1:.2f} seconds")
                 return neu
 
         except FileNotFoundError:
             logger.error(f"Error: File '{filename}' not found.")
         except Exception as e:
             logger.error(f"An error occurred: {e}")
+
+    @staticmethod
+    def parser_file_cached(filename, step_cache=None):
+        """Parse neutral file into columnar data through the binary step cache"""
+        if step_cache is None:
+            step_cache = BinaryStepCache()
+
+        return step_cache.load_or_parse(filename)
+
+    @staticmethod
+    def _read_block(lines, start, count, min_columns, label):
+        """Convert a block of numeric lines into a (count, columns) array"""
+        if count == 0:
+            return np.empty((0, min_columns))
+
+        try:
+            block = np.loadtxt(lines[start:start + count], ndmin=2)
+        except ValueError:
+            block = None
+        if block is None or block.shape[0] != count or block.shape[1] < min_columns:
+            return ParserNeutralFile._read_block_lines(
+                lines, start, count, min_columns, label)
+        return block
+
+    @staticmethod
+    def _read_block_lines(lines, start, count, min_columns, label):
+        """Parse a block line by line, skipping blank and malformed lines"""
+        rows = []
+        for i in range(start, start + count):
+            parts = lines[i].split()
+            if not parts:
+                continue
+            if len(parts) < min_columns:
+                logger.error(f"Format error for {label} at line {i + 1}.")
+                continue
+            try:
+                rows.append([float(part) for part in parts[:min_columns]])
+            except ValueError:
+                logger.error(f"Format error for {label} at line {i + 1}.")
+
+        if not rows:
+            return np.empty((0, min_columns))
+        return np.array(rows)
+
+    @staticmethod
+    def _parse_dies(lines, current_line, neu):
+        """Parse die block into neu, returns the line following the block"""
+        nb_dies = int(lines[current_line].strip())
+        current_line += 2
+
+        for die_index in range(nb_dies):
+
+            parts = lines[current_line].strip().replace('D', 'E').split()
+            if len(parts) < 3:
+                logger.error(
+                    f"Format error for die at line {current_line + 1}.")
+                continue
+
+            die = Die(int(parts[0]))
+            die.temp = float(parts[2])
+            neu.add_die(die)
+            current_line += 1
+
+            # Parse die main node data
+            parts_die = lines[current_line].strip().replace('D', 'E').split()
+            if parts_die:
+                if len(parts_die) < 7:
+                    logger.error(
+                        f"Format error for die at line {current_line + 1}.")
+
+                main_node = Node(-1)  # Temporary ID
+                main_node.x = float(parts_die[0])
+                main_node.y = float(parts_die[1])
+                main_node.vx = float(parts_die[2])
+                main_node.vy = float(parts_die[3])
+                main_node.fx = float(parts_die[5])
+                main_node.fy = float(parts_die[6])
+                die.main_node = main_node
+                die.m = float(parts_die[4])
+
+                current_line += 1
+
+            # Parse die geometry nodes
+            nb_die_nodes = int(parts[1])
+            for j in range(current_line, current_line + nb_die_nodes):
+                node_parts = lines[j].strip().replace('D', 'E').split()
+                if len(node_parts) < 2:
+                    logger.error(
+                        f"Format error for die node at line {j + 1}.")
+                    continue
+
+                node = Node(-1)  # Temporary ID
+                node.x = float(node_parts[0])
+                node.y = float(node_parts[1])
+                die.nodes.append(node)
+
+            current_line += nb_die_nodes
+
+        return current_line
@@ -3,6 +3,11 @@ Background .NEU file preloading system
 """
 
 from .file_preloader import FilePreloader
+from .process_preloader import ProcessFilePreloader
+from .step_cache import StepCache
 from .preloader_manager import PreloaderManager
+from .model_3d_batch import Model3DBatch
+from .model_3d_worker import Model3DWorker
 
-__all__ = ['FilePreloader', 'PreloaderManager']
+__all__ = ['FilePreloader', 'ProcessFilePreloader', 'StepCache',
+           'PreloaderManager', 'Model3DBatch', 'Model3DWorker']
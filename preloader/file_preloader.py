@@ -3,7 +3,7 @@ File Preloader Thread
 Background thread for preloading .NEU files
 """
 
-from parser import ParserNeutralFile
+from parser import ParserNeutralFile, FieldStatisticsIndex
 import os
 from PyQt5.QtCore import QThread, pyqtSignal, QMutex
 import logging
@@ -28,6 +28,7 @@ class FilePreloader(QThread):
         self.working_directory = working_directory
         self.start_index = start_index
         self.preloaded_data = {}
+        self.preloaded_statistics = {}
         self.mutex = QMutex()
         self.should_stop = False
 
@@ -61,13 +62,10 @@ class FilePreloader(QThread):
 
                 try:
                     # Parse the mesh file
-                    neutral_data = ParserNeutralFile.parser_file(file_path)
+                    neutral_data = ParserNeutralFile.parser_file_cached(file_path)
                     if neutral_data:
-                        # Thread-safe storage
-                        self.mutex.lock()
-                        self.preloaded_data[i] = neutral_data
-                        self.mutex.unlock()
-
+                        self._store_step(i, neutral_data,
+                                         self._compute_statistics(i, neutral_data))
                         self.file_loaded.emit(i, filename)
                         loaded_count += 1
                         logger.info(
@@ -104,6 +102,44 @@ class FilePreloader(QThread):
         self.mutex.unlock()
         return data
 
+    def take_preloaded_data(self, index):
+        """Get preloaded mesh data by index and release it (thread-safe)"""
+        self.mutex.lock()
+        data = self.preloaded_data.pop(index, None)
+        self.mutex.unlock()
+        return data
+
+    def take_step_statistics(self, index):
+        """Get field statistics of a preloaded step and release them (thread-safe)"""
+        self.mutex.lock()
+        statistics = self.preloaded_statistics.pop(index, None)
+        self.mutex.unlock()
+        return statistics
+
+    def _needs_statistics(self, index):
+        """Check if the field statistics of a step are still unknown"""
+        step_statistics = getattr(
+            getattr(self, '_visualization_manager', None), 'step_statistics', None)
+        return step_statistics is not None and index not in step_statistics
+
+    def _compute_statistics(self, index, neutral_data):
+        """Summarize a step here so the GUI thread only records the result"""
+        if not self._needs_statistics(index):
+            return None
+        try:
+            return FieldStatisticsIndex.compute_step_statistics(neutral_data)
+        except Exception as e:
+            logger.exception(f"Error computing statistics of file {index}: {e}")
+            return None
+
+    def _store_step(self, index, neutral_data, statistics=None):
+        """Store a loaded step with its field statistics (thread-safe)"""
+        self.mutex.lock()
+        self.preloaded_data[index] = neutral_data
+        if statistics is not None:
+            self.preloaded_statistics[index] = statistics
+        self.mutex.unlock()
+
     def set_visualization_manager(self, visualization_manager):
-        """Set reference to check for graphics loading priority"""
+        """Set reference to check for graphics loading priority and index statistics"""
         self._visualization_manager = visualization_manager
@@ -0,0 +1,171 @@
+"""
+3D Model Batch Builder
+Builds the 3D models of a range of steps in a pool of worker processes
+"""
+
+from parser import BinaryStepCache
+from parser.models import Model3DBuilder, BuildCancelled
+import os
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Builders of a worker process, kept across jobs to reuse their topology
+_worker_builders = {}
+
+
+def build_3d_step(file_path, model_type, params, shared_topology_key=None):
+    """
+    Build the 3D model of one step in a worker process
+
+    The 2D step is read through the binary step cache and the 3D step is
+    written to it, so the parent can reload it once evicted. When its 3D
+    topology is the shared one of the parent, the id and connectivity arrays
+    are dropped before the step is sent back, returns (step, detached).
+    """
+    builder = Model3DBuilder(model_type, params)
+    builder = _worker_builders.setdefault(builder.get_settings(), builder)
+
+    source_key = BinaryStepCache.get_source_key(file_path)
+    data_2d = BinaryStepCache().load_or_parse(file_path)
+    if data_2d is None:
+        raise ValueError(f"Could not parse {file_path}")
+
+    neu = builder.build(data_2d)
+    BinaryStepCache(entry_name=builder.get_cache_name()).store(file_path, neu, source_key)
+    detached = builder.get_topology()[0] == shared_topology_key
+    if detached:
+        Model3DBuilder.detach_topology(neu)
+    return neu, detached
+
+
+class Model3DBatch:
+    """
+    3D models of a range of steps built by worker processes
+
+    The topology of the first step is shared: steps built by the pool with
+    the same 2D mesh get its id and connectivity arrays back, so the whole
+    sequence holds one copy of them and the mesh builder reuses one topology
+    across frames. The first step itself is built in this process while the
+    pool works on the others. Built steps are also written to the binary
+    step cache, evicted ones are reloaded from there.
+    """
+
+    def __init__(self, neu_files, working_directory, model_type, params, max_workers=None):
+        self.neu_files = neu_files
+        self.working_directory = working_directory
+        self.model_type = model_type
+        self.params = params
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.builder = Model3DBuilder(model_type, params)
+        self.step_cache = BinaryStepCache()
+        self.model_cache = BinaryStepCache(entry_name=self.builder.get_cache_name())
+        self.shared_topology = None
+        self.should_stop = False
+
+    def _get_path(self, index):
+        return os.path.join(self.working_directory, self.neu_files[index])
+
+    def stop(self):
+        """Request the running build to stop, run() raises BuildCancelled"""
+        self.should_stop = True
+        self.builder.stop()
+
+    def load_step(self, index):
+        """Load the 3D model of one step from the cache, building it on a miss"""
+        if not 0 <= index < len(self.neu_files):
+            return None
+
+        file_path = self._get_path(index)
+        neu = self.model_cache.load(file_path)
+        if neu is not None:
+            self._share_topology(neu)
+            return neu
+
+        logger.info(f"Rebuilding uncached 3D step {index + 1}")
+        data_2d = self.step_cache.load_or_parse(file_path)
+        return None if data_2d is None else self.builder.build(data_2d)
+
+    def _share_topology(self, neu):
+        """Give a loaded step the shared topology when it has the same one"""
+        topology = self.shared_topology
+        if topology is None:
+            return
+
+        _, node_ids, element_ids, lnods, _ = topology
+        if (np.array_equal(neu.node_ids, node_ids) and
+                np.array_equal(neu.element_ids, element_ids) and
+                np.array_equal(neu.lnods, lnods)):
+            Model3DBuilder.attach_topology(neu, topology)
+
+    def run(self, indexes, on_step_built, progress=None):
+        """
+        Build the given steps, on_step_built(index, step) follows completion order
+
+        progress(fraction) is called during the first step and after each
+        later one.
+        """
+        indexes = list(indexes)
+        if not indexes:
+            return
+        total = len(indexes)
+
+        first_path = self._get_path(indexes[0])
+        source_key = BinaryStepCache.get_source_key(first_path)
+        data_2d = self.step_cache.load_or_parse(first_path)
+        if data_2d is None:
+            raise ValueError(f"Could not load {self.neu_files[indexes[0]]}")
+        shared_topology = self.shared_topology = self.builder.prepare_topology(data_2d)
+
+        # Spawned workers do not inherit the Qt state of the GUI process
+        executor = None
+        if total > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=min(self.max_workers, total - 1),
+                mp_context=multiprocessing.get_context('spawn'))
+
+        pending = {}
+        try:
+            if executor is not None:
+                pending = {
+                    executor.submit(build_3d_step, self._get_path(index), self.model_type,
+                                    self.params, shared_topology[0]): index
+                    for index in indexes[1:]
+                }
+
+            # The first step is built here while the pool starts on the others
+            step_progress = None
+            if progress is not None:
+                def step_progress(fraction):
+                    progress(fraction / total)
+            first_step = self.builder.build(data_2d, step_progress)
+            self.model_cache.store(first_path, first_step, source_key)
+            on_step_built(indexes[0], first_step)
+
+            # Short waits so a stop request is honoured quickly
+            while pending and not self.should_stop:
+                done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    neu, detached = future.result()
+                    if detached:
+                        Model3DBuilder.attach_topology(neu, shared_topology)
+                    on_step_built(index, neu)
+                    if progress is not None:
+                        progress((total - len(pending)) / total)
+
+        finally:
+            # Cancelled by hand, cancel_futures needs Python 3.9
+            for future in pending:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=not self.should_stop)
+
+        if self.should_stop:
+            raise BuildCancelled()
+
+        logger.info(f"Built {len(indexes)} 3D {self.model_type} steps "
+                    f"with {self.max_workers} workers")
@@ -0,0 +1,81 @@
+"""
+3D Model Worker Thread
+Background thread for building 3D models of one or more steps
+"""
+
+from parser.models import BuildCancelled
+from PyQt5.QtCore import QThread, pyqtSignal
+import logging
+logger = logging.getLogger(__name__)
+
+
+class Model3DWorker(QThread):
+    """Background thread running a Model3DBatch, cancellable with stop()"""
+
+    # Signal emitted when a 3D step is built (index, 3D step)
+    step_built = pyqtSignal(int, object)
+    # Signal emitted with the field statistics of a built step (index, statistics)
+    statistics_computed = pyqtSignal(int, object)
+    # Signal emitted when all steps are built
+    build_finished = pyqtSignal()
+    # Signal emitted when the build stopped on request
+    build_cancelled = pyqtSignal()
+    # Signal emitted for progress updates (percentage, message)
+    progress_updated = pyqtSignal(int, str)
+    # Signal emitted on errors (error message)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, batch, indexes, data_2d=None, step_statistics=None):
+        super().__init__()
+        self.batch = batch
+        self.indexes = list(indexes)
+        # Already loaded 2D step of a single build
+        self.data_2d = data_2d
+        # FieldStatisticsIndex computing statistics of the built steps, None to skip
+        self.step_statistics = step_statistics
+        self.should_stop = False
+        self._percentage = -1
+
+    def run(self):
+        """Build the steps, results are delivered through signals"""
+        try:
+            if self.data_2d is not None:
+                neu = self.batch.builder.build(self.data_2d, self._on_progress)
+                self._on_step_built(self.indexes[0], neu)
+            else:
+                self.batch.run(self.indexes, self._on_step_built, self._on_progress)
+
+            if self.should_stop:
+                raise BuildCancelled()
+            self.build_finished.emit()
+
+        except BuildCancelled:
+            logger.info("3D model build cancelled")
+            self.build_cancelled.emit()
+
+        except Exception as e:
+            logger.exception(f"Error building 3D model: {e}")
+            self.error_occurred.emit(str(e))
+
+    def stop(self):
+        """Request the build to stop at the next block of layers or step"""
+        self.should_stop = True
+        self.batch.stop()
+
+    def _on_step_built(self, index, neu):
+        """Emit a built step, summarized before the GUI thread can use it"""
+        if self.step_statistics is not None:
+            try:
+                self.statistics_computed.emit(
+                    index, self.step_statistics.compute_step_statistics(neu))
+            except Exception as e:
+                logger.exception(f"Error computing statistics of 3D step {index}: {e}")
+        self.step_built.emit(index, neu)
+
+    def _on_progress(self, fraction):
+        """Emit progress when the percentage changes"""
+        percentage = int(fraction * 100)
+        if percentage != self._percentage:
+            self._percentage = percentage
+            self.progress_updated.emit(
+                percentage, f"Creating 3D model... {percentage}%")
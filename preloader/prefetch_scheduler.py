@@ -0,0 +1,57 @@
+"""
+Prefetch Scheduler
+Orders step preloading around the current playhead
+"""
+
+import threading
+
+
+class PrefetchScheduler:
+    """
+    Hands out pending step indexes nearest to the playhead first
+
+    Steps ahead of the playhead in the playback direction come first by
+    distance, steps behind it are weighted by BEHIND_PENALTY. The playhead
+    can be moved at any time, the next request uses the new ordering.
+    """
+
+    BEHIND_PENALTY = 3
+
+    def __init__(self, nb_steps, playhead=0, direction=1):
+        self._pending = set(range(nb_steps))
+        self._lock = threading.Lock()
+        self.playhead = playhead
+        self.direction = direction
+
+    def set_playhead(self, playhead, direction=None):
+        """Set current step and optionally playback direction"""
+        with self._lock:
+            self.playhead = playhead
+            if direction:
+                self.direction = 1 if direction > 0 else -1
+
+    def has_pending(self):
+        """Check if steps remain to be scheduled"""
+        with self._lock:
+            return bool(self._pending)
+
+    def discard(self, index):
+        """Remove a step that no longer needs loading"""
+        with self._lock:
+            self._pending.discard(index)
+
+    def next_index(self):
+        """Get and remove the highest priority pending step, None when done"""
+        with self._lock:
+            if not self._pending:
+                return None
+            index = min(self._pending, key=self._priority)
+            self._pending.remove(index)
+            return index
+
+    def _priority(self, index):
+        """Sort key of a step relative to the playhead"""
+        offset = (index - self.playhead) * self.direction
+        if offset >= 0:
+            return offset
+        return -offset * self.BEHIND_PENALTY
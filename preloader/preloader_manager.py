@@ -3,7 +3,10 @@ Preloader Manager
 Manages the file preloading system with UI progress
 """
 
-from .file_preloader import FilePreloader
+import os
+from parser import ParserNeutralFile
+from .process_preloader import ProcessFilePreloader
+from .step_cache import StepCache
 import logging
 logger = logging.getLogger(__name__)
 
@@ -11,10 +14,14 @@ logger = logging.getLogger(__name__)
 class PreloaderManager:
     """Manages the file preloading system"""
 
-    def __init__(self, visualization_manager):
+    def __init__(self, visualization_manager, max_workers=None, memory_budget=None):
         self.visualization_manager = visualization_manager
         self.preloader_thread = None
-        self.preloaded_files = {}
+        self.max_workers = max_workers  # None uses all CPU cores
+        self.neu_files = []
+        self.working_directory = None
+        self.preloaded_files = StepCache(memory_budget, loader=self._load_step)
+        self.visualization_manager.set_preloaded_data(self.preloaded_files)
         self.setup_progress_ui()
 
     def setup_progress_ui(self):
@@ -28,9 +35,13 @@ class PreloaderManager:
             return
 
         logger.info(f"Starting preload of {len(neu_files)} files")
+        self.neu_files = neu_files
+        self.working_directory = working_directory
 
-        # Disable auto-scale during loading
-        if hasattr(self.visualization_manager, 'toolbar_manager'):
+        # Disable auto-scale during loading, unless stored statistics cover the run
+        has_all_statistics = len(
+            self.visualization_manager.step_statistics) >= len(neu_files)
+        if hasattr(self.visualization_manager, 'toolbar_manager') and not has_all_statistics:
             self.visualization_manager.toolbar_manager.disable_auto_scale_during_loading()
 
         # Show progress indicators
@@ -42,8 +53,9 @@ class PreloaderManager:
             self.progress_label.setText("Starting preload...")
 
         # Create and configure preloader thread
-        self.preloader_thread = FilePreloader(
-            neu_files, working_directory, start_index=first_file_loaded_index
+        self.preloader_thread = ProcessFilePreloader(
+            neu_files, working_directory, start_index=first_file_loaded_index,
+            max_workers=self.max_workers
         )
 
         self.preloader_thread.set_visualization_manager(
@@ -56,15 +68,28 @@ class PreloaderManager:
         self.preloader_thread.progress_updated.connect(
             self._on_progress_updated)
 
+        # Share the step cache so prefetched frames are usable right away
+        self.visualization_manager.set_preloaded_data(self.preloaded_files)
+
         # Start background loading
         self.preloader_thread.start()
 
     def _on_file_loaded(self, index):
         """Called when a single file is loaded"""
         if self.preloader_thread:
-            data = self.preloader_thread.get_preloaded_data(index)
+            data = self.preloader_thread.take_preloaded_data(index)
             if data:
-                self.preloaded_files[index] = data
+                # Summarized by the preloader so auto-scale never has to reload the step
+                statistics = self.preloader_thread.take_step_statistics(index)
+                if statistics is not None:
+                    self.visualization_manager.record_step_statistics(index, statistics)
+
+                # Steps arrive nearest to the playhead first, so once the
+                # budget is used up later ones are only reloaded on demand
+                if self.preloaded_files.is_full():
+                    self.preloaded_files.register(index)
+                else:
+                    self.preloaded_files[index] = data
 
     def _on_all_files_loaded(self):
         """Called when all files are loaded"""
@@ -91,6 +116,25 @@ class PreloaderManager:
         if self.progress_label:
             self.progress_label.setText(message)
 
+    def _load_step(self, index):
+        """Reload an evicted step from disk or the binary cache"""
+        if index >= len(self.neu_files):
+            return None
+        file_path = os.path.join(self.working_directory, self.neu_files[index])
+        return ParserNeutralFile.parser_file_cached(file_path)
+
+    def set_memory_budget(self, memory_budget):
+        """Set memory budget of preloaded steps in bytes"""
+        self.preloaded_files.set_memory_budget(memory_budget)
+
+    def clear_preloaded_data(self):
+        """Forget all preloaded steps"""
+        self.preloaded_files.clear()
+
+    def set_max_workers(self, max_workers):
+        """Set number of worker processes used by the next preload"""
+        self.max_workers = max_workers
+
     def get_preloaded_data(self, index):
         """Get preloaded mesh data by file index"""
         return self.preloaded_files.get(index)
@@ -0,0 +1,149 @@
+"""
+Process Pool Preloader
+Background thread dispatching .NEU parsing to worker processes
+"""
+
+from parser import ParserNeutralFile, BinaryStepCache, FieldStatisticsIndex
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from .file_preloader import FilePreloader
+from .prefetch_scheduler import PrefetchScheduler
+import logging
+logger = logging.getLogger(__name__)
+
+
+def parse_step(file_path, with_statistics=False):
+    """
+    Parse one .NEU file in a worker process, returns (step, statistics)
+
+    The arrays are written to the binary step cache and memory-mapped back
+    by the parent, so the step is None when the cache holds it. When the
+    cache cannot be written the parsed arrays are returned pickled instead.
+    Field statistics are computed here on request, so the parent only
+    records them.
+    """
+    step_cache = BinaryStepCache()
+    neu = step_cache.load(file_path)
+    cached = neu is not None
+
+    if not cached:
+        # Taken before parsing, a file rewritten meanwhile is not cached
+        source_key = step_cache.get_source_key(file_path)
+        neu = ParserNeutralFile.parser_file_columnar(file_path)
+        if neu is None:
+            raise ValueError(f"Could not parse {file_path}")
+        cached = step_cache.store(file_path, neu, source_key)
+
+    statistics = FieldStatisticsIndex.compute_step_statistics(neu) if with_statistics else None
+    return (None if cached else neu), statistics
+
+
+class ProcessFilePreloader(FilePreloader):
+    """Preloading thread parsing files in a pool of worker processes"""
+
+    def __init__(self, neu_files, working_directory, start_index=1, max_workers=None):
+        super().__init__(neu_files, working_directory, start_index)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.step_cache = BinaryStepCache()
+        self.scheduler = PrefetchScheduler(len(neu_files))
+
+    def run(self):
+        """Main preloading loop executed in background thread"""
+        total_files = len(self.neu_files)
+        loaded_count = 0
+        pending = {}
+
+        try:
+            # Spawned workers do not inherit the Qt state of the GUI process
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'))
+
+            try:
+                while not self.should_stop and (pending or self.scheduler.has_pending()):
+                    self._update_playhead()
+
+                    # Keep the pool busy unless graphics loading has priority.
+                    # Few jobs are queued so a playhead jump is honoured quickly.
+                    while (len(pending) <= self.max_workers and
+                           not self._graphics_loading()):
+                        index = self.scheduler.next_index()
+                        if index is None:
+                            break
+                        file_path = os.path.join(
+                            self.working_directory, self.neu_files[index])
+                        future = executor.submit(
+                            parse_step, file_path, self._needs_statistics(index))
+                        pending[future] = index
+
+                    if not pending:
+                        self.msleep(200)
+                        continue
+
+                    done, _ = wait(pending, timeout=0.2,
+                                   return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        index = pending.pop(future)
+                        filename = self.neu_files[index]
+
+                        try:
+                            neutral_data, statistics = self._collect_result(index, future)
+                            if neutral_data:
+                                self._store_step(index, neutral_data, statistics)
+                                self.file_loaded.emit(index, filename)
+                                loaded_count += 1
+                                logger.info(
+                                    f"Preloaded {index+1}/{total_files}: {filename}")
+
+                        except Exception as e:
+                            logger.exception(f"Error loading {filename}: {e}")
+
+                        self.progress_updated.emit(
+                            int((loaded_count / total_files) * 100),
+                            f"Loaded {loaded_count}/{total_files} files"
+                        )
+
+            finally:
+                # Cancelled by hand, cancel_futures needs Python 3.9
+                for future in pending:
+                    future.cancel()
+                executor.shutdown(wait=not self.should_stop)
+
+            # Completion handling
+            if not self.should_stop:
+                self.progress_updated.emit(
+                    100, f"All {loaded_count} files loaded!")
+                self.all_files_loaded.emit()
+                logger.info(
+                    f"Preloading complete: {loaded_count} files loaded "
+                    f"with {self.max_workers} workers")
+
+        except Exception as e:
+            self.error_occurred.emit(f"Preloading error: {str(e)}")
+
+    def _collect_result(self, index, future):
+        """Get (mesh data, statistics) of a finished worker job"""
+        neu, statistics = future.result()
+        if neu is None:
+            file_path = os.path.join(
+                self.working_directory, self.neu_files[index])
+            neu = self.step_cache.load(file_path)
+            if neu is None:
+                # The source changed since the worker cached it
+                logger.warning(f"Cached step {file_path} could not be reloaded, parsing it")
+                neu = self.step_cache.load_or_parse(file_path)
+        return neu, statistics
+
+    def _update_playhead(self):
+        """Follow the step shown by the visualization manager"""
+        if hasattr(self, '_visualization_manager'):
+            self.scheduler.set_playhead(
+                getattr(self._visualization_manager, 'current_mesh_index', 0),
+                getattr(self._visualization_manager, 'playback_direction', 1))
+
+    def _graphics_loading(self):
+        """Check if graphics loading currently has priority"""
+        return (hasattr(self, '_visualization_manager') and
+                getattr(self._visualization_manager, 'graphics_loading', False))
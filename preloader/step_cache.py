@@ -0,0 +1,183 @@
+"""
+Step Cache
+Memory-budgeted LRU cache of parsed mesh steps
+"""
+
+import sys
+from collections import OrderedDict
+import logging
+logger = logging.getLogger(__name__)
+
+
+class StepCache:
+    """
+    LRU cache of parsed steps keyed by file index
+
+    Every index stored once stays known: evicted steps are reloaded through
+    the loader callback when accessed again, so the cache behaves like the
+    complete dict of preloaded steps while holding at most memory_budget
+    bytes. Topology arrays shared by several steps (see
+    ColumnarNeutralFile.topology_key) count once while any of them is held.
+    Accessed from the GUI thread only.
+    """
+
+    DEFAULT_MEMORY_BUDGET = 2 * 1024 ** 3  # 2 GiB
+
+    def __init__(self, memory_budget=None, loader=None):
+        self.memory_budget = memory_budget or self.DEFAULT_MEMORY_BUDGET
+        self.loader = loader  # loader(index) -> step data or None
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # index -> (data, nbytes, topology key)
+        self._known = set()
+        self._topologies = {}  # topology key -> [nbytes, number of held steps]
+
+    def __len__(self):
+        return len(self._known)
+
+    def __contains__(self, index):
+        return index in self._known
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __getitem__(self, index):
+        data = self.get(index)
+        if data is None:
+            raise KeyError(index)
+        return data
+
+    def __setitem__(self, index, data):
+        self.put(index, data)
+
+    def keys(self):
+        """Get all known step indexes, resident or not"""
+        return sorted(self._known)
+
+    def is_resident(self, index):
+        """Check if a step is currently held in memory"""
+        return index in self._entries
+
+    def get(self, index, default=None):
+        """Get a step, reloading it if it was evicted"""
+        entry = self._entries.get(index)
+        if entry is not None:
+            self._entries.move_to_end(index)
+            return entry[0]
+
+        if index not in self._known or self.loader is None:
+            return default
+
+        try:
+            data = self.loader(index)
+        except Exception as e:
+            logger.exception(f"Error reloading step {index}: {e}")
+            return default
+
+        if data is None:
+            return default
+
+        logger.info(f"Reloaded evicted step {index + 1}")
+        self.put(index, data)
+        return data
+
+    def put(self, index, data):
+        """Store a step and evict least recently used steps over budget"""
+        self.discard(index)
+
+        nbytes = self.estimate_nbytes(data)
+        topology_key = self._hold_topology(data)
+        self._entries[index] = (data, nbytes, topology_key)
+        self._known.add(index)
+        self.total_bytes += nbytes
+
+        self._evict()
+
+    def register(self, index):
+        """Mark a step as available without holding it in memory"""
+        self._known.add(index)
+
+    def is_full(self):
+        """Check if the memory budget is used up"""
+        return self.total_bytes >= self.memory_budget
+
+    def discard(self, index):
+        """Release the memory of a step, it stays reloadable"""
+        entry = self._entries.pop(index, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+            self._release_topology(entry[2])
+
+    def clear(self):
+        """Forget all steps"""
+        self._entries.clear()
+        self._known.clear()
+        self._topologies.clear()
+        self.total_bytes = 0
+
+    def set_memory_budget(self, memory_budget):
+        """Set memory budget in bytes"""
+        self.memory_budget = memory_budget
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used steps until the budget is met"""
+        # The most recent step is always kept, even when it alone is too large
+        while self.total_bytes > self.memory_budget and len(self._entries) > 1:
+            index, (_, nbytes, topology_key) = self._entries.popitem(last=False)
+            self.total_bytes -= nbytes
+            self._release_topology(topology_key)
+            logger.info(
+                f"Evicted step {index + 1} ({nbytes / 1024 ** 2:.1f} MB)")
+
+    def _hold_topology(self, data):
+        """Count the shared topology of a step once, get its key"""
+        topology_key = getattr(data, 'topology_key', None)
+        if topology_key is None:
+            return None
+
+        entry = self._topologies.get(topology_key)
+        if entry is None:
+            entry = self._topologies[topology_key] = [data.get_topology_nbytes(), 0]
+            self.total_bytes += entry[0]
+        entry[1] += 1
+        return topology_key
+
+    def _release_topology(self, topology_key):
+        """Stop counting a shared topology once no held step uses it"""
+        if topology_key is None:
+            return
+
+        entry = self._topologies[topology_key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._topologies[topology_key]
+            self.total_bytes -= entry[0]
+
+    @classmethod
+    def estimate_nbytes(cls, data):
+        """Estimate the memory held by one step"""
+        if hasattr(data, 'get_nbytes'):
+            return data.get_nbytes()
+
+        # Object-based steps are sampled on their first node and element
+        nbytes = sys.getsizeof(data)
+        for collection in (getattr(data, 'nodes', None), getattr(data, 'elements', None)):
+            if collection:
+                nbytes += sys.getsizeof(collection)
+                first = next(iter(collection.values()))
+                nbytes += len(collection) * cls._object_nbytes(first)
+        return nbytes
+
+    @staticmethod
+    def _object_nbytes(obj):
+        """Size of an object, its attribute dict or slots and its own values"""
+        nbytes = sys.getsizeof(obj)
+        attributes = getattr(obj, '__dict__', None)
+        if attributes is not None:
+            nbytes += sys.getsizeof(attributes)
+            values = list(attributes.values())
+        else:
+            names = [name for cls in type(obj).__mro__
+                     for name in getattr(cls, '__slots__', ())]
+            values = [getattr(obj, name, None) for name in names]
+        return nbytes + sum(sys.getsizeof(value) for value in values)
@@ -0,0 +1,131 @@
+"""
+Shared fixtures: synthetic columnar steps and .NEU files
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Tests import the application packages from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from parser.models import ColumnarNeutralFile, Die, Node  # noqa: E402
+
+
+def make_step(nx=5, ny=4, seed=1):
+    """Build a 2D columnar step of (nx - 1) * (ny - 1) quads with random fields"""
+    rng = np.random.default_rng(seed)
+    neu = ColumnarNeutralFile('test')
+    nb_nodes = nx * ny
+    neu.set_nodes(np.arange(1, nb_nodes + 1))
+    for name in neu.node_fields:
+        neu.node_fields[name][:] = rng.random(nb_nodes)
+    neu.node_fields['x'][:] = np.repeat(np.arange(nx, dtype=float), ny) + 0.5
+    neu.node_fields['y'][:] = np.tile(np.arange(ny, dtype=float), nx)
+    neu.node_fields['code'][:] = rng.integers(0, 3, nb_nodes)
+    neu.is_contact[:] = rng.random(nb_nodes) > 0.5
+
+    quads = []
+    for i in range(nx - 1):
+        for j in range(ny - 1):
+            first = i * ny + j + 1
+            quads.append([first, first + ny, first + ny + 1, first + 1])
+    neu.set_elements(np.arange(1, len(quads) + 1),
+                     rng.integers(1, 3, len(quads)), np.array(quads))
+    for name in neu.element_fields:
+        neu.element_fields[name][:] = rng.random(len(quads)) - 0.5
+    neu.set_t_time(1.5)
+
+    die = Die(2)
+    die.set_temp(3.0)
+    die.set_m(0.1)
+    for k in range(4):
+        node = Node(k)
+        node.x, node.y = rng.random(), rng.random()
+        die.add_node(node)
+    neu.add_die(die)
+    return neu
+
+
+def assert_same_step(actual, expected):
+    """Check that two columnar steps hold the same data"""
+    assert actual.get_title() == expected.get_title()
+    assert actual.get_t_time() == expected.get_t_time()
+    for name in ('node_ids', 'is_contact', 'element_ids', 'matno', 'lnods'):
+        np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name))
+    for fields in ('node_fields', 'element_fields'):
+        assert getattr(actual, fields).keys() == getattr(expected, fields).keys()
+        for name, values in getattr(expected, fields).items():
+            np.testing.assert_array_equal(getattr(actual, fields)[name], values)
+
+    assert len(actual.get_dies()) == len(expected.get_dies())
+    for actual_die, expected_die in zip(actual.get_dies(), expected.get_dies()):
+        assert (actual_die.get_id(), actual_die.get_temp(), actual_die.get_m()) == \
+            (expected_die.get_id(), expected_die.get_temp(), expected_die.get_m())
+        assert [(node.x, node.y) for node in actual_die.get_nodes()] == \
+            [(node.x, node.y) for node in expected_die.get_nodes()]
+
+
+def _format(value):
+    return f"{value:.6E}".replace('E', 'D')
+
+
+def write_neu_file(path, nx=6, ny=4, seed=0, renumber=False):
+    """Write a .NEU file of nx * ny quads with random fields, sparse ids when renumber"""
+    rng = np.random.default_rng(seed)
+    node_ids = {}
+    lines = ['TITLE step']
+
+    nodes = []
+    for j in range(ny + 1):
+        for i in range(nx + 1):
+            node_id = len(nodes) + 1
+            node_ids[i, j] = node_id * 3 + 7 if renumber else node_id
+            nodes.append((node_ids[i, j], 1.0 + i + 0.1 * j, float(j)))
+    lines.append(str(len(nodes)))
+    for node_id, x, y in nodes:
+        lines.append(' '.join([str(node_id)] + [_format(v) for v in (x, y, *rng.normal(size=4))]))
+
+    elements = []
+    for j in range(ny):
+        for i in range(nx):
+            element_id = len(elements) + 1
+            elements.append((element_id * 2 + 5 if renumber else element_id,
+                             [node_ids[i, j], node_ids[i + 1, j],
+                              node_ids[i + 1, j + 1], node_ids[i, j + 1]]))
+    lines.append(str(len(elements)))
+    for element_id, lnods in elements:
+        lines.append(' '.join([str(element_id), str(1 + element_id % 3)] + [str(n) for n in lnods] +
+                              [_format(v) for v in rng.random(3)]))
+    for size, scale in ((6, 1.0), (8, 1.0), (6, 100.0)):
+        for element_id, _ in elements:
+            lines.append(' '.join([str(element_id)] +
+                                  [_format(v) for v in rng.normal(size=size) * scale]))
+    for node_id, _, _ in nodes:
+        lines.append(' '.join([str(node_id)] + [_format(v) for v in rng.random(2) * 500]))
+
+    lines += ['2', 'DIES']
+    for die_id in (1, 2):
+        lines.append(f"{die_id} 5 {_format(300.0)}")
+        lines.append(' '.join(_format(v) for v in rng.normal(size=7)))
+        lines += [f"{_format(float(k))} {_format(10.0 + die_id)}" for k in range(5)]
+    lines += ['2', str(nodes[0][0]), str(nodes[1][0])]
+    lines += ['2', f"{nodes[0][0]} {_format(1.0)}", f"{nodes[2][0]} {_format(2.0)}"]
+    lines.append(_format(0.5))
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+    return str(path)
+
+
+@pytest.fixture
+def step():
+    return make_step()
+
+
+@pytest.fixture
+def neu_file(tmp_path):
+    return write_neu_file(tmp_path / 'FEM1.NEU')
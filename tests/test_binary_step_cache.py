@@ -0,0 +1,99 @@
+"""
+Binary step cache
+"""
+
+import json
+import os
+
+from conftest import assert_same_step, make_step, write_neu_file
+from parser import BinaryStepCache, ParserNeutralFile
+
+
+def _source(tmp_path):
+    source_path = tmp_path / 'step.NEU'
+    source_path.write_text('source')
+    return str(source_path)
+
+
+def test_loaded_steps_are_writable_copies(tmp_path):
+    source_path = _source(tmp_path)
+    step_cache = BinaryStepCache()
+    assert step_cache.store(source_path, make_step())
+
+    neu = step_cache.load(source_path)
+    node = list(neu.get_nodes())[0]
+    node.x = 99.0
+    list(neu.get_elements())[0].matno = 3
+
+    assert node.x == 99.0
+    assert list(step_cache.load(source_path).get_nodes())[0].x == 0.5
+
+
+def test_round_trip(neu_file):
+    step_cache = BinaryStepCache()
+    parsed = ParserNeutralFile.parser_file_columnar(neu_file)
+    assert step_cache.store(neu_file, parsed)
+
+    assert_same_step(step_cache.load(neu_file), parsed)
+    assert_same_step(ParserNeutralFile.parser_file_cached(neu_file), parsed)
+
+
+def test_load_or_parse_fills_the_cache(neu_file):
+    step_cache = BinaryStepCache()
+    assert step_cache.load(neu_file) is None
+
+    parsed = step_cache.load_or_parse(neu_file)
+    assert_same_step(step_cache.load(neu_file), parsed)
+
+
+def test_modified_source_invalidates_the_entry(tmp_path):
+    neu_file = write_neu_file(tmp_path / 'FEM1.NEU', seed=1)
+    step_cache = BinaryStepCache()
+    step_cache.load_or_parse(neu_file)
+
+    write_neu_file(neu_file, seed=2)
+    stat = os.stat(neu_file)
+    os.utime(neu_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert step_cache.load(neu_file) is None
+    assert_same_step(step_cache.load_or_parse(neu_file),
+                     ParserNeutralFile.parser_file_columnar(neu_file))
+
+
+def test_invalidate_and_format_version(neu_file):
+    step_cache = BinaryStepCache()
+    step_cache.load_or_parse(neu_file)
+    step_cache.invalidate(neu_file)
+    assert step_cache.load(neu_file) is None
+
+    step_cache.load_or_parse(neu_file)
+    meta_path = os.path.join(step_cache.get_cache_path(neu_file), 'meta.json')
+    with open(meta_path, 'r', encoding='utf-8') as file:
+        meta = json.load(file)
+    meta['version'] = BinaryStepCache.FORMAT_VERSION + 1
+    with open(meta_path, 'w', encoding='utf-8') as file:
+        json.dump(meta, file)
+    assert step_cache.load(neu_file) is None
+
+
+def test_source_changed_during_parse_is_not_cached(neu_file):
+    step_cache = BinaryStepCache()
+    source_key = step_cache.get_source_key(neu_file)
+    parsed = ParserNeutralFile.parser_file_columnar(neu_file)
+
+    write_neu_file(neu_file, seed=5)
+    stat = os.stat(neu_file)
+    os.utime(neu_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert not step_cache.store(neu_file, parsed, source_key)
+    assert step_cache.load(neu_file) is None
+    assert not [name for name in os.listdir(step_cache.get_cache_path(neu_file))
+                if name.endswith('.tmp')]
+
+
+def test_memory_mapped_arrays_are_not_resident(neu_file):
+    step_cache = BinaryStepCache()
+    parsed = step_cache.load_or_parse(neu_file)
+    loaded = step_cache.load(neu_file)
+
+    assert parsed.get_nbytes() > 0
+    assert loaded.get_nbytes() < parsed.get_nbytes()
+    assert BinaryStepCache(mmap_mode=None).load(neu_file).get_nbytes() == parsed.get_nbytes()
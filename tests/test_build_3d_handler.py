@@ -0,0 +1,36 @@
+"""
+3D build progress dialog
+"""
+
+import pytest
+
+QtWidgets = pytest.importorskip('PyQt5.QtWidgets')
+
+from handlers.build_3d_handler import Build3DHandler  # noqa: E402
+
+
+class FakeWorker:
+    should_stop = False
+
+    def isRunning(self):
+        return True
+
+    def stop(self):
+        self.should_stop = True
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_finished_build_is_not_cancelled_by_closing_the_dialog(app):
+    handler = Build3DHandler(QtWidgets.QWidget())
+    worker = handler.build_worker = FakeWorker()
+    handler.progress_dialog = handler._create_progress_dialog()
+    handler.progress_dialog.canceled.connect(handler.stop_build)
+    handler.progress_dialog.show()
+
+    finished = []
+    handler._on_build_finished(worker, lambda: finished.append(True))
+    assert finished and not worker.should_stop
@@ -0,0 +1,33 @@
+"""
+Arrays kept on meshes reused across steps
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+pv = pytest.importorskip('pyvista')
+
+from conftest import make_step  # noqa: E402
+from handlers.field_variables_handler import FieldVariablesHandler  # noqa: E402
+from visualization.mesh_builder import MeshBuilder  # noqa: E402
+
+
+@pytest.mark.parametrize('high_definition_contour', [False, True])
+def test_redraws_do_not_add_arrays(high_definition_contour):
+    mesh_builder = MeshBuilder()
+    handler = FieldVariablesHandler(SimpleNamespace(
+        visualization_manager=SimpleNamespace(mesh_builder=mesh_builder)))
+    options = {'high_definition_contour': high_definition_contour}
+    plotter = pv.Plotter(off_screen=True)
+
+    mesh = mesh_builder.create_pyvista_mesh(make_step(seed=1), False)
+    for seed in range(2, 6):
+        assert mesh_builder.update_pyvista_mesh(mesh, make_step(seed=seed), False)
+        plotter.clear()
+        for mesh_data in handler._prepare_all_meshes_for_display(
+                mesh, 'Temperature', 'Temperature', 'black', options):
+            plotter.add_mesh(**mesh_data)
+
+        assert not [name for name in mesh.array_names if name.startswith('Data')]
+    plotter.close()
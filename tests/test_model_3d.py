@@ -0,0 +1,138 @@
+"""
+Array-based 3D models against the per-object NeutralFile3D construction
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from parser import ParserNeutralFile
+from parser.models import Element3D, Model3DBuilder, NeutralFile3D, Node3D
+from preloader.step_cache import StepCache
+
+PARAMS = {'divisions': 4, 'thickness': 2.0, 'angle': 90.0}
+MODEL_TYPES = ('plane_strain', 'plane_stress', 'axisymmetric', 'axisymmetric_cheese')
+
+
+def _build_reference(data_2d, model_type, params):
+    """Build a 3D model node by node and element by element"""
+    divisions = params['divisions']
+    nodes_2d = list(data_2d.get_nodes())
+    elements_2d = list(data_2d.get_elements())
+    axisymmetric = model_type in ('axisymmetric', 'axisymmetric_cheese')
+    total_angle = (math.radians(params['angle']) if model_type == 'axisymmetric_cheese'
+                   else 2 * math.pi)
+    neu = NeutralFile3D(f"3D_{model_type}_{data_2d.get_title()}")
+
+    thickness = params['thickness']
+    if model_type == 'plane_stress':
+        strain_z_min = min(element.get_strain_Ezz() for element in elements_2d)
+        thickness = 0.5 * thickness * math.exp(strain_z_min)
+
+    for i_div in range(divisions + 1):
+        alpha = total_angle * i_div / divisions
+        for node_2d in nodes_2d:
+            node = Node3D(node_2d.get_id() + i_div * len(nodes_2d))
+            if axisymmetric:
+                radius = node_2d.get_coordX()
+                node.set_coordX(radius * math.cos(alpha))
+                node.set_coordY(radius * math.sin(alpha))
+                node.set_coordZ(node_2d.get_coordY())
+                node.set_Vx(node_2d.get_Vx() * math.cos(alpha))
+                node.set_Vy(node_2d.get_Vx() * math.sin(alpha))
+            else:
+                node.set_coordX(node_2d.get_coordX())
+                node.set_coordY(node_2d.get_coordY())
+                node.set_coordZ(thickness * i_div / divisions)
+                node.set_Vx(node_2d.get_Vx())
+                node.set_Vy(node_2d.get_Vy())
+            node.set_Temp(node_2d.get_Temp())
+            neu.add_node(node)
+
+    for i_div in range(divisions):
+        alpha = total_angle * (i_div + 0.5) / divisions
+        closing = i_div == divisions - 1 and model_type == 'axisymmetric'
+        for element_2d in elements_2d:
+            element = Element3D(element_2d.get_id() + i_div * len(elements_2d))
+            element.set_matno(element_2d.get_matno())
+            ids = [node.get_id() for node in element_2d.get_lnods()]
+            top = 0 if closing else i_div + 1
+            element.set_lnods([neu.get_node_by_id(node_id + layer * len(nodes_2d))
+                               for layer in (i_div, top) for node_id in ids])
+
+            exx, eyy, ezz = (element_2d.get_strain_Exx(), element_2d.get_strain_Eyy(),
+                             element_2d.get_strain_Ezz())
+            if axisymmetric:
+                cos_2, sin_2 = math.cos(alpha) ** 2, math.sin(alpha) ** 2
+                element.set_strain_Exx(exx * cos_2 + ezz * sin_2)
+                element.set_strain_Eyy(exx * sin_2 + ezz * cos_2)
+                element.set_strain_Ezz(eyy)
+                element.set_strain_Exy((exx - ezz) * math.cos(alpha) * math.sin(alpha))
+            else:
+                element.set_strain_Exx(exx)
+                element.set_strain_Eyy(eyy)
+                element.set_strain_Ezz(ezz)
+                element.set_strain_Exy(element_2d.get_strain_Exy())
+            element.set_stress_O(element_2d.get_stress_O())
+            neu.add_element(element)
+
+    return neu
+
+
+@pytest.mark.parametrize('model_type', MODEL_TYPES)
+def test_matches_reference(neu_file, model_type):
+    data_2d = ParserNeutralFile.parser_file(neu_file)
+    expected = _build_reference(data_2d, model_type, PARAMS)
+    neu = Model3DBuilder(model_type, PARAMS).build(data_2d)
+
+    nodes = {node.get_id(): node for node in neu.get_nodes()}
+    assert sorted(nodes) == sorted(node.get_id() for node in expected.get_nodes())
+    for node in expected.get_nodes():
+        actual = nodes[node.get_id()]
+        np.testing.assert_allclose(
+            [actual.get_coordX(), actual.get_coordY(), actual.get_coordZ(),
+             actual.get_Vx(), actual.get_Vy(), actual.get_Temp()],
+            [node.get_coordX(), node.get_coordY(), node.get_coordZ(),
+             node.get_Vx(), node.get_Vy(), node.get_Temp()], atol=1e-12)
+
+    elements = {element.get_id(): element for element in neu.get_elements()}
+    assert len(elements) == len(list(expected.get_elements()))
+    for element in expected.get_elements():
+        actual = elements[element.get_id()]
+        assert actual.get_matno() == element.get_matno()
+        assert ([node.get_id() for node in actual.get_lnods()] ==
+                [node.get_id() for node in element.get_lnods()])
+        np.testing.assert_allclose(
+            [actual.get_strain_Exx(), actual.get_strain_Eyy(), actual.get_strain_Ezz(),
+             actual.get_strain_Exy(), actual.get_stress_O()],
+            [element.get_strain_Exx(), element.get_strain_Eyy(), element.get_strain_Ezz(),
+             element.get_strain_Exy(), element.get_stress_O()], atol=1e-12)
+
+
+def test_object_and_columnar_steps_build_the_same_model(neu_file):
+    builder = Model3DBuilder('axisymmetric', PARAMS)
+    from_objects = builder.build(ParserNeutralFile.parser_file(neu_file))
+    from_columns = builder.build(ParserNeutralFile.parser_file_columnar(neu_file))
+
+    for name, values in from_columns.node_fields.items():
+        np.testing.assert_array_equal(from_objects.node_fields[name], values)
+    for name, values in from_columns.element_fields.items():
+        np.testing.assert_array_equal(from_objects.element_fields[name], values)
+    np.testing.assert_array_equal(from_objects.lnods, from_columns.lnods)
+
+
+def test_shared_topology_is_counted_once(neu_file):
+    builder = Model3DBuilder('axisymmetric', PARAMS)
+    data_2d = ParserNeutralFile.parser_file_columnar(neu_file)
+    first, second = builder.build(data_2d), builder.build(data_2d)
+    assert first.lnods is second.lnods
+
+    step_cache = StepCache()
+    step_cache[0] = first
+    step_cache[1] = second
+    assert step_cache.total_bytes == first.get_nbytes() * 2 + first.get_topology_nbytes()
+
+    step_cache.discard(0)
+    step_cache.discard(1)
+    assert step_cache.total_bytes == 0
@@ -0,0 +1,53 @@
+"""
+3D batch builds and reloads through the binary step cache
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from conftest import write_neu_file  # noqa: E402
+from parser import BinaryStepCache  # noqa: E402
+from parser.models import Model3DBuilder  # noqa: E402
+from preloader.model_3d_batch import Model3DBatch, build_3d_step  # noqa: E402
+
+PARAMS = {'divisions': 4, 'thickness': 2.0, 'angle': 90.0}
+
+
+def test_evicted_steps_are_loaded_from_the_cache(tmp_path, monkeypatch):
+    neu_files = [f"FEM{i}.NEU" for i in (1, 2)]
+    for seed, name in enumerate(neu_files):
+        write_neu_file(tmp_path / name, seed=seed)
+    batch = Model3DBatch(neu_files, str(tmp_path), 'axisymmetric', PARAMS)
+
+    built = {}
+    batch.run([0], built.__setitem__)
+    neu, detached = build_3d_step(str(tmp_path / neu_files[1]), 'axisymmetric', PARAMS,
+                                  batch.shared_topology[0])
+    assert detached
+
+    def build(data_2d, progress=None):
+        raise AssertionError("cached steps must not be rebuilt")
+    monkeypatch.setattr(batch.builder, 'build', build)
+
+    for index in (0, 1):
+        loaded = batch.load_step(index)
+        assert loaded.topology_key == batch.shared_topology[0]
+        assert loaded.lnods is batch.shared_topology[3]
+        assert loaded.layer_layout == (PARAMS['divisions'], True)
+        assert [die.get_nodes()[-1].get_coordZ() for die in loaded.get_dies()] == \
+            pytest.approx([die.get_nodes()[-1].get_coordZ()
+                           for die in built[0].get_dies()])
+    for name, values in built[0].node_fields.items():
+        np.testing.assert_array_equal(batch.load_step(0).node_fields[name], values)
+
+
+def test_cache_entries_depend_on_the_settings(neu_file):
+    builder = Model3DBuilder('axisymmetric', PARAMS)
+    other = Model3DBuilder('axisymmetric', dict(PARAMS, divisions=6))
+    assert builder.get_cache_name() != other.get_cache_name()
+
+    build_3d_step(neu_file, 'axisymmetric', PARAMS)
+    assert BinaryStepCache(entry_name=builder.get_cache_name()).load(neu_file) is not None
+    assert BinaryStepCache(entry_name=other.get_cache_name()).load(neu_file) is None
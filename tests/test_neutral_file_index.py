@@ -0,0 +1,33 @@
+"""
+Section index of .NEU files
+"""
+
+import os
+
+from parser import NeutralFileIndex
+
+
+def test_index_is_stored_and_reused(neu_file, monkeypatch):
+    index = NeutralFileIndex.for_file(neu_file)
+    assert index.get_count('nodes') == 35 and index.get_count('dies') == 2
+    assert len(index.read_lines('elements')) == 24
+
+    # A cold open reads the stored offsets instead of scanning the file
+    NeutralFileIndex.clear_cache()
+    monkeypatch.setattr(NeutralFileIndex, '_build', None)
+    stored = NeutralFileIndex.for_file(neu_file)
+    assert stored.title == index.title and stored.sections == index.sections
+
+
+def test_modified_file_is_indexed_again(neu_file):
+    NeutralFileIndex.for_file(neu_file)
+    NeutralFileIndex.clear_cache()
+
+    with open(neu_file, 'r', encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    with open(neu_file, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(['RENAMED'] + lines[1:]) + '\n')
+    stat = os.stat(neu_file)
+    os.utime(neu_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    assert NeutralFileIndex.for_file(neu_file).title == 'RENAMED'
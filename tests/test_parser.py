@@ -0,0 +1,75 @@
+"""
+Columnar .NEU parsing against the object parser
+"""
+
+import pytest
+
+from conftest import assert_same_step, write_neu_file
+from parser import ParserNeutralFile
+from parser.models import ColumnarNeutralFile
+
+
+@pytest.mark.parametrize('renumber', [False, True])
+def test_columnar_matches_object_parser(tmp_path, renumber):
+    neu_file = write_neu_file(tmp_path / 'FEM1.NEU', seed=3, renumber=renumber)
+    objects = ParserNeutralFile.parser_file(neu_file)
+    columnar = ParserNeutralFile.parser_file_columnar(neu_file)
+
+    assert_same_step(columnar, ColumnarNeutralFile.from_neutral_file(objects))
+
+
+def test_views_match_object_parser(tmp_path):
+    neu_file = write_neu_file(tmp_path / 'FEM1.NEU', seed=4, renumber=True)
+    objects = ParserNeutralFile.parser_file(neu_file)
+    columnar = ParserNeutralFile.parser_file_columnar(neu_file)
+
+    for node, view in zip(objects.get_nodes(), columnar.get_nodes()):
+        assert (view.get_id(), view.get_coordX(), view.get_Fy(), view.get_code()) == \
+            (node.get_id(), node.get_coordX(), node.get_Fy(), node.get_code())
+        assert view.is_contact_node() == node.is_contact_node()
+
+    for element, view in zip(objects.get_elements(), columnar.get_elements()):
+        assert view.get_id() == element.get_id()
+        assert [node.get_id() for node in view.get_lnods()] == \
+            [node.get_id() for node in element.get_lnods()]
+        assert (view.get_stress_O(), view.get_stress_1(), view.get_strain_E2()) == \
+            pytest.approx((element.get_stress_O(), element.get_stress_1(),
+                           element.get_strain_E2()))
+
+
+@pytest.mark.parametrize('malformed', ['5 1 2 3', ''])
+def test_malformed_element_line_is_skipped(tmp_path, caplog, malformed):
+    neu_file = write_neu_file(tmp_path / 'FEM1.NEU', seed=5)
+    with open(neu_file, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    nb_nodes = int(lines[1])
+    element_line = 2 + nb_nodes + 1 + 4
+    lines[element_line] = malformed
+    with open(neu_file, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+
+    objects = ParserNeutralFile.parser_file(neu_file)
+    columnar = ParserNeutralFile.parser_file_columnar(neu_file)
+
+    assert columnar is not None
+    assert len(columnar.get_elements()) == len(objects.get_elements()) == 23
+    assert 5 not in columnar.element_ids
+    assert_same_step(columnar, ColumnarNeutralFile.from_neutral_file(objects))
+    if malformed:
+        assert f"Format error for element at line {element_line + 1}." in caplog.text
+
+
+def test_malformed_node_line_is_skipped(tmp_path, caplog):
+    neu_file = write_neu_file(tmp_path / 'FEM1.NEU', seed=6)
+    with open(neu_file, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    lines[2 + 6] = '7 1.0 2.0 x 0.0 0.0 0.0'
+    with open(neu_file, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(lines) + '\n')
+
+    columnar = ParserNeutralFile.parser_file_columnar(neu_file)
+
+    assert columnar is not None
+    assert len(columnar.get_nodes()) == int(lines[1]) - 1
+    assert 7 not in columnar.node_ids
+    assert "Format error for node at line 9." in caplog.text
@@ -0,0 +1,40 @@
+"""
+Cell to point interpolation against VTK
+"""
+
+import numpy as np
+import pytest
+
+pv = pytest.importorskip('pyvista')
+
+from conftest import make_step  # noqa: E402
+from parser.models import Model3DBuilder  # noqa: E402
+from visualization.mesh_builder import MeshBuilder  # noqa: E402
+from visualization.point_interpolation import CellToPointInterpolator  # noqa: E402
+
+
+def _vtk_point_values(mesh, cell_values):
+    grid = pv.UnstructuredGrid(mesh.cells, mesh.celltypes, mesh.points)
+    grid.cell_data['values'] = cell_values
+    return grid.cell_data_to_point_data().point_data['values']
+
+
+@pytest.mark.parametrize('is_3d', [False, True])
+def test_matches_cell_data_to_point_data(is_3d):
+    step = make_step(7, 6)
+    if is_3d:
+        step = Model3DBuilder('axisymmetric_cheese', {'divisions': 5, 'angle': 90.0}).build(step)
+    mesh = MeshBuilder().create_pyvista_mesh(step, is_3d)
+
+    cell_values = np.random.default_rng(0).random(mesh.n_cells)
+    np.testing.assert_allclose(CellToPointInterpolator(mesh).apply(cell_values),
+                               _vtk_point_values(mesh, cell_values))
+
+
+def test_get_point_data_is_cached_per_step():
+    mesh_builder = MeshBuilder()
+    mesh = mesh_builder.create_pyvista_mesh(make_step(), False)
+
+    values = mesh_builder.get_point_data(mesh, 'Temperature')
+    np.testing.assert_allclose(values, _vtk_point_values(mesh, mesh.cell_data['Temperature']))
+    assert mesh_builder.get_point_data(mesh, 'Temperature') is values
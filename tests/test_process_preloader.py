@@ -0,0 +1,22 @@
+"""
+Preload worker jobs
+"""
+
+import pytest
+
+pytest.importorskip('PyQt5')
+
+from parser import BinaryStepCache, FieldStatisticsIndex, ParserNeutralFile  # noqa: E402
+from preloader.process_preloader import parse_step  # noqa: E402
+
+
+def test_parse_step_caches_the_step_and_returns_its_statistics(neu_file):
+    expected = FieldStatisticsIndex.compute_step_statistics(
+        ParserNeutralFile.parser_file_columnar(neu_file))
+
+    for _ in range(2):  # Parsed, then loaded from the cache
+        neu, statistics = parse_step(neu_file, True)
+        assert neu is None and statistics == expected
+    assert BinaryStepCache().load(neu_file) is not None
+
+    assert parse_step(neu_file) == (None, None)
@@ -0,0 +1,37 @@
+"""
+Node spatial index against brute force
+"""
+
+import numpy as np
+
+from visualization.spatial_index import NodeSpatialIndex
+
+
+def _brute_force(points, position):
+    distances = np.linalg.norm(points - position, axis=1)
+    return np.argsort(distances, kind='stable'), distances
+
+
+def test_queries_match_brute_force():
+    rng = np.random.default_rng(0)
+    points = rng.random((500, 3)) * [10.0, 4.0, 0.0]
+    index = NodeSpatialIndex(points)
+
+    for position in rng.random((20, 3)) * [12.0, 5.0, 1.0] - 1.0:
+        order, distances = _brute_force(points, position)
+        assert index.nearest(position)[0] == order[0]
+        np.testing.assert_allclose(index.k_nearest(position, 7)[1], distances[order[:7]])
+        inside, _ = index.within_radius(position, 1.5)
+        assert set(inside) == set(np.flatnonzero(distances <= 1.5))
+
+
+def test_update_rebuilds_on_next_query():
+    points = np.random.default_rng(1).random((100, 3))
+    index = NodeSpatialIndex(points)
+    index.nearest(points[0])
+
+    moved = points + 5.0
+    index.update(moved)
+    assert index._dirty
+    assert index.nearest(moved[3]) == (3, 0.0)
+    assert not index._dirty
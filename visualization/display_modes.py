@@ -5,6 +5,9 @@ Handles all display modes in one place
 
 import numpy as np
 import pyvista as pv
+
+from parser import ColumnarNeutralFile
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -242,13 +245,11 @@ class DisplayModeManager:
                 all_colors.append(config['color'])
 
         # Add contact nodes
-        nodes = mesh._original_data.get_nodes()
         contact_config = self.CONSTRAINT_CONFIG['contact']
 
-        for node in nodes:
-            if node.is_contact_node():
-                all_positions.append([node.get_coordX(), node.get_coordY(), 0])
-                all_colors.append(contact_config['color'])
+        for position in self._get_contact_positions(mesh):
+            all_positions.append(position)
+            all_colors.append(contact_config['color'])
 
         # Create all spheres at once
         if all_positions:
@@ -537,13 +538,7 @@ class DisplayModeManager:
 
     def _add_contact_nodes_visualization(self, plotter, mesh, constraint_size, subdivisions):
         """Add contact node spheres"""
-        nodes = mesh._original_data.get_nodes()
-        contact_positions = []
-
-        for node in nodes:
-            if node.is_contact_node():
-                contact_positions.append(
-                    [node.get_coordX(), node.get_coordY(), 0])
+        contact_positions = self._get_contact_positions(mesh)
 
         if contact_positions:
             contact_config = self.CONSTRAINT_CONFIG['contact']
@@ -561,6 +556,17 @@ class DisplayModeManager:
                     render=False
                 )
 
+    def _get_contact_positions(self, mesh):
+        """Get in-plane positions of contact nodes, from arrays when columnar"""
+        data = mesh._original_data
+        if isinstance(data, ColumnarNeutralFile):
+            rows = np.flatnonzero(data.is_contact)
+            return [[x, y, 0] for x, y in zip(data.node_fields['x'][rows].tolist(),
+                                              data.node_fields['y'][rows].tolist())]
+
+        return [[node.get_coordX(), node.get_coordY(), 0]
+                for node in data.get_nodes() if node.is_contact_node()]
+
     def _apply_hd_contour(self, mesh, scalar_name):
         """Apply high definition contour"""
         mesh_copy = mesh.copy()
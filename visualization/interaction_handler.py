@@ -7,6 +7,7 @@ import vtk
 from PyQt5.QtCore import QTimer
 import pyvista as pv
 from PyQt5.QtWidgets import QButtonGroup, QRadioButton, QHBoxLayout, QLabel
+from .spatial_index import NodeSpatialIndex
 import time
 import logging
 logger = logging.getLogger(__name__)
@@ -91,7 +92,7 @@ class InteractionHandler:
             self.pick_mode = "nodes"
 
         # Clear any current highlight
-        self._clear_highlight()
+        self.clear_highlight()
 
     def _calculate_proportional_size(self, mesh, base_factor=0.006):
         """Calculate proportional size based on mesh dimensions and element density"""
@@ -154,7 +155,7 @@ class InteractionHandler:
         self.picking_enabled = False
 
         # Clear any highlights
-        self._clear_highlight()
+        self.clear_highlight()
 
         # Remove VTK observers
         if self.plotter and self.plotter.iren:
@@ -203,10 +204,11 @@ class InteractionHandler:
         # Perform the pick
         result = picker.Pick(x, y, 0, renderer)
         if result:
-            cell_id = picker.GetCellId()
+            # Surfaces drawn for 3D models point back to their volume cells
+            cell_id = self._get_volume_cell(picker.GetDataSet(), picker.GetCellId())
 
             if cell_id >= 0:
-                logger.info(f"Picked cell ID: {cell_id}")
+                logger.info(f"Picked element ID: {self.get_element_id(cell_id)}")
                 self._display_cell_info(cell_id)
                 self._highlight_picked_cell(cell_id)
             else:
@@ -214,6 +216,16 @@ class InteractionHandler:
                     self.info_content.setText(
                         "No element found at click position")
 
+    @staticmethod
+    def _get_volume_cell(dataset, cell_id):
+        """Get the mesh cell of a picked cell, mapped through vtkOriginalCellIds"""
+        if dataset is None or cell_id < 0:
+            return cell_id
+        original_ids = dataset.GetCellData().GetArray('vtkOriginalCellIds')
+        if original_ids is None:
+            return cell_id
+        return int(original_ids.GetTuple1(cell_id))
+
     def _pick_node(self, x, y, renderer):
         """Pick and display node information"""
         if not self.current_mesh:
@@ -230,10 +242,10 @@ class InteractionHandler:
                 world_pos = cell_picker.GetPickPosition()
 
                 # Find the closest node in the main mesh
-                points = self.current_mesh.points
-                distances = np.linalg.norm(
-                    points - np.array(world_pos), axis=1)
-                closest_point_id = np.argmin(distances)
+                closest_point_id, min_distance = self.get_node_index().nearest(
+                    world_pos)
+                if closest_point_id is None:
+                    return
 
                 # Calculate reasonable distance threshold
                 bounds = self.current_mesh.bounds
@@ -241,10 +253,8 @@ class InteractionHandler:
                     bounds[1] - bounds[0], bounds[3] - bounds[2], bounds[5] - bounds[4])
                 distance_threshold = max_dimension * 0.02  # 2% of mesh size
 
-                min_distance = distances[closest_point_id]
-
                 if min_distance <= distance_threshold:
-                    logger.info(f"Picked node ID: {closest_point_id}")
+                    logger.info(f"Picked node ID: {self.get_node_id(closest_point_id)}")
                     self._display_node_info(closest_point_id)
                     self._highlight_picked_node(closest_point_id)
                 else:
@@ -261,11 +271,34 @@ class InteractionHandler:
             if self.info_content:
                 self.info_content.setText(f"Error in node picking: {e}")
 
+    def get_node_index(self, mesh=None):
+        """Get the node spatial index of a mesh, built on first use"""
+        mesh = mesh if mesh is not None else self.current_mesh
+        node_index = getattr(mesh, '_node_index', None)
+        if node_index is None:
+            node_index = mesh._node_index = NodeSpatialIndex(mesh.points)
+        return node_index
+
+    def get_element_id(self, cell_index):
+        """Get the element ID of a cell index of the current mesh"""
+        return self._lookup_id(getattr(self.current_mesh, '_cell_ids', None), cell_index)
+
+    def get_node_id(self, point_index):
+        """Get the node ID of a point index of the current mesh"""
+        return self._lookup_id(getattr(self.current_mesh, '_point_ids', None), point_index)
+
+    @staticmethod
+    def _lookup_id(ids, index):
+        """Get ids[index], index + 1 for meshes built without an ID array"""
+        if ids is not None and 0 <= index < len(ids):
+            return int(ids[index])
+        return int(index) + 1
+
     def _highlight_picked_cell(self, cell_id):
         """Highlight the picked cell visually"""
         if self.current_mesh and cell_id < self.current_mesh.n_cells:
             # Clear previous highlight
-            self._clear_highlight()
+            self.clear_highlight()
 
             # Extract the single cell
             single_cell = self.current_mesh.extract_cells([cell_id])
@@ -284,7 +317,7 @@ class InteractionHandler:
         """Highlight the picked node visually"""
         if self.current_mesh and point_id < self.current_mesh.n_points:
             # Clear previous highlight
-            self._clear_highlight()
+            self.clear_highlight()
 
             # Get node position
             node_position = self.current_mesh.points[point_id]
@@ -304,7 +337,7 @@ class InteractionHandler:
                 name='picked_node_highlight'
             )
 
-    def _clear_highlight(self):
+    def clear_highlight(self):
         """Clear cell and node highlights"""
         if self.plotter:
             # Remove element highlight
@@ -324,7 +357,8 @@ class InteractionHandler:
             return
 
         try:
-            element = self.current_data.get_element_by_id(cell_index + 1)
+            element = self.current_data.get_element_by_id(
+                self.get_element_id(cell_index))
 
             element_id = element.get_id()
 
@@ -351,7 +385,8 @@ class InteractionHandler:
             return
 
         try:
-            node = self.current_data.get_node_by_id(point_index + 1)
+            node = self.current_data.get_node_by_id(
+                self.get_node_id(point_index))
             node_id = node.get_id()
 
             # Get all available information
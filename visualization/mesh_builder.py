@@ -2,9 +2,16 @@
 PyVista Mesh Construction Module
 """
 
+import hashlib
 import numpy as np
 import pyvista as pv
 
+from parser import ColumnarNeutralFile
+from parser.models.element_fields import (ElementFieldArrays, FIELD_VARIABLES,
+                                          gather_element_columns)
+from .point_interpolation import CellToPointInterpolator
+from .surface_lod import get_surface_lod
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -12,6 +19,9 @@ logger = logging.getLogger(__name__)
 class MeshBuilder:
     """Creates PyVista meshes from neutral data"""
 
+    # Field variable arrays: Element column or derived quantity behind each name
+    CELL_DATA_SOURCES = FIELD_VARIABLES
+
     def __init__(self):
         # Material color palette
         self.material_colors = [
@@ -29,11 +39,17 @@ class MeshBuilder:
             [1.0, 0.5, 1.0]    # Light Magenta
         ]
 
+        # (connectivity array, shape key, topology) of the last columnar step
+        self._last_topology = None
+
     def create_pyvista_mesh(self, neutral_data, is_3d=False):
         """Create PyVista mesh from neutral data"""
         if not neutral_data:
             return None
 
+        if isinstance(neutral_data, ColumnarNeutralFile):
+            return self._create_mesh_from_arrays(neutral_data, is_3d)
+
         nodes = neutral_data.get_nodes()
         elements = neutral_data.get_elements()
 
@@ -44,7 +60,7 @@ class MeshBuilder:
         points, node_id_to_index = self._build_points(nodes, is_3d)
 
         # Build cells
-        cells = self._build_cells(elements, node_id_to_index, is_3d)
+        cells, cell_element_ids = self._build_cells(elements, node_id_to_index, is_3d)
 
         if not cells:
             return None
@@ -70,10 +86,218 @@ class MeshBuilder:
         # Store original data for vector calculations
         mesh._original_data = neutral_data
         mesh._node_id_to_index = node_id_to_index
+        mesh._point_ids = np.array([node.get_id() for node in nodes], dtype=np.int64)
+        mesh._cell_ids = np.array(cell_element_ids, dtype=np.int64)
         mesh._is_3d = is_3d
 
         return mesh
 
+    def update_pyvista_mesh(self, mesh, neutral_data, is_3d=False):
+        """Update mesh in place when the step has the same topology, returns success"""
+        if mesh is None or not isinstance(neutral_data, ColumnarNeutralFile):
+            return False
+
+        topology = self._get_topology(neutral_data, is_3d)
+        if topology is None or getattr(mesh, '_topology_key', None) != topology[0]:
+            return False
+
+        # Same cells: only node positions and field values change
+        _, element_rows, connectivity = topology
+        mesh.points = self._get_points(neutral_data, is_3d)
+        node_index = getattr(mesh, '_node_index', None)
+        if node_index is not None:
+            node_index.update(mesh.points)
+        self._add_array_data(mesh, neutral_data, element_rows, connectivity, is_3d)
+        return True
+
+    def _create_mesh_from_arrays(self, neu, is_3d=False):
+        """Create PyVista mesh from columnar data with array operations"""
+        topology = self._get_topology(neu, is_3d)
+        if topology is None:
+            return None
+        topology_key, element_rows, connectivity = topology
+
+        nodes_per_cell = connectivity.shape[1]
+        cells = np.empty((len(element_rows), nodes_per_cell + 1), dtype=np.int64)
+        cells[:, 0] = nodes_per_cell
+        cells[:, 1:] = connectivity
+        cell_type = pv.CellType.HEXAHEDRON if is_3d else pv.CellType.QUAD
+        cell_types = np.full(len(element_rows), cell_type, dtype=np.uint8)
+
+        mesh = pv.UnstructuredGrid(
+            cells.ravel(), cell_types, self._get_points(neu, is_3d))
+        mesh._topology_key = topology_key
+
+        self._add_array_data(mesh, neu, element_rows, connectivity, is_3d)
+        return mesh
+
+    @staticmethod
+    def _get_points(neu, is_3d=False):
+        """Get mesh points of columnar data"""
+        points = neu.get_points()
+        if not is_3d:
+            points[:, 2] = 0.0
+        return points
+
+    def _get_topology(self, neu, is_3d=False):
+        """Get (fingerprint, element rows, connectivity) of the drawable cells"""
+        if not neu.is_complete():
+            return None
+
+        # Steps sharing one connectivity array, like built 3D sequences,
+        # share their topology without hashing it again
+        connectivity = neu.get_connectivity()
+        shape_key = (is_3d, neu.get_nb_nodes())
+        if (self._last_topology is not None and self._last_topology[0] is connectivity and
+                self._last_topology[1] == shape_key):
+            return self._last_topology[2]
+
+        topology = self._compute_topology(neu, connectivity, is_3d)
+        if topology is not None:
+            self._last_topology = (connectivity, shape_key, topology)
+        return topology
+
+    @staticmethod
+    def _compute_topology(neu, connectivity, is_3d=False):
+        """Fingerprint the drawable cells of a connectivity"""
+        # Keep elements whose nodes are all known, like the object path
+        if connectivity.shape[1] != (8 if is_3d else 4):
+            return None
+        element_rows = np.flatnonzero((connectivity >= 0).all(axis=1))
+        if len(element_rows) == 0:
+            return None
+        connectivity = np.ascontiguousarray(connectivity[element_rows])
+
+        # Node count is part of the key as unused nodes are still points
+        digest = hashlib.blake2b(connectivity.tobytes(), digest_size=16).hexdigest()
+        topology_key = (is_3d, neu.get_nb_nodes(), connectivity.shape, digest)
+        return topology_key, element_rows, connectivity
+
+    def _add_array_data(self, mesh, neu, element_rows, connectivity, is_3d=False):
+        """Add field, material and constraint data of columnar data to a mesh"""
+        # Field variable arrays are computed when first displayed
+        self._attach_field_arrays(mesh, neu.element_ids[element_rows],
+                                  neu.get_field_arrays(element_rows))
+
+        # Add material colors
+        mesh.cell_data['Material_Colors'] = self._compute_material_colors(
+            neu.matno[element_rows])
+
+        # Add node constraint codes as point data
+        self._add_node_constraint_codes_from_arrays(mesh, neu, is_3d)
+
+        # Id mapping is kept when an updated step numbers nodes the same way
+        previous_data = getattr(mesh, '_original_data', None)
+        if (previous_data is None or (previous_data.node_ids is not neu.node_ids and
+                                      not np.array_equal(previous_data.node_ids, neu.node_ids))):
+            mesh._node_id_to_index = dict(
+                zip(neu.node_ids.tolist(), range(len(neu.node_ids))))
+            mesh._point_ids = np.asarray(neu.node_ids, dtype=np.int64)
+        mesh._cell_ids = np.asarray(neu.element_ids[element_rows], dtype=np.int64)
+
+        # Layers of built 3D models, only valid when no element was dropped
+        mesh._layer_layout = (neu.layer_layout if is_3d and
+                              len(element_rows) == neu.get_nb_elements() else None)
+
+        # Store original data for vector calculations
+        mesh._original_data = neu
+        mesh._is_3d = is_3d
+
+    # Lazy field variable arrays
+
+    def get_cell_data_names(self, mesh):
+        """Get names of all field variable arrays available on a mesh"""
+        names = list(mesh.cell_data.keys())
+        if getattr(mesh, '_field_arrays', None) is not None:
+            names += [name for name in self.CELL_DATA_SOURCES if name not in names]
+        return names
+
+    def has_cell_data(self, mesh, name):
+        """Check if a field variable array is attached or can be computed"""
+        return name in mesh.cell_data or (
+            getattr(mesh, '_field_arrays', None) is not None and
+            name in self.CELL_DATA_SOURCES)
+
+    def ensure_cell_data(self, mesh, name):
+        """Get a field variable array, computing and attaching it on first use"""
+        if name not in mesh.cell_data:
+            field_arrays = getattr(mesh, '_field_arrays', None)
+            if field_arrays is None or name not in self.CELL_DATA_SOURCES:
+                return None
+            mesh.cell_data[name] = self._compute_field_array(field_arrays, name)
+            mesh._attached_fields.add(name)
+        return mesh.cell_data[name]
+
+    def get_point_data(self, mesh, name):
+        """Get nodal averages of a field variable array for HD contours"""
+        cell_values = self.ensure_cell_data(mesh, name)
+        if cell_values is None:
+            return None
+
+        # One operator per topology, reused meshes keep theirs across steps
+        interpolator = getattr(mesh, '_cell_to_point', None)
+        if interpolator is None:
+            interpolator = mesh._cell_to_point = CellToPointInterpolator(mesh)
+
+        step = getattr(mesh, '_original_data', None)
+        if step is None:
+            return interpolator.apply(cell_values)
+        return interpolator.get_point_values(step, name, cell_values)
+
+    def get_surface_lod(self, mesh):
+        """Get the outer surfaces drawn for a hexahedral 3D mesh, None for other meshes"""
+        return get_surface_lod(mesh)
+
+    def _attach_field_arrays(self, mesh, element_ids, field_arrays):
+        """Replace the field variables of a mesh by lazily computed ones"""
+        # Arrays of a previous step on a reused mesh are stale, with their
+        # nodal averages shown by HD contours
+        for name in getattr(mesh, '_attached_fields', ()):
+            if name in mesh.cell_data:
+                mesh.cell_data.remove(name)
+            if name in mesh.point_data:
+                mesh.point_data.remove(name)
+
+        mesh.cell_data['Element_ID'] = element_ids
+        mesh._field_arrays = field_arrays
+        mesh._attached_fields = set()
+
+    @staticmethod
+    def _compute_field_array(field_arrays, name):
+        """Compute one named field variable array"""
+        return field_arrays.field_variable(name)
+
+    def _compute_material_colors(self, matno):
+        """Get RGB colors of material numbers"""
+        palette = np.array(self.material_colors)
+        colors = palette[(matno.astype(np.int64) - 1) % len(palette)]
+        # Default gray for unknown material
+        colors[matno == 0] = [0.7, 0.7, 0.7]
+        return colors
+
+    def _add_node_constraint_codes_from_arrays(self, mesh, neu, is_3d=False):
+        """Add node constraint information from columnar data"""
+        codes = np.array(neu.node_fields['code'], dtype=float)
+        mesh.point_data['Node_Code'] = codes
+
+        # Store constrained nodes (non-zero codes)
+        constrained = np.flatnonzero(codes != 0)
+        if len(constrained) == 0:
+            if hasattr(mesh, '_constraint_info'):
+                del mesh._constraint_info
+            return
+
+        constraint_info = {
+            'node_ids': neu.node_ids[constrained].tolist(),
+            'positions_x': neu.node_fields['x'][constrained].tolist(),
+            'positions_y': neu.node_fields['y'][constrained].tolist(),
+            'codes': codes[constrained].tolist()
+        }
+        if is_3d:
+            constraint_info['positions_z'] = neu.node_fields['z'][constrained].tolist()
+
+        mesh._constraint_info = constraint_info
+
     def _add_material_colors(self, mesh, elements):
         """Add RGB colors based on material numbers"""
         colors = []
@@ -110,8 +334,9 @@ class MeshBuilder:
         return np.array(points), node_id_to_index
 
     def _build_cells(self, elements, node_id_to_index, is_3d=False):
-        """Build cells array"""
+        """Build cells array and the element ID of each cell"""
         cells = []
+        cell_element_ids = []
 
         for element in elements:
             element_nodes = element.get_lnods()
@@ -125,6 +350,7 @@ class MeshBuilder:
 
                 if len(node_indices) == 8:
                     cells.extend([8] + node_indices)
+                    cell_element_ids.append(element.get_id())
 
             elif not is_3d and len(element_nodes) >= 3:
                 # 2D elements
@@ -140,8 +366,9 @@ class MeshBuilder:
                         cells.extend([4] + node_indices)
                     else:
                         cells.extend([len(node_indices)] + node_indices)
+                    cell_element_ids.append(element.get_id())
 
-        return cells
+        return cells, cell_element_ids
 
     def _add_node_constraint_codes(self, mesh, nodes, node_id_to_index, is_3d=False):
         """Add node constraint information for visualization"""
@@ -183,147 +410,11 @@ class MeshBuilder:
             mesh._constraint_info = constraint_info
 
     def _add_scalar_data(self, mesh, elements, nodes, is_3d=False):
-        """Add all field variable data to mesh"""
-        element_data = {
-            'Element_ID': [],
-
-            'Velocity X(r)': [],
-            'Velocity Y(z)': [],
-            'Total Velocity': [],
-
-            'Force X(r)': [],
-            'Force Y(z)': [],
-            'Total Force': [],
-
-            'Temperature': [],
-            'Temperature Rate': [],
-
-            'Strain rate x(r)': [],
-            'Strain rate y(z)': [],
-            'Strain rate z(theta)': [],
-            'Strain rate xy(rz)': [],
-            'Effective strain rate': [],
-            'Volumetric strain rate': [],
-
-            'Strain x(r)': [],
-            'Strain y(z)': [],
-            'Strain z(theta)': [],
-            'Strain xy(rz)': [],
-            'Effective strain': [],
-            'Volumetric Strain': [],
-            'Strain 1': [],
-            'Strain 2': [],
-            'Strain 3': [],
-
-            'Stress x(r)': [],
-            'Stress y(z)': [],
-            'Stress z(theta)': [],
-            'Stress xy(rz)': [],
-            'Effective stress': [],
-            'Average stress': [],
-            'Stress 1': [],
-            'Stress 2': [],
-            'Stress 3': [],
-
-            'Thickness (Plane Stress)': [],
-            'Relative Density': [],
-            'Ductile Damage': [],
-
-            'Electric Potential': [],
-            'Electric Current Density': [],
-            'Electric Resistivity': [],
-
-            'Stress y(z)/Ef.Stress': [],
-            'Stress xy(rz)/Ef.Stress': [],
-            'Average Stress/Ef.Stress': [],
-            'Pressure': [],
-            'Pressure/Ef.Stress': [],
-            'Surface Enlargement Ratio': [],
-
-            'Element Quality': [],
-        }
-
-        for element in elements:
-
-            element_data['Element_ID'].append(element.get_id())
-
-            element_data['Strain rate x(r)'].append(
-                element.get_strain_rate_Exx() or 0.0)
-            element_data['Strain rate y(z)'].append(
-                element.get_strain_rate_Eyy() or 0.0)
-            element_data['Strain rate z(theta)'].append(
-                element.get_strain_rate_Ezz() or 0.0)
-            element_data['Strain rate xy(rz)'].append(
-                element.get_strain_rate_Exy() or 0.0)
-            element_data['Effective strain rate'].append(
-                element.get_strain_rate_E() or 0.0)
-            element_data['Volumetric strain rate'].append(
-                element.get_strain_rate_Ev() or 0.0)
-
-            element_data['Strain x(r)'].append(element.get_strain_Exx() or 0.0)
-            element_data['Strain y(z)'].append(element.get_strain_Eyy() or 0.0)
-            element_data['Strain z(theta)'].append(
-                element.get_strain_Ezz() or 0.0)
-            element_data['Strain xy(rz)'].append(
-                element.get_strain_Exy() or 0.0)
-            element_data['Effective strain'].append(
-                element.get_strain_E() or 0.0)
-            element_data['Volumetric Strain'].append(
-                element.get_strain_volumetric() or 0.0)
-            element_data['Strain 1'].append(element.get_strain_E1() or 0.0)
-            element_data['Strain 2'].append(element.get_strain_E2() or 0.0)
-            element_data['Strain 3'].append(element.get_strain_E3() or 0.0)
-
-            element_data['Stress x(r)'].append(element.get_stress_Oxx() or 0.0)
-            element_data['Stress y(z)'].append(element.get_stress_Oyy() or 0.0)
-            element_data['Stress z(theta)'].append(
-                element.get_stress_Ozz() or 0.0)
-            element_data['Stress xy(rz)'].append(
-                element.get_stress_Oxy() or 0.0)
-            element_data['Effective stress'].append(
-                element.get_stress_O() or 0.0)
-            element_data['Average stress'].append(
-                element.get_stress_Orr() or 0.0)
-            element_data['Thickness (Plane Stress)'].append(
-                element.get_thickness_plane_stress() or 0.0)
-
-            element_data['Stress 1'].append(element.get_stress_1() or 0.0)
-            element_data['Stress 2'].append(element.get_stress_2() or 0.0)
-            element_data['Stress 3'].append(element.get_stress_3() or 0.0)
-            element_data['Relative Density'].append(element.get_densy() or 0.0)
-            element_data['Ductile Damage'].append(element.get_fract() or 0.0)
-
-            element_data['Stress y(z)/Ef.Stress'].append(
-                element.get_stress_yy_on_effective_stress() or 0.0)
-            element_data['Stress xy(rz)/Ef.Stress'].append(
-                element.get_stress_xy_on_effective_stress() or 0.0)
-            element_data['Average Stress/Ef.Stress'].append(
-                element.get_average_stress_on_effective_stress() or 0.0)
-            element_data['Pressure'].append(element.get_pressure() or 0.0)
-            element_data['Pressure/Ef.Stress'].append(
-                element.get_pressure_on_effective_stress() or 0.0)
-            element_data['Surface Enlargement Ratio'].append(
-                element.get_surface_enlargement_ratio() or 0.0)
-            element_data['Element Quality'].append(element.get_rindx() or 0.0)
-            element_data['Velocity X(r)'].append(
-                element.get_velocity_x() or 0.0)
-            element_data['Velocity Y(z)'].append(
-                element.get_velocity_y() or 0.0)
-            element_data['Total Velocity'].append(
-                element.get_total_velocity() or 0.0)
-            element_data['Force X(r)'].append(element.get_force_x() or 0.0)
-            element_data['Force Y(z)'].append(element.get_force_y() or 0.0)
-            element_data['Total Force'].append(
-                element.get_total_force() or 0.0)
-            element_data['Temperature'].append(
-                element.get_temperature() or 0.0)
-            element_data['Temperature Rate'].append(
-                element.get_temperature_rate() or 0.0)
-
-        # Add non-empty arrays to mesh
-        for key, values in element_data.items():
-            if len(values) != 0:
-                mesh.cell_data[key] = np.array(values)
+        """Add field variable data to mesh, computed when first displayed"""
+        elements = list(elements)
+        element_ids = np.array([element.get_id() for element in elements])
+        self._attach_field_arrays(mesh, element_ids, ElementFieldArrays(
+            *gather_element_columns(elements)))
 
     def create_die_mesh(self, die, is_3d=False):
         """Create mesh for die geometry"""
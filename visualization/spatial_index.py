@@ -0,0 +1,158 @@
+"""
+Spatial Index Module
+Uniform grid over mesh points for node picking queries
+"""
+
+import numpy as np
+import logging
+logger = logging.getLogger(__name__)
+
+
+class NodeSpatialIndex:
+    """
+    Uniform grid of mesh points for nearest, k-nearest and radius queries
+
+    Points are binned in cubic bins holding about POINTS_PER_BIN points and
+    sorted by bin key, so the points of any block of bins are found with two
+    binary searches per bin. Flat axes (2D meshes) get a single bin.
+    Call update() when the points move, the topology is not used. The grid
+    is rebuilt by the next query, so animation frames without picking
+    cost nothing.
+    """
+
+    POINTS_PER_BIN = 4
+
+    def __init__(self, points):
+        self.update(points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def update(self, points):
+        """Set new point positions, the grid is rebuilt on the next query"""
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self._dirty = True
+
+    def _ensure_grid(self):
+        """Rebuild the grid if the points changed since the last query"""
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        n_points = len(self.points)
+        if n_points == 0:
+            self.lower = np.zeros(3)
+            self.bin_size = 1.0
+            self.shape = np.ones(3, dtype=np.int64)
+            self.order = np.empty(0, dtype=np.int64)
+            self.sorted_keys = np.empty(0, dtype=np.int64)
+            return
+
+        self.lower = self.points.min(axis=0)
+        extent = self.points.max(axis=0) - self.lower
+
+        # Bin size for the target density over the non-flat axes
+        active = extent > 0
+        if active.any():
+            volume = np.prod(extent[active])
+            self.bin_size = float((volume * self.POINTS_PER_BIN / n_points) ** (1.0 / active.sum()))
+        else:
+            self.bin_size = 1.0
+
+        # Thin slabs would otherwise get far more bins than points
+        self.shape = self._get_shape(extent)
+        while np.prod(self.shape) > 8 * n_points + 8:
+            self.bin_size *= 2.0
+            self.shape = self._get_shape(extent)
+
+        keys = self._get_keys(self._get_bins(self.points))
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+
+    def nearest(self, position):
+        """Get (point index, distance) of the point closest to a position"""
+        indexes, distances = self.k_nearest(position, 1)
+        if len(indexes) == 0:
+            return None, None
+        return int(indexes[0]), float(distances[0])
+
+    def k_nearest(self, position, k):
+        """Get (point indexes, distances) of the k closest points, closest first"""
+        position = np.asarray(position, dtype=float)
+        k = min(k, len(self.points))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        self._ensure_grid()
+
+        center = self._get_bins(position[np.newaxis])[0]
+        radius = 1
+        while True:
+            low = np.maximum(center - radius, 0)
+            high = np.minimum(center + radius, self.shape - 1)
+            candidates = self._gather(low, high)
+
+            if len(candidates) >= k:
+                distances = np.linalg.norm(self.points[candidates] - position, axis=1)
+                kth_distance = np.partition(distances, k - 1)[k - 1]
+
+                # Closer points outside the searched block are impossible
+                covers_all = (low == 0).all() and (high == self.shape - 1).all()
+                if covers_all or kth_distance <= self._get_clearance(position, low, high):
+                    nearest = np.argsort(distances, kind='stable')[:k]
+                    return candidates[nearest], distances[nearest]
+
+            radius *= 2
+
+    def within_radius(self, position, radius):
+        """Get (point indexes, distances) of the points within radius, closest first"""
+        position = np.asarray(position, dtype=float)
+        if len(self.points) == 0 or radius < 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        self._ensure_grid()
+
+        low = self._get_bins((position - radius)[np.newaxis])[0]
+        high = self._get_bins((position + radius)[np.newaxis])[0]
+        candidates = self._gather(low, high)
+
+        distances = np.linalg.norm(self.points[candidates] - position, axis=1)
+        inside = np.flatnonzero(distances <= radius)
+        inside = inside[np.argsort(distances[inside], kind='stable')]
+        return candidates[inside], distances[inside]
+
+    def _get_shape(self, extent):
+        """Get bin counts per axis for the current bin size"""
+        return np.floor(extent / self.bin_size).astype(np.int64) + 1
+
+    def _get_bins(self, positions):
+        """Get (n, 3) bin coordinates of positions, clipped to the grid"""
+        bins = np.floor((positions - self.lower) / self.bin_size)
+        return np.clip(bins, 0, self.shape - 1).astype(np.int64)
+
+    def _get_keys(self, bins):
+        """Get flat keys of bin coordinates"""
+        return np.ravel_multi_index(bins.T, self.shape)
+
+    def _gather(self, low, high):
+        """Get indexes of the points in the block of bins between low and high"""
+        axes = [np.arange(low[axis], high[axis] + 1) for axis in range(3)]
+        block = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, 3)
+        keys = self._get_keys(block)
+
+        starts = np.searchsorted(self.sorted_keys, keys, side='left')
+        lengths = np.searchsorted(self.sorted_keys, keys, side='right') - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.order[offsets + np.arange(lengths.sum())]
+
+    def _get_clearance(self, position, low, high):
+        """Get distance from a position to the inner faces of a block of bins"""
+        block_lower = self.lower + low * self.bin_size
+        block_upper = self.lower + (high + 1) * self.bin_size
+
+        # Faces on the grid border have no points beyond them
+        clearance = np.inf
+        for axis in range(3):
+            if low[axis] > 0:
+                clearance = min(clearance, position[axis] - block_lower[axis])
+            if high[axis] < self.shape[axis] - 1:
+                clearance = min(clearance, block_upper[axis] - position[axis])
+        return clearance
@@ -0,0 +1,297 @@
+"""
+Surface Level Of Detail Module
+Outer surfaces of 3D models for still and interactive rendering
+"""
+
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import pyvista as pv
+from PyQt5.QtCore import QTimer
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Hexahedron faces in VTK node order, outward for positive volume cells
+HEXAHEDRON_FACES = np.array([(0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+                             (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)])
+
+# (topology key, sampling) -> (point ids, polygons, face cells), most recent last
+_surface_cache = OrderedDict()
+SURFACE_CACHE_SIZE = 8
+
+
+def get_hexahedron_surface(mesh):
+    """Get (point ids, polygons, face cells) of the boundary of a hexahedral mesh"""
+    return _get_cached_surface(mesh, ('hexahedra',), lambda: _get_hexahedron_faces(mesh))
+
+
+def get_layered_surface(mesh, layers, divisions, closed):
+    """Get (point ids, polygons, face cells) of a layered mesh at sampled layers"""
+    layers = np.asarray(layers, dtype=np.int64)
+    return _get_cached_surface(
+        mesh, ('layers', divisions, closed, layers.tobytes()),
+        lambda: _get_layered_faces(mesh, layers, divisions, closed))
+
+
+def _get_cached_surface(mesh, sampling, get_faces):
+    """Get a surface of a mesh topology, extracting its faces on first use"""
+    topology_key = getattr(mesh, '_topology_key', None)
+    if topology_key is None:
+        connectivity = np.ascontiguousarray(mesh.cell_connectivity)
+        topology_key = (mesh.n_points, hashlib.blake2b(
+            connectivity.tobytes(), digest_size=16).hexdigest())
+
+    key = (topology_key, sampling)
+    surface = _surface_cache.get(key)
+    if surface is not None:
+        _surface_cache.move_to_end(key)
+        return surface
+
+    faces, face_cells = get_faces()
+
+    # Surface points are the mesh points the faces use
+    point_ids, faces = np.unique(faces, return_inverse=True)
+    polygons = np.empty((len(face_cells), 5), dtype=np.int64)
+    polygons[:, 0] = 4
+    polygons[:, 1:] = faces.reshape(-1, 4)
+
+    surface = _surface_cache[key] = (point_ids, polygons.ravel(), face_cells)
+    while len(_surface_cache) > SURFACE_CACHE_SIZE:
+        _surface_cache.popitem(last=False)
+    return surface
+
+
+def _get_hexahedron_faces(mesh):
+    """Get (faces, face cells) used by a single hexahedron"""
+    hexahedra = mesh.cell_connectivity.reshape(-1, 8)
+    faces = hexahedra[:, HEXAHEDRON_FACES].reshape(-1, 4)
+    face_cells = np.repeat(np.arange(len(hexahedra)), len(HEXAHEDRON_FACES))
+
+    # Faces are equal when their sorted nodes are, two int64 keys per face
+    nodes = np.sort(faces, axis=1)
+    high = nodes[:, 0] * mesh.n_points + nodes[:, 1]
+    low = nodes[:, 2] * mesh.n_points + nodes[:, 3]
+    order = np.lexsort((low, high))
+    same = (high[order][1:] == high[order][:-1]) & (low[order][1:] == low[order][:-1])
+
+    # Interior faces are shared by two cells, collapsed faces are dropped
+    shared = np.zeros(len(order), dtype=bool)
+    shared[1:] |= same
+    shared[:-1] |= same
+    boundary = np.sort(order[~shared])
+    distinct = 1 + (np.diff(nodes[boundary], axis=1) != 0).sum(axis=1)
+    boundary = boundary[distinct >= 3]
+
+    return faces[boundary], face_cells[boundary]
+
+
+def _get_layered_faces(mesh, layers, divisions, closed):
+    """Get (faces, face cells) of the outer surface of a layered mesh"""
+    nb_nodes = mesh.n_points // (divisions + 1)
+    nb_elements = mesh.n_cells // divisions
+    quads = mesh.cell_connectivity.reshape(-1, 8)[:nb_elements, :4]
+
+    # Boundary edges of the 2D mesh belong to a single quad
+    edges = np.stack((quads, np.roll(quads, -1, axis=1)), axis=2).reshape(-1, 2)
+    edge_elements = np.repeat(np.arange(nb_elements), 4)
+    keys = np.sort(edges, axis=1) @ np.array([nb_nodes, 1], dtype=np.int64)
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    boundary = (counts[inverse.reshape(-1)] == 1) & (edges[:, 0] != edges[:, 1])
+    edges, edge_elements = edges[boundary], edge_elements[boundary]
+
+    # Sides sweep each edge between consecutive sampled layers, colored by
+    # the middle division. Full revolutions close on the first layer.
+    bottom, top = layers[:-1], layers[1:]
+    top_nodes = np.where(top == divisions, 0, top) if closed else top
+    divisions_used = (bottom + top - 1) // 2
+
+    faces = [np.concatenate((
+        edges[np.newaxis] + bottom[:, np.newaxis, np.newaxis] * nb_nodes,
+        edges[np.newaxis, :, ::-1] + top_nodes[:, np.newaxis, np.newaxis] * nb_nodes),
+        axis=2).reshape(-1, 4)]
+    face_cells = [(edge_elements[np.newaxis] +
+                   divisions_used[:, np.newaxis] * nb_elements).ravel()]
+
+    if not closed:
+        element_range = np.arange(nb_elements)
+        faces += [quads[:, ::-1], quads + divisions * nb_nodes]
+        face_cells += [element_range, element_range + (divisions - 1) * nb_elements]
+
+    return np.concatenate(faces), np.concatenate(face_cells)
+
+
+class BoundarySurface:
+    """
+    Outer surface drawn instead of a 3D mesh
+
+    Each face keeps the volume cell it comes from and the surface keeps the
+    mesh points it uses, so cell and point arrays of the mesh map onto the
+    surface by indexing. Faces are extracted once per topology.
+    """
+
+    def __init__(self, mesh, point_ids, polygons, face_cells):
+        self.point_ids = point_ids
+        self.face_cells = face_cells
+        self.surface = pv.PolyData(mesh.points[point_ids], faces=polygons)
+
+        # Same name as extract_surface, picking maps faces back to mesh cells
+        self.surface.cell_data['vtkOriginalCellIds'] = face_cells
+
+    def update_points(self, mesh):
+        """Move the surface points to the current mesh points"""
+        self.surface.points = mesh.points[self.point_ids]
+
+    def map_values(self, values, preference='cell'):
+        """Get the surface values of mesh cell or point values"""
+        values = np.asarray(values)
+        return values[self.face_cells if preference == 'cell' else self.point_ids]
+
+    def prepare(self, mesh, mesh_data):
+        """Get add_mesh arguments drawing this surface instead of the mesh"""
+        surface_data = dict(mesh_data, mesh=self.surface)
+        scalars = mesh_data.get('scalars')
+
+        if isinstance(scalars, str):
+            # Named arrays are copied to the surface under the same name
+            if mesh_data.get('preference', 'cell') == 'point':
+                self.surface.point_data[scalars] = self.map_values(
+                    mesh.point_data[scalars], 'point')
+            else:
+                self.surface.cell_data[scalars] = self.map_values(mesh.cell_data[scalars])
+        elif scalars is not None:
+            surface_data['scalars'] = self.map_values(
+                scalars, mesh_data.get('preference', 'cell'))
+
+        return surface_data
+
+
+class SurfaceLOD:
+    """
+    Full resolution and interactive outer surfaces of a 3D mesh
+
+    Only the outer surface of a hexahedral mesh is ever visible. Models built
+    from 2D steps repeat the 2D mesh on divisions + 1 layers, their surface
+    is swept from the 2D boundary and drawn with at most
+    INTERACTIVE_DIVISIONS layers while the camera moves.
+    """
+
+    INTERACTIVE_DIVISIONS = 12
+
+    def __init__(self, mesh):
+        layout = getattr(mesh, '_layer_layout', None)
+        self.coarse = None
+
+        if layout is None:
+            self.full = BoundarySurface(mesh, *get_hexahedron_surface(mesh))
+            return
+
+        divisions, closed = layout
+        self.full = BoundarySurface(mesh, *get_layered_surface(
+            mesh, np.arange(divisions + 1), divisions, closed))
+        if divisions > self.INTERACTIVE_DIVISIONS:
+            layers = np.unique(np.round(np.linspace(
+                0, divisions, self.INTERACTIVE_DIVISIONS + 1)).astype(np.int64))
+            self.coarse = BoundarySurface(mesh, *get_layered_surface(
+                mesh, layers, divisions, closed))
+
+    def update_points(self, mesh):
+        """Move the surface points to the current mesh points"""
+        self.full.update_points(mesh)
+        if self.coarse is not None:
+            self.coarse.update_points(mesh)
+
+
+def get_surface_lod(mesh):
+    """Get the surfaces drawn for a hexahedral 3D mesh, None for other meshes"""
+    if not getattr(mesh, '_is_3d', False) or mesh.n_cells == 0:
+        return None
+
+    # Kept while the mesh is reused, which implies the same topology
+    lod = getattr(mesh, '_surface_lod', None)
+    if lod is None:
+        if not (mesh.celltypes == pv.CellType.HEXAHEDRON).all():
+            return None
+        lod = mesh._surface_lod = SurfaceLOD(mesh)
+        logger.info(f"Surface LOD: {lod.full.surface.n_cells} faces for "
+                    f"{mesh.n_cells} cells")
+    else:
+        lod.update_points(mesh)
+    return lod
+
+
+class InteractiveLODSwitch:
+    """
+    Show coarse actors instead of full resolution ones while the camera moves
+
+    The full resolution actors come back once no interaction happened for
+    STILL_DELAY_MS, so quick successions of wheel zooms stay coarse.
+    """
+
+    STILL_DELAY_MS = 200
+
+    def __init__(self):
+        self.plotter = None
+        self.actor_pairs = []
+        self.interacting = False
+        self._style = None
+        self._observer_ids = []
+
+        self.still_timer = QTimer()
+        self.still_timer.setSingleShot(True)
+        self.still_timer.timeout.connect(self._on_camera_still)
+
+    def setup(self, plotter):
+        """Configure the switch on plotter"""
+        self.plotter = plotter
+
+    def add(self, full_actor, coarse_actor):
+        """Register a full resolution actor and its coarse version"""
+        self.actor_pairs.append((full_actor, coarse_actor))
+        full_actor.SetVisibility(not self.interacting)
+        coarse_actor.SetVisibility(self.interacting)
+        self._observe_style()
+
+    def clear(self):
+        """Forget the registered actors"""
+        self.actor_pairs = []
+
+    def _observe_style(self):
+        """Follow the interaction events of the current interactor style"""
+        style = self.plotter.iren.interactor.GetInteractorStyle()
+        if style is None or style is self._style:
+            return
+
+        if self._style is not None:
+            for observer_id in self._observer_ids:
+                self._style.RemoveObserver(observer_id)
+
+        self._style = style
+        self._observer_ids = [
+            style.AddObserver('StartInteractionEvent', self._on_start_interaction),
+            style.AddObserver('EndInteractionEvent', self._on_end_interaction),
+        ]
+
+    def _on_start_interaction(self, obj, event):
+        """Switch to the coarse actors when the camera starts moving"""
+        self.still_timer.stop()
+        if not self.interacting:
+            self.interacting = True
+            self._set_coarse(True)
+
+    def _on_end_interaction(self, obj, event):
+        """Wait for the camera to stay still"""
+        self.still_timer.start(self.STILL_DELAY_MS)
+
+    def _on_camera_still(self):
+        """Render the full resolution actors"""
+        self.interacting = False
+        if self.actor_pairs:
+            self._set_coarse(False)
+            self.plotter.render()
+
+    def _set_coarse(self, coarse):
+        """Show either the coarse or the full resolution actors"""
+        for full_actor, coarse_actor in self.actor_pairs:
+            full_actor.SetVisibility(not coarse)
+            coarse_actor.SetVisibility(coarse)
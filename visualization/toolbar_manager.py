@@ -36,6 +36,7 @@ class ToolbarManager:
         self.constraint_size_spinbox = None
         self.monochromatic_checkbox = None
         self.hd_contour_checkbox = None
+        self.lod_checkbox = None
         self.line_contour_checkbox = None
         self.vector_checkbox = None
         self.vector_size_spinbox = None
@@ -162,6 +163,12 @@ class ToolbarManager:
         self.hd_contour_checkbox.toggled.connect(self._on_hd_contour_toggled)
         toolbar_layout.addWidget(self.hd_contour_checkbox)
 
+        # 3D models drawn by their outer surface, coarser while moving the camera
+        self.lod_checkbox = QCheckBox("3D LOD")
+        self.lod_checkbox.setChecked(True)
+        self.lod_checkbox.toggled.connect(self._on_lod_toggled)
+        toolbar_layout.addWidget(self.lod_checkbox)
+
         # Line Contour
         self.line_contour_checkbox = QCheckBox("Line Contour")
         self.line_contour_checkbox.toggled.connect(
@@ -284,6 +291,11 @@ class ToolbarManager:
         self.visualization_options['high_definition_contour'] = checked
         self._refresh_display()
 
+    def _on_lod_toggled(self, checked):
+        """Handle 3D LOD toggle"""
+        self.visualization_options['lod_mode'] = checked
+        self._refresh_display()
+
     def _on_line_contour_toggled(self, checked):
         """Handle line contour toggle"""
         self.visualization_options['line_contour_mode'] = checked
@@ -333,6 +345,7 @@ class ToolbarManager:
             'show_mesh_edges': self.mesh_edges_checkbox.isChecked() if self.mesh_edges_checkbox else True,
             'monochromatic_mode': self.monochromatic_checkbox.isChecked() if self.monochromatic_checkbox else False,
             'high_definition_contour': self.hd_contour_checkbox.isChecked() if self.hd_contour_checkbox else False,
+            'lod_mode': self.lod_checkbox.isChecked() if self.lod_checkbox else True,
             'view_constraints': self.constraints_checkbox.isChecked() if self.constraints_checkbox else False,
             'line_contour_mode': self.line_contour_checkbox.isChecked() if self.line_contour_checkbox else False,
             'vector_mode': self.vector_checkbox.isChecked() if self.vector_checkbox else False,
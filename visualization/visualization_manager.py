@@ -6,12 +6,15 @@ from .toolbar_manager import ToolbarManager
 from .display_modes import DisplayModeManager
 from .interaction_handler import InteractionHandler
 from .mesh_builder import MeshBuilder
+from .surface_lod import InteractiveLODSwitch
 import numpy as np
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel)
 from pyvistaqt import QtInteractor
 from PyQt5.QtWidgets import QFrame, QScrollArea
 from PyQt5.QtCore import Qt
 import numpy as np
+from parser import ColumnarNeutralFile, FieldStatisticsIndex, FieldStatisticsStore
+from preloader.step_cache import StepCache
 import logging
 logger = logging.getLogger(__name__)
 
@@ -39,18 +42,29 @@ class VisualizationManager:
         self.mesh_builder = MeshBuilder()
         self.interaction_handler = InteractionHandler()
         self.display_manager = DisplayModeManager()
+        self.lod_switch = InteractiveLODSwitch()
 
         # Toolbar manager
         self.toolbar_manager = ToolbarManager(main_window, self)
 
-        self.preloaded_data = {}
+        # Replaced by the step cache of the preloader manager, see set_preloaded_data
+        self.preloaded_data = StepCache()
+
+        # Built 3D models shown instead of the 2D steps, see set_model_3d_steps
+        self.model_3d_steps = None
+        self.model_3d_statistics = None
 
         self.neu_files = []
         self.working_directory = None
         self.load_mesh_callback = None
         self.current_mesh_index = 0
+        self.playback_direction = 1  # Followed by the preloader
 
         self.scales_cache = {}
+        self.step_statistics = FieldStatisticsIndex()
+
+        # Actors kept alive between animation frames, dropped by clear()
+        self.persistent_actors = None
 
         self._setup_visualization_widget()
 
@@ -124,6 +138,7 @@ class VisualizationManager:
 
         # Setup interaction handler
         self.interaction_handler.setup(self.plotter)
+        self.lod_switch.setup(self.plotter)
         self.interaction_handler.set_info_panel(
             self.info_panel,
             self.info_content,
@@ -143,6 +158,10 @@ class VisualizationManager:
         self.load_mesh_callback = load_callback
         self.current_mesh_index = 0
 
+        # Statistics recorded by previous sessions on this run
+        self.step_statistics.attach_store(
+            FieldStatisticsStore(working_directory), neu_files)
+
         # Show navigation controls
         self.toolbar_manager.show_navigation_controls(neu_files)
 
@@ -157,6 +176,7 @@ class VisualizationManager:
         """Load previous mesh file"""
         if self.current_mesh_index > 0:
             self.current_mesh_index -= 1
+            self.playback_direction = -1
             self._load_current_mesh()
             self._update_mesh_controls_state()
 
@@ -164,6 +184,7 @@ class VisualizationManager:
         """Load next mesh file"""
         if self.current_mesh_index < len(self.neu_files) - 1:
             self.current_mesh_index += 1
+            self.playback_direction = 1
             self._load_current_mesh()
             self._update_mesh_controls_state()
 
@@ -213,11 +234,18 @@ class VisualizationManager:
 
     def load_neutral_file(self, neutral_file, is_3d=False):
         """Load neutral file for visualization"""
+        # Built 3D sequences are loaded through the 2D step paths
+        is_3d = is_3d or (isinstance(neutral_file, ColumnarNeutralFile) and
+                          neutral_file.is_3d())
         self.current_data = neutral_file
         self._update_data_info()
 
-        # Create mesh for later use but don't display it
-        mesh = self.mesh_builder.create_pyvista_mesh(self.current_data, is_3d)
+        # Reuse the current mesh when only node positions and values change,
+        # otherwise create mesh for later use but don't display it
+        if self.mesh_builder.update_pyvista_mesh(self.current_mesh, self.current_data, is_3d):
+            mesh = self.current_mesh
+        else:
+            mesh = self.mesh_builder.create_pyvista_mesh(self.current_data, is_3d)
         if mesh:
             self.current_mesh = mesh
             self.interaction_handler.set_mesh_data(mesh, self.current_data)
@@ -253,6 +281,8 @@ class VisualizationManager:
 
     def clear(self):
         """Clear visualization"""
+        self.persistent_actors = None
+        self.lod_switch.clear()
         if self.plotter:
             self.plotter.clear()
 
@@ -303,33 +333,31 @@ class VisualizationManager:
             cached_scales = self.scales_cache[variable_name]
             return cached_scales['min'], cached_scales['max']
 
-        # Calculate scales from all available data
-        total_available_files = len(
-            self.preloaded_data) + (1 if self.current_mesh else 0)
+        # A displayed 3D sequence is scaled by the statistics of its own steps
+        if self.model_3d_steps is not None:
+            steps, step_statistics = self.model_3d_steps, self.model_3d_statistics
+        else:
+            steps, step_statistics = self.preloaded_data, self.step_statistics
+
+        # Calculate scales from the statistics of all available steps
+        total_available_files = len(steps) + (1 if self.current_mesh else 0)
         logger.info(
             f"Computing scales for {variable_name} from {total_available_files} files...")
 
-        global_min = None
-        global_max = None
-
-        for file_index in sorted(self.preloaded_data.keys()):
-            neutral_data = self.preloaded_data[file_index]
+        # Steps with stored statistics count even before they are preloaded
+        indexes = sorted(set(steps.keys()) | set(step_statistics.indexes()))
+        for file_index in indexes:
+            if file_index in step_statistics:
+                continue
 
+            # Steps added before their statistics were recorded
             try:
-                var_min, var_max = self._extract_variable_range(
-                    neutral_data, variable_name)
-
-                if var_min is not None and var_max is not None:
-                    if global_min is None:
-                        global_min = var_min
-                        global_max = var_max
-                    else:
-                        global_min = min(global_min, var_min)
-                        global_max = max(global_max, var_max)
-
+                step_statistics.add_step(file_index, steps[file_index])
             except Exception as e:
                 logger.exception(f"Error processing file {file_index}: {e}")
 
+        global_min, global_max = step_statistics.get_range(variable_name, indexes)
+
         if global_min is not None and global_max is not None:
             # Cache the result
             self.scales_cache[variable_name] = {
@@ -340,73 +368,11 @@ class VisualizationManager:
             logger.error(f"No data found for variable {variable_name}")
             return None, None
 
-    def _extract_variable_range(self, neutral_data, target_variable):
-        """Extract min/max for specific variable from data"""
-        if not neutral_data:
-            return None, None
-
-        elements = list(neutral_data.get_elements())
-        if not elements:
-            return None, None
-
-        var_min = None
-        var_max = None
-
-        var_extractors = {
-            'Effective strain rate': lambda el: el.get_strain_rate_E(),
-            'Effective strain': lambda el: el.get_strain_E(),
-            'Effective stress': lambda el: el.get_stress_O(),
-            'Average stress': lambda el: el.get_stress_Orr(),
-            'Relative Density': lambda el: el.get_densy(),
-            'Element Quality': lambda el: el.get_rindx(),
-            'Strain rate x(r)': lambda el: el.get_strain_rate_Exx(),
-            'Strain rate y(z)': lambda el: el.get_strain_rate_Eyy(),
-            'Strain rate z(theta)': lambda el: el.get_strain_rate_Ezz(),
-            'Strain rate xy(rz)': lambda el: el.get_strain_rate_Exy(),
-            'Volumetric strain rate': lambda el: el.get_strain_rate_Ev(),
-            'Strain x(r)': lambda el: el.get_strain_Exx(),
-            'Strain y(z)': lambda el: el.get_strain_Eyy(),
-            'Strain z(theta)': lambda el: el.get_strain_Ezz(),
-            'Strain xy(rz)': lambda el: el.get_strain_Exy(),
-            'Volumetric Strain': lambda el: el.get_strain_volumetric(),
-            'Strain 1': lambda el: el.get_strain_E1(),
-            'Strain 2': lambda el: el.get_strain_E2(),
-            'Strain 3': lambda el: el.get_strain_E3(),
-            'Stress x(r)': lambda el: el.get_stress_Oxx(),
-            'Stress y(z)': lambda el: el.get_stress_Oyy(),
-            'Stress z(theta)': lambda el: el.get_stress_Ozz(),
-            'Stress xy(rz)': lambda el: el.get_stress_Oxy(),
-            'Stress 1': lambda el: el.get_stress_1(),
-            'Stress 2': lambda el: el.get_stress_2(),
-            'Stress 3': lambda el: el.get_stress_3(),
-            'Thickness (Plane Stress)': lambda el: el.get_thickness_plane_stress(),
-            'Ductile Damage': lambda el: el.get_fract(),
-            'Velocity X(r)': lambda el: el.get_velocity_x(),
-            'Velocity Y(z)': lambda el: el.get_velocity_y(),
-            'Total Velocity': lambda el: el.get_total_velocity(),
-            'Force X(r)': lambda el: el.get_force_x(),
-            'Force Y(z)': lambda el: el.get_force_y(),
-            'Total Force': lambda el: el.get_total_force(),
-            'Temperature': lambda el: el.get_temperature(),
-            'Temperature Rate': lambda el: el.get_temperature_rate(),
-        }
-
-        if target_variable in var_extractors:
-            extractor = var_extractors[target_variable]
-            for element in elements:
-                try:
-                    value = extractor(element)
-                    if value is not None:
-                        fval = float(value)
-                        if var_min is None:
-                            var_min = var_max = fval
-                        else:
-                            var_min = min(var_min, fval)
-                            var_max = max(var_max, fval)
-                except (ValueError, TypeError):
-                    pass
-
-        return var_min, var_max
+    def record_step_statistics(self, index, statistics):
+        """Index field statistics computed for a loaded step"""
+        if index in self.step_statistics:
+            return  # Already known, possibly from the on-disk store
+        self.step_statistics.set_step(index, statistics)
 
     def get_current_data(self):
         """Return currently loaded data"""
@@ -419,9 +385,28 @@ class VisualizationManager:
             f"Visualization manager received {len(preloaded_data_dict)} preloaded files")
 
     def get_preloaded_data(self, index):
-        """Get preloaded data for specific index"""
+        """Get preloaded data for specific index, its 3D model if one was built"""
+        if self.model_3d_steps is not None and index in self.model_3d_steps:
+            return self.model_3d_steps.get(index)
         return self.preloaded_data.get(index)
 
+    def set_model_3d_steps(self, model_3d_steps, step_statistics=None):
+        """
+        Show built 3D models of steps when navigating, None for 2D steps
+
+        step_statistics maps indexes to field statistics of the built steps,
+        steps without them are summarized when auto-scale needs them.
+        """
+        self.model_3d_steps = model_3d_steps
+        self.model_3d_statistics = None
+        if model_3d_steps is not None:
+            self.model_3d_statistics = FieldStatisticsIndex()
+            for index, statistics in (step_statistics or {}).items():
+                self.model_3d_statistics.set_step(index, statistics)
+
+        # Auto-scale ranges follow the displayed sequence
+        self.scales_cache = {}
+
     # Backward compatibility properties
     @property
     def progress_bar(self):